@@ -0,0 +1,44 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+
+# gunicorn -c gunicorn.conf.py kanbanflow.asgi:application (lo lanza
+# startup.py --serve). preload_app: Django, las URLs y las vistas se cargan
+# una vez en el proceso maestro (kanbanflow.asgi) y los workers nacen con
+# todo importado.
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+# ASGI: una conexión SSE (/events/) espera en el bucle de eventos sin ocupar
+# un hilo; las vistas síncronas corren cada una en su hilo (asgiref)
+worker_class = 'uvicorn.workers.UvicornWorker'
+# Cada petición usa un hilo nuevo, así que una conexión persistente no se
+# reutilizaría: sin pool (DB_POOL_SIZE) se cierra al terminar la petición
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True').lower() == 'true'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+# Reciclar workers de vez en cuando (fugas de memoria), sin que coincidan
+max_requests = 2000
+max_requests_jitter = 200
+accesslog = '-' if os.environ.get('GUNICORN_ACCESS_LOG', 'False').lower() == 'true' else None
+errorlog = '-'
+
+# Worker de la cola de trabajos (manage.py run_worker) junto al servidor, para
+# despliegues de un solo contenedor. JOBS_WORKER=False si se ejecuta aparte.
+jobs_worker = os.environ.get('JOBS_WORKER', 'True').lower() == 'true'
+
+
+def when_ready(server):
+    if jobs_worker:
+        server.jobs_worker = subprocess.Popen(
+            [sys.executable, 'manage.py', 'run_worker'], cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+
+
+def on_exit(server):
+    worker = getattr(server, 'jobs_worker', None)
+    if worker is not None:
+        worker.terminate()
+        worker.wait(graceful_timeout)
@@ -1 +1,9 @@
-from django.contrib import admin
\ No newline at end of file
+from django.contrib import admin
+from .models import RefreshToken
+
+@admin.register(RefreshToken)
+class RefreshTokenAdmin(admin.ModelAdmin):
+    list_display = ['user', 'family', 'created_at', 'expires_at', 'revoked_at']
+    list_filter = ['created_at', 'revoked_at']
+    search_fields = ['user__username']
+    readonly_fields = ['user', 'token_hash', 'family', 'created_at', 'used_at']
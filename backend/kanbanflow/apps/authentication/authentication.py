@@ -0,0 +1,27 @@
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from .tokens import TokenError, user_from_access_token
+
+
+class BearerTokenAuthentication(BaseAuthentication):
+    # Authorization: Bearer <token>. EventSource no permite cabeceras, así que
+    # las conexiones SSE pueden enviarlo en ?access_token=
+    keyword = b'bearer'
+
+    def authenticate(self, request):
+        header = get_authorization_header(request).split()
+        if header and header[0].lower() == self.keyword:
+            if len(header) != 2:
+                raise AuthenticationFailed('Cabecera Authorization inválida')
+            token = header[1].decode('latin-1')
+        elif 'text/event-stream' in request.headers.get('Accept', '') and request.query_params.get('access_token'):
+            token = request.query_params['access_token']
+        else:
+            return None
+        try:
+            return user_from_access_token(token), token
+        except TokenError as e:
+            raise AuthenticationFailed(str(e))
+
+    def authenticate_header(self, request):
+        return 'Bearer'
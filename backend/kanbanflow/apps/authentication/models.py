@@ -0,0 +1,21 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class RefreshToken(models.Model):
+    # Solo se guarda el hash del token. Cada uso lo marca como usado y emite
+    # otro de la misma familia; si se presenta uno ya usado se revoca la
+    # familia entera (alguien más tiene una copia).
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='refresh_tokens')
+    token_hash = models.CharField(max_length=64, unique=True)
+    family = models.UUIDField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    used_at = models.DateTimeField(null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.user} ({self.family})'
+
+    class Meta:
+        ordering = ['-created_at']
@@ -0,0 +1,95 @@
+import hashlib
+import secrets
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.utils import timezone
+from .models import RefreshToken
+
+# Tokens de acceso firmados con SECRET_KEY (HMAC, admite SECRET_KEY_FALLBACKS
+# para rotar la clave). No tienen estado: el usuario se reconstruye desde los
+# claims sin consultar la base de datos ni la caché, por eso duran poco. Los
+# tokens de refresco sí se guardan y rotan en cada uso.
+ACCESS_TOKEN_SALT = 'kanbanflow.access'
+
+
+class TokenError(Exception):
+    pass
+
+
+def make_access_token(user):
+    claims = {'uid': user.pk, 'usr': user.username, 'stf': user.is_staff, 'sup': user.is_superuser}
+    return signing.dumps(claims, salt=ACCESS_TOKEN_SALT)
+
+
+def user_from_access_token(token):
+    try:
+        claims = signing.loads(token, salt=ACCESS_TOKEN_SALT, max_age=settings.ACCESS_TOKEN_LIFETIME)
+    except signing.SignatureExpired:
+        raise TokenError('Token caducado')
+    except signing.BadSignature:
+        raise TokenError('Token inválido')
+    # Usuario parcial (id, username y permisos de staff): basta para filtrar
+    # y asignar claves foráneas; quien necesite el resto lo lee de la base.
+    user = User(
+        pk=claims['uid'], username=claims['usr'], is_staff=claims['stf'],
+        is_superuser=claims['sup'], is_active=True,
+    )
+    user._state.adding = False
+    return user
+
+
+def _hash(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def issue_tokens(user, family=None):
+    refresh = secrets.token_urlsafe(32)
+    RefreshToken.objects.create(
+        user=user,
+        token_hash=_hash(refresh),
+        family=family or uuid.uuid4(),
+        expires_at=timezone.now() + timedelta(seconds=settings.REFRESH_TOKEN_LIFETIME),
+    )
+    return {
+        'token': make_access_token(user),
+        'refresh': refresh,
+        'expires_in': settings.ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def _find(refresh):
+    if not isinstance(refresh, str) or not refresh:
+        return None
+    return RefreshToken.objects.select_related('user').filter(token_hash=_hash(refresh)).first()
+
+
+def revoke_family(family):
+    RefreshToken.objects.filter(family=family, revoked_at__isnull=True).update(revoked_at=timezone.now())
+
+
+def rotate_refresh_token(refresh):
+    stored = _find(refresh)
+    if stored is None:
+        raise TokenError('Token de refresco inválido')
+    now = timezone.now()
+    # Se reclama con una actualización condicional: de dos peticiones con el
+    # mismo token solo una gana, la otra cuenta como reutilización
+    claimed = RefreshToken.objects.filter(
+        pk=stored.pk, used_at__isnull=True, revoked_at__isnull=True,
+    ).update(used_at=now)
+    if not claimed:
+        revoke_family(stored.family)
+        raise TokenError('Token de refresco revocado')
+    if stored.expires_at <= now or not stored.user.is_active:
+        raise TokenError('Token de refresco caducado')
+    return stored.user, issue_tokens(stored.user, stored.family)
+
+
+def revoke_refresh_token(refresh):
+    stored = _find(refresh)
+    if stored is not None:
+        revoke_family(stored.family)
@@ -1,9 +1,11 @@
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from django.contrib.auth import login, logout
+from django.contrib.auth.models import User
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserSerializer
+from .tokens import TokenError, issue_tokens, revoke_refresh_token, rotate_refresh_token
 
 @api_view(['GET', 'POST'])
 @permission_classes([AllowAny])
@@ -20,7 +22,8 @@ def register(request):
         user = serializer.save()
         return Response({
             'message': 'Usuario registrado exitosamente',
-            'user': UserSerializer(user).data
+            'user': UserSerializer(user).data,
+            **issue_tokens(user)
         }, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -37,22 +40,35 @@ def login_view(request):
     serializer = UserLoginSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        login(request, user)
         return Response({
             'message': 'Inicio de sesión exitoso',
-            'user': UserSerializer(user).data
+            'user': UserSerializer(user).data,
+            **issue_tokens(user)
         }, status=status.HTTP_200_OK)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
-def logout_view(request):
+def refresh_view(request):
+    # Rota el token de refresco: el anterior deja de valer
     try:
-        logout(request)
-    except:
-        pass
+        user, tokens = rotate_refresh_token(request.data.get('refresh'))
+    except TokenError as e:
+        return Response({'error': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+    return Response({'user': UserSerializer(user).data, **tokens}, status=status.HTTP_200_OK)
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def logout_view(request):
+    # El token de acceso caduca solo; se revoca la familia del de refresco
+    revoke_refresh_token(request.data.get('refresh'))
     return Response({'message': 'Sesión cerrada exitosamente'}, status=status.HTTP_200_OK)
 
 @api_view(['GET'])
 def user_profile(request):
-    return Response(UserSerializer(request.user).data)
\ No newline at end of file
+    # request.user viene de los claims del token: el perfil completo se lee de
+    # la base. Si el usuario se borró o desactivó, el token ya no vale
+    user = User.objects.filter(pk=request.user.pk, is_active=True).first()
+    if user is None:
+        raise AuthenticationFailed('Usuario inexistente o inactivo')
+    return Response(UserSerializer(user).data)
\ No newline at end of file
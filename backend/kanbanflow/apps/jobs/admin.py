@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'updated_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'dedupe_key']
+    readonly_fields = ['attempts', 'locked_until', 'locked_by', 'last_error', 'created_at', 'updated_at']
+    actions = ['retry_selected']
+
+    @admin.action(description='Reintentar los trabajos fallidos seleccionados')
+    def retry_selected(self, request, queryset):
+        from .queue import retry
+
+        self.message_user(request, f'{retry(queryset)} trabajos en cola de nuevo')
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'kanbanflow.apps.jobs'
+
+    def ready(self):
+        from . import queue  # noqa: F401
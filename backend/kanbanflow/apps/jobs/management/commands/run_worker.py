@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections
+
+
+def init_process(settings_module):
+    # Procesos hijos (spawn): Django desde cero; Ctrl+C solo lo gestiona el padre.
+    # Por eso este módulo no importa modelos al cargarse.
+    import django
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta los trabajos en segundo plano de la cola (kanbanflow.apps.jobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=settings.JOBS_CONCURRENCY)
+        parser.add_argument('--processes', action='store_true',
+                            help='Pool de procesos en lugar de hilos (trabajos con mucha CPU)')
+        parser.add_argument('--poll-interval', type=float, default=settings.JOBS_POLL_INTERVAL)
+        parser.add_argument('--burst', action='store_true', help='Salir cuando no queden trabajos disponibles')
+
+    def handle(self, *args, **options):
+        from kanbanflow.apps.jobs.queue import claim, work
+
+        concurrency = max(1, options['concurrency'])
+        if connection.vendor == 'sqlite' and concurrency > 1:
+            # SQLite admite un solo escritor: con más, los trabajos fallan con
+            # "database is locked"
+            self.stdout.write(self.style.WARNING('SQLite: se ejecuta un trabajo cada vez'))
+            concurrency = 1
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+
+        if options['processes']:
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                concurrency, mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_process, initargs=(settings.SETTINGS_MODULE,),
+            )
+        else:
+            executor = ThreadPoolExecutor(concurrency, thread_name_prefix='job')
+        mode = 'procesos' if options['processes'] else 'hilos'
+        self.stdout.write(f'Worker {worker_id}: {concurrency} {mode}')
+
+        running = set()
+        done = 0
+        try:
+            while not stop.is_set():
+                finished = {future for future in running if future.done()}
+                done += len(finished)
+                running -= finished
+                free = concurrency - len(running)
+                close_old_connections()
+                claimed = claim(free, worker_id) if free else []
+                running |= {executor.submit(work, pk) for pk in claimed}
+                if not free:
+                    wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                elif len(claimed) < free:
+                    # Cola vacía; en modo burst se espera a los que siguen en curso
+                    # por si encolan otros
+                    if options['burst'] and not running:
+                        break
+                    if running:
+                        wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                    else:
+                        stop.wait(options['poll_interval'])
+        finally:
+            # Solo se reclaman tantos trabajos como huecos libres: todos los
+            # enviados están en curso y se dejan terminar
+            executor.shutdown(wait=True)
+            connections.close_all()
+        done += len(running)
+        self.stdout.write(f'Worker {worker_id} detenido tras {done} trabajos')
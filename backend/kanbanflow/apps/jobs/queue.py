@@ -0,0 +1,237 @@
+import logging
+import random
+import threading
+import traceback
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from kanbanflow.metrics import Gauge, register
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Cola de trabajos en la base de datos, sin broker externo. enqueue() inserta
+# el trabajo en la transacción en curso (si se deshace, el trabajo también) y
+# manage.py run_worker los reclama con SELECT ... FOR UPDATE SKIP LOCKED en
+# PostgreSQL o con un UPDATE condicional en el resto. Reclamar un trabajo
+# suma un intento y fija locked_until; si el worker muere, el trabajo vuelve a
+# estar disponible al vencer el plazo. Los errores se reintentan con espera
+# exponencial hasta max_attempts y después quedan como fallidos.
+HANDLERS = {}
+_current = threading.local()
+
+
+class LostLock(Exception):
+    pass
+
+
+class JobType:
+    def __init__(self, name, func, max_attempts, timeout, atomic):
+        self.name = name
+        self.func = func
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.atomic = atomic
+
+
+def job_handler(name, max_attempts=None, timeout=None, atomic=False):
+    # atomic=True: el trabajo y su borrado de la cola van en la misma
+    # transacción, así que sus escrituras se aplican una sola vez aunque se
+    # reintente
+    def decorator(func):
+        HANDLERS[name] = JobType(
+            name, func, max_attempts or settings.JOBS_MAX_ATTEMPTS,
+            timeout or settings.JOBS_VISIBILITY_TIMEOUT, atomic,
+        )
+        return func
+    return decorator
+
+
+def enqueue(name, payload=None, dedupe_key=None, delay=0):
+    # Con dedupe_key, si ya hay uno pendiente con la misma clave no se añade
+    # otro (el pendiente aún no ha empezado, así que verá los datos actuales)
+    fields = {
+        'name': name,
+        'payload': payload or {},
+        'dedupe_key': dedupe_key,
+        'max_attempts': HANDLERS[name].max_attempts,
+        # JOBS_EAGER no espera: se ejecuta al hacer commit
+        'run_at': timezone.now() + timedelta(seconds=0 if settings.JOBS_EAGER else delay),
+    }
+    if dedupe_key is None:
+        job = Job.objects.create(**fields)
+    else:
+        try:
+            with transaction.atomic():
+                job = Job.objects.create(**fields)
+        except IntegrityError:
+            return None
+    if settings.JOBS_EAGER:
+        transaction.on_commit(lambda: run_now(job.pk))
+    return job
+
+
+def claimable(now):
+    return Q(status='pending', run_at__lte=now) | Q(status='running', locked_until__lt=now)
+
+
+def claim(limit, worker_id, ids=None):
+    # Devuelve las ids reclamadas
+    now = timezone.now()
+    queryset = Job.objects.filter(claimable(now)).order_by('run_at', 'id')
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    claimed = []
+    # Sin SKIP LOCKED (SQLite) no se abre transacción: leer y luego escribir
+    # dentro de una falla con "database is locked" si otro escribe a la vez
+    with transaction.atomic() if skip_locked else nullcontext():
+        if skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        for pk, name in queryset.values_list('id', 'name')[:limit]:
+            job_type = HANDLERS.get(name)
+            timeout = job_type.timeout if job_type else settings.JOBS_VISIBILITY_TIMEOUT
+            # Dos workers pueden ver el mismo candidato; solo uno gana este UPDATE
+            updated = Job.objects.filter(claimable(now), pk=pk).update(
+                status='running', attempts=F('attempts') + 1, locked_by=worker_id,
+                locked_until=now + timedelta(seconds=timeout), updated_at=now,
+            )
+            if updated:
+                claimed.append(pk)
+    return claimed
+
+
+def _owned(job):
+    # attempts identifica la reclamación: si el plazo venció y otro worker
+    # retomó el trabajo, ya no coincide
+    return Job.objects.filter(pk=job.pk, status='running', attempts=job.attempts)
+
+
+def _finish(job):
+    if not _owned(job).delete()[0]:
+        raise LostLock(f'El trabajo {job.pk} fue retomado por otro worker')
+
+
+def backoff(attempts):
+    base = settings.JOBS_RETRY_BACKOFF
+    return min(base * 2 ** (attempts - 1), settings.JOBS_RETRY_MAX_BACKOFF) + random.uniform(0, base)
+
+
+def _fail(job, error):
+    now = timezone.now()
+    owned = _owned(job)
+    if job.attempts >= job.max_attempts:
+        owned.update(status='failed', last_error=error, locked_until=None, updated_at=now)
+        return
+    try:
+        with transaction.atomic():
+            owned.update(
+                status='pending', run_at=now + timedelta(seconds=backoff(job.attempts)),
+                last_error=error, locked_until=None, updated_at=now,
+            )
+    except IntegrityError:
+        # Entretanto se encoló otro con la misma clave y ya cubre el reintento
+        owned.delete()
+
+
+def execute(pk):
+    job = Job.objects.filter(pk=pk, status='running').first()
+    if job is None:
+        return
+    job_type = HANDLERS.get(job.name)
+    if job_type is None:
+        job.max_attempts = job.attempts
+        _fail(job, f'Tipo de trabajo desconocido: {job.name}')
+        return
+    if job.attempts > job.max_attempts:
+        # Reclamado tras vencer el plazo de visibilidad en el último intento
+        _fail(job, job.last_error or 'Se superó el plazo de visibilidad')
+        return
+    _current.job = job
+    try:
+        if job_type.atomic:
+            with transaction.atomic():
+                job_type.func(**job.payload)
+                _finish(job)
+        else:
+            job_type.func(**job.payload)
+            _finish(job)
+    except LostLock as e:
+        logger.warning('%s', e)
+    except Exception:
+        logger.exception('Error en el trabajo %s (%s), intento %s', job.pk, job.name, job.attempts)
+        _fail(job, traceback.format_exc())
+    finally:
+        _current.job = None
+
+
+def work(pk):
+    # En los hilos o procesos del worker: las conexiones se tratan como en
+    # una petición (CONN_MAX_AGE, conexiones rotas)
+    close_old_connections()
+    try:
+        execute(pk)
+    finally:
+        close_old_connections()
+
+
+def heartbeat():
+    # Para trabajos largos: amplía el plazo de visibilidad del trabajo en curso
+    job = getattr(_current, 'job', None)
+    if job is None:
+        return
+    timeout = HANDLERS[job.name].timeout
+    _owned(job).update(locked_until=timezone.now() + timedelta(seconds=timeout))
+
+
+def take_pending(name, **payload):
+    # Para trabajos que se agregan en el worker (atomic=True): se queda con
+    # los pendientes del mismo tipo y payload y los borra, y devuelve sus
+    # payloads. Un UPDATE condicional los aparta antes de leerlos, así que
+    # un trabajo que otro worker ya reclamó no se cuenta dos veces.
+    job = _current.job
+    marker = f'take:{job.pk}:{job.attempts}'
+    lookups = {f'payload__{key}': value for key, value in payload.items()}
+    Job.objects.filter(name=name, status='pending', **lookups).exclude(pk=job.pk).update(
+        status='running', locked_by=marker, updated_at=timezone.now(),
+    )
+    taken = Job.objects.filter(status='running', locked_by=marker)
+    payloads = list(taken.values_list('payload', flat=True))
+    taken.delete()
+    return payloads
+
+
+def run_now(pk):
+    # JOBS_EAGER: se ejecuta en el propio proceso al hacer commit
+    for claimed in claim(1, 'eager', ids=[pk]):
+        execute(claimed)
+
+
+def retry(queryset):
+    # Vuelve a poner en cola trabajos fallidos (admin)
+    retried = 0
+    for pk in queryset.filter(status='failed').values_list('id', flat=True):
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                retried += Job.objects.filter(pk=pk, status='failed').update(
+                    status='pending', attempts=0, run_at=now, locked_until=None, updated_at=now,
+                )
+        except IntegrityError:
+            # Ya hay uno pendiente con la misma clave
+            Job.objects.filter(pk=pk).delete()
+    return retried
+
+
+def queue_depth():
+    counts = {(status,): 0 for status, _ in Job.STATUS_CHOICES}
+    for row in Job.objects.order_by().values('status').annotate(total=Count('id')):
+        counts[(row['status'],)] = row['total']
+    return counts
+
+
+JOBS = register(Gauge('kanbanflow_jobs', 'Trabajos en la cola por estado', ('status',), queue_depth))
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'kanbanflow.apps.projects'
\ No newline at end of file
+    name = 'kanbanflow.apps.projects'
+
+    def ready(self):
+        from . import signals  # noqa: F401
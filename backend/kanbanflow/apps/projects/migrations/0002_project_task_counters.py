@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 07:35
+
+from django.db import migrations, models
+
+
+def backfill_task_counters(apps, schema_editor):
+    # Tareas del tablero (sin las archivadas) por proyecto y estado
+    from django.db.models import Count
+
+    Project = apps.get_model('projects', 'Project')
+    Task = apps.get_model('tasks', 'Task')
+    fields = {'pending': 'pending_tasks', 'in_progress': 'in_progress_tasks', 'completed': 'completed_tasks'}
+    counts = {}
+    for row in Task.objects.order_by().values('project_id', 'status').annotate(total=Count('id')):
+        if row['status'] in fields:
+            counts.setdefault(row['project_id'], {})[fields[row['status']]] = row['total']
+    for project_id, values in counts.items():
+        Project.objects.filter(pk=project_id).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        ('tasks', '0009_task_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_tasks',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_tasks',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='pending_tasks',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    ]
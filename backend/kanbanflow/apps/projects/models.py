@@ -1,6 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+# Estado de la tarea -> contador en Project
+COUNTER_FIELDS = {'pending': 'pending_tasks', 'in_progress': 'in_progress_tasks', 'completed': 'completed_tasks'}
+
+
 class Project(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
@@ -8,9 +12,32 @@ class Project(models.Model):
     members = models.ManyToManyField(User, related_name='projects', blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Tareas del tablero por estado, mantenidas por tasks/counters.py
+    # (manage.py recount_projects las recalcula)
+    pending_tasks = models.IntegerField(default=0)
+    in_progress_tasks = models.IntegerField(default=0)
+    completed_tasks = models.IntegerField(default=0)
     
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        # Los contadores solo cambian con F(): guardar el proyecto no debe
+        # pisar los incrementos de otras transacciones
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            skip = {*COUNTER_FIELDS.values(), *self.get_deferred_fields()}
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skip
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Dueño original, para invalidar su caché de pertenencia si cambia
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_owner_id = instance.__dict__.get('owner_id')
+        return instance
     
     class Meta:
         ordering = ['-created_at']
\ No newline at end of file
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from kanbanflow.cache import get_version, invalidate_on_commit
+from .models import Project
+
+# Proyectos visibles por usuario (dueño o miembro). El conjunto se guarda en
+# la caché bajo la versión del ámbito "user:<id>", que se incrementa al
+# cambiar la pertenencia, y se memoriza en el propio request.user: la
+# autorización no añade consultas mientras la caché esté caliente.
+MEMBERSHIP_KEY = 'kf:members:%s:%s'
+
+
+def user_scope(user_id):
+    return f'user:{user_id}'
+
+
+def invalidate_memberships(*user_ids):
+    invalidate_on_commit(*[user_scope(pk) for pk in user_ids if pk is not None])
+
+
+def visible_project_ids(user):
+    if user is None or not user.is_authenticated:
+        return frozenset()
+    project_ids = getattr(user, '_visible_project_ids', None)
+    if project_ids is None:
+        version, _ = get_version(user_scope(user.pk))
+        key = MEMBERSHIP_KEY % (user.pk, version)
+        project_ids = cache.get(key)
+        if project_ids is None:
+            # Siempre del primario: con una réplica atrasada se cachearía una
+            # pertenencia vieja bajo la versión nueva
+            project_ids = frozenset(
+                Project.objects.using(DEFAULT_DB_ALIAS).filter(Q(owner=user.pk) | Q(members=user.pk))
+                .order_by().values_list('id', flat=True).distinct()
+            )
+            cache.set(key, project_ids, settings.PROJECT_MEMBERSHIP_CACHE_TIMEOUT)
+        user._visible_project_ids = project_ids
+    return project_ids
+
+
+def check_project_access(user, project_id):
+    if project_id not in visible_project_ids(user):
+        raise PermissionDenied(IsProjectMember.message)
+
+
+class IsProjectMember(IsAuthenticated):
+    # Sobre un proyecto o cualquier objeto con project_id. Solo el dueño
+    # puede borrar un proyecto.
+    message = 'No eres miembro del proyecto'
+
+    def has_object_permission(self, request, view, obj):
+        if isinstance(obj, Project):
+            if getattr(view, 'action', None) == 'destroy':
+                return obj.owner_id == request.user.pk
+            return obj.pk in visible_project_ids(request.user)
+        return obj.project_id in visible_project_ids(request.user)
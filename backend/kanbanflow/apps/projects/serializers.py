@@ -1,12 +1,57 @@
 from rest_framework import serializers
+from django.db.models import Prefetch
 from .models import Project
 from django.contrib.auth.models import User
+from kanbanflow.fastpath import FastRows, datetime_converter
+from kanbanflow.serializers import SparseFieldsetMixin, TimedSerializerMixin
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     owner = serializers.StringRelatedField(read_only=True)
     members = serializers.StringRelatedField(many=True, read_only=True)
     
     class Meta:
         model = Project
-        fields = ['id', 'name', 'description', 'owner', 'members', 'created_at', 'updated_at']
-        read_only_fields = ['created_at', 'updated_at']
\ No newline at end of file
+        fields = ['id', 'name', 'description', 'owner', 'members', 'created_at', 'updated_at',
+                  'pending_tasks', 'in_progress_tasks', 'completed_tasks']
+        read_only_fields = ['created_at', 'updated_at', 'pending_tasks', 'in_progress_tasks', 'completed_tasks']
+
+
+def optimize_project_queryset(queryset):
+    # Owner por JOIN y miembros en una única consulta adicional para toda la
+    # página, en ambos casos solo con el username
+    fields = [field.name for field in Project._meta.concrete_fields]
+    members = User.objects.only('id', 'username').order_by('id')
+    return (
+        queryset.select_related('owner')
+        .only(*fields, 'owner__username')
+        .prefetch_related(Prefetch('members', queryset=members))
+    )
+
+
+# Equivalente de ProjectSerializer para la ruta rápida de los listados
+PROJECT_FAST_ROWS = FastRows(
+    ('id', 'id', None),
+    ('name', 'name', None),
+    ('description', 'description', None),
+    ('owner', 'owner__username', None),
+    ('members', None, None),
+    ('created_at', 'created_at', datetime_converter),
+    ('updated_at', 'updated_at', datetime_converter),
+    ('pending_tasks', 'pending_tasks', None),
+    ('in_progress_tasks', 'in_progress_tasks', None),
+    ('completed_tasks', 'completed_tasks', None),
+)
+
+
+def attach_members(rows):
+    # Una consulta para los miembros de toda la página, en el mismo orden que
+    # el Prefetch de optimize_project_queryset
+    if not rows or 'members' not in rows[0]:
+        return rows
+    members = {}
+    through = Project.members.through.objects.filter(project_id__in=[row['id'] for row in rows])
+    for project_id, username in through.order_by('user_id').values_list('project_id', 'user__username'):
+        members.setdefault(project_id, []).append(username)
+    for row in rows:
+        row['members'] = members.get(row['id'], [])
+    return rows
@@ -0,0 +1,53 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from kanbanflow.cache import invalidate_on_commit, project_scope
+from kanbanflow.events import publish_on_commit
+from .models import Project
+from .permissions import invalidate_memberships
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_cache(sender, instance, **kwargs):
+    invalidate_on_commit('projects', project_scope(instance.pk))
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_owner_memberships(sender, instance, **kwargs):
+    invalidate_memberships(instance.owner_id, getattr(instance, '_loaded_owner_id', None))
+
+
+@receiver(post_save, sender=Project)
+def publish_project_saved(sender, instance, **kwargs):
+    publish_on_commit(instance.pk, {'type': 'project.updated', 'id': instance.pk})
+
+
+@receiver(post_delete, sender=Project)
+def publish_project_deleted(sender, instance, **kwargs):
+    publish_on_commit(instance.pk, {'type': 'project.deleted', 'id': instance.pk})
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def project_members_changed(sender, instance, action, pk_set=None, **kwargs):
+    if action == 'pre_clear':
+        # Tras el clear ya no se sabe a quién afectaba
+        if isinstance(instance, Project):
+            instance._cleared_member_ids = list(instance.members.values_list('id', flat=True))
+        else:
+            instance._cleared_project_ids = list(instance.projects.values_list('id', flat=True))
+        return
+    if not action.startswith('post_'):
+        return
+    # El cambio puede venir desde project.members o desde user.projects
+    if isinstance(instance, Project):
+        project_ids = [instance.pk]
+        user_ids = list(pk_set or getattr(instance, '_cleared_member_ids', []))
+    else:
+        project_ids = list(pk_set or getattr(instance, '_cleared_project_ids', []))
+        user_ids = [instance.pk]
+    invalidate_memberships(*user_ids)
+    # El listado global de tareas depende de los proyectos visibles
+    invalidate_on_commit('projects', 'tasks', *[project_scope(pk) for pk in project_ids])
+    for pk in project_ids:
+        publish_on_commit(pk, {'type': 'project.members', 'id': pk})
@@ -1,17 +1,124 @@
 from rest_framework import viewsets
-from rest_framework.permissions import AllowAny
-from django.contrib.auth.models import User
-from django.views.decorators.cache import cache_page
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
 from django.utils.decorators import method_decorator
+from kanbanflow.cache import project_scope, versioned_cache
+from kanbanflow.db_router import ReplicaReadsMixin
+from kanbanflow.events import aevent_stream, event_stream
+from kanbanflow.fastpath import FastListMixin, json_response, wants_fast_path
+from kanbanflow.negotiation import accepted_encodings
+from kanbanflow.renderers import CSVRenderer, EventStreamRenderer, NDJSONRenderer
+from kanbanflow.serializers import defer_unrequested
 from .models import Project
-from .serializers import ProjectSerializer
+from .permissions import IsProjectMember, visible_project_ids
+from .serializers import PROJECT_FAST_ROWS, ProjectSerializer, attach_members, optimize_project_queryset
 
-@method_decorator(cache_page(60), name='list')  # Cache por 1 minuto
-class ProjectViewSet(viewsets.ModelViewSet):
+@method_decorator(versioned_cache(lambda request: 'projects'), name='list')
+@method_decorator(versioned_cache(lambda request, pk=None: project_scope(pk)), name='board')
+@method_decorator(versioned_cache(lambda request, pk=None: project_scope(pk)), name='stats')
+class ProjectViewSet(ReplicaReadsMixin, FastListMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
-    permission_classes = [AllowAny]
-    queryset = Project.objects.select_related('owner').order_by('-created_at')
-    
+    fast_rows = PROJECT_FAST_ROWS
+    permission_classes = [IsProjectMember]
+    replica_actions = ('list', 'retrieve', 'board', 'stats')
+    queryset = optimize_project_queryset(Project.objects.order_by('-created_at', '-id'))
+
+    def get_queryset(self):
+        project_ids = visible_project_ids(self.request.user)
+        if self.action in ('stats', 'export', 'events'):
+            # Solo necesitan comprobar que el proyecto existe y es visible
+            return Project.objects.only('id').filter(pk__in=project_ids)
+        return defer_unrequested(super().get_queryset().filter(pk__in=project_ids), self.request, ('description',))
+
+    def complete_fast_rows(self, rows):
+        return attach_members(rows)
+
     def perform_create(self, serializer):
-        user = User.objects.first() or User.objects.create_user('demo', 'demo@demo.com', 'demo')
-        serializer.save(owner=user)
\ No newline at end of file
+        serializer.save(owner=self.request.user)
+
+    @action(detail=True, methods=['get'])
+    def board(self, request, pk=None):
+        from kanbanflow.apps.tasks.board import BOARD_PAGE_SIZE, BOARD_MAX_PAGE_SIZE, build_board
+        from kanbanflow.apps.tasks.models import Task
+
+        project = self.get_object()
+        column = request.query_params.get('column')
+        cursor = request.query_params.get('cursor')
+        if column and column not in dict(Task.STATUS_CHOICES):
+            return Response({'error': 'Columna inválida'}, status=400)
+        if cursor and not column:
+            return Response({'error': 'El cursor requiere una columna'}, status=400)
+        try:
+            limit = int(request.query_params.get('limit', BOARD_PAGE_SIZE))
+        except ValueError:
+            return Response({'error': 'Límite inválido'}, status=400)
+        limit = max(1, min(limit, BOARD_MAX_PAGE_SIZE))
+
+        fast = wants_fast_path(request)
+        try:
+            columns = build_board(project, limit, column, cursor, fast=fast)
+        except (ValueError, ValidationError):
+            return Response({'error': 'Cursor inválido'}, status=400)
+        data = {
+            'project': self.get_serializer(project).data,
+            'columns': columns,
+        }
+        return json_response(data) if fast else Response(data)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        from kanbanflow.apps.tasks.stats import STATS_MAX_WEEKS, STATS_WEEKS, project_stats
+
+        project = self.get_object()
+        try:
+            weeks = int(request.query_params.get('weeks', STATS_WEEKS))
+        except ValueError:
+            return Response({'error': 'Número de semanas inválido'}, status=400)
+        weeks = max(1, min(weeks, STATS_MAX_WEEKS))
+        return Response({'project': project.pk, **project_stats(project, weeks)})
+
+    @action(detail=True, methods=['get'], renderer_classes=[EventStreamRenderer, JSONRenderer])
+    def events(self, request, pk=None):
+        # Server-Sent Events con los cambios del proyecto; se reanuda desde
+        # Last-Event-ID (o ?last_event_id= para clientes sin EventSource)
+        project = self.get_object()
+        last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+        if isinstance(request._request, ASGIRequest):
+            stream = aevent_stream(project.pk, last_event_id)
+        else:
+            stream = event_stream(project.pk, last_event_id)
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @action(detail=True, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer, JSONRenderer])
+    def export(self, request, pk=None):
+        # ?format=ndjson|csv; filtros status, priority, from y to
+        from kanbanflow.apps.tasks.export import ExportError, aexport_chunks, export_chunks, export_queryset
+
+        project = self.get_object()
+        export_format = request.accepted_renderer.format
+        if export_format not in ('ndjson', 'csv'):
+            export_format = 'ndjson'
+        try:
+            queryset = export_queryset(project, request.query_params)
+        except ExportError as e:
+            return Response({'error': str(e)}, status=400)
+
+        gzip = 'gzip' in accepted_encodings(request, ['gzip'])
+        chunks = export_chunks(queryset, export_format, gzip=gzip)
+        if isinstance(request._request, ASGIRequest):
+            chunks = aexport_chunks(chunks)
+        content_type = 'application/x-ndjson' if export_format == 'ndjson' else 'text/csv; charset=utf-8'
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="proyecto-{project.pk}-tareas.{export_format}"'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if gzip:
+            response['Content-Encoding'] = 'gzip'
+        return response
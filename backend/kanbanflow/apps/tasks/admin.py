@@ -1,8 +1,53 @@
 from django.contrib import admin
-from .models import Task
+from .models import ArchivedTask, Task, TaskImportJob
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ['title', 'project', 'status', 'priority', 'created_by', 'created_at']
     list_filter = ['status', 'priority', 'created_at']
-    search_fields = ['title', 'description']
\ No newline at end of file
+    search_fields = ['title', 'description']
+
+    def get_search_results(self, request, queryset, search_term):
+        # Mismo índice de texto completo que /api/tasks/search/
+        from .search import search_queryset
+
+        if not search_term.strip():
+            return queryset, False
+        return search_queryset(queryset, search_term), False
+
+    @admin.action(description='Archivar las tareas completadas seleccionadas')
+    def archive_selected(self, request, queryset):
+        from .archive import archive_batch
+
+        ids = list(queryset.filter(status='completed').values_list('id', flat=True))
+        moved = archive_batch(Task.objects.filter(pk__in=ids, status='completed'), len(ids)) if ids else 0
+        self.message_user(request, f'{moved} tareas archivadas')
+
+    actions = ['archive_selected']
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+    list_display = ['title', 'project', 'priority', 'created_by', 'created_at', 'archived_at']
+    list_filter = ['priority', 'archived_at']
+    search_fields = ['title', 'description']
+    list_select_related = ['project', 'created_by']
+    actions = ['restore_selected']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description='Devolver al tablero')
+    def restore_selected(self, request, queryset):
+        from .archive import restore_tasks
+
+        restored = restore_tasks(list(queryset.values_list('id', flat=True)))
+        self.message_user(request, f'{restored} tareas restauradas')
+
+@admin.register(TaskImportJob)
+class TaskImportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'project', 'status', 'processed_rows', 'imported_rows', 'error_rows', 'created_at']
+    list_filter = ['status', 'format']
+    readonly_fields = ['processed_rows', 'imported_rows', 'error_rows', 'errors', 'finished_at']
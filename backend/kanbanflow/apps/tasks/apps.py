@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'kanbanflow.apps.tasks'
\ No newline at end of file
+    name = 'kanbanflow.apps.tasks'
+
+    def ready(self):
+        from . import archive, jobs, signals  # noqa: F401
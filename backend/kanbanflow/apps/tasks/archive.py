@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from kanbanflow.cache import invalidate_on_commit, project_scope
+from kanbanflow.events import publish_on_commit
+from kanbanflow.metrics import Gauge, register
+from . import counters
+from .models import ArchivedTask, Task, TaskStatusTransition, TaskTombstone
+from .signals import handled_in_batch
+
+# Archivo de tareas completadas: se mueven por lotes de Task a ArchivedTask
+# conservando la id. Para los clientes una tarea archivada es una tarea
+# borrada (tombstone y evento tasks.archived); el historial de transiciones
+# se descarta porque ya está agregado en TaskDailyStats.
+TASK_FIELDS = [field.attname for field in Task._meta.concrete_fields]
+ROWS_CACHE_KEY = 'kf:task-rows'
+ROWS_CACHE_TIMEOUT = 60
+
+
+def include_archived(request):
+    return request.query_params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+
+def archivable(older_than_days, project_id=None):
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    queryset = Task.objects.filter(status='completed', updated_at__lt=cutoff)
+    if project_id is not None:
+        queryset = queryset.filter(project_id=project_id)
+    return queryset
+
+
+def _moved(project_counts, kind):
+    scopes = [project_scope(project_id) for project_id in project_counts]
+    invalidate_on_commit('tasks', *scopes)
+    for project_id, count in project_counts.items():
+        publish_on_commit(project_id, {'type': kind, 'count': count})
+
+
+def archive_batch(queryset, batch_size):
+    # Un lote de queryset por transacción; devuelve cuántas tareas se movieron
+    with transaction.atomic():
+        ids = list(
+            queryset.order_by('id')
+            .select_for_update(skip_locked=connection.features.has_select_for_update_skip_locked)
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        rows = list(Task.objects.filter(pk__in=ids).values(*TASK_FIELDS))
+        ArchivedTask.objects.bulk_create([ArchivedTask(**row) for row in rows])
+        TaskTombstone.objects.bulk_create([
+            TaskTombstone(task_id=row['id'], project_id=row['project_id']) for row in rows
+        ])
+        TaskStatusTransition.objects.filter(task_id__in=ids).delete()
+        # Las señales por fila no hacen nada aquí: tombstones, contadores,
+        # caché y eventos van por lote en esta misma transacción
+        with handled_in_batch():
+            Task.objects.filter(pk__in=ids).delete()
+        counts, deltas = {}, {}
+        for row in rows:
+            counts[row['project_id']] = counts.get(row['project_id'], 0) + 1
+            key = (row['project_id'], row['status'])
+            deltas[key] = deltas.get(key, 0) - 1
+        # Las archivadas dejan de contar en el tablero del proyecto
+        counters.adjust(deltas)
+        _moved(counts, 'tasks.archived')
+    return len(rows)
+
+
+def restore_tasks(ids):
+    # Vuelven al tablero con updated_at actual para que /changes/ las
+    # entregue; sus tombstones dejan de valer
+    with transaction.atomic():
+        rows = list(ArchivedTask.objects.select_for_update().filter(pk__in=ids).values(*TASK_FIELDS))
+        if not rows:
+            return 0
+        now = timezone.now()
+        tasks = [Task(**{**row, 'updated_at': now, 'version': row['version'] + 1}) for row in rows]
+        Task.objects.bulk_create(tasks)
+        counters.count_created(tasks)
+        restored = [row['id'] for row in rows]
+        TaskTombstone.objects.filter(task_id__in=restored).delete()
+        ArchivedTask.objects.filter(pk__in=restored).delete()
+        counts = {}
+        for row in rows:
+            counts[row['project_id']] = counts.get(row['project_id'], 0) + 1
+        _moved(counts, 'tasks.restored')
+    return len(rows)
+
+
+def merged_page(querysets, ordering, limit, cursor=None):
+    # Paginación por keyset sobre varias tablas con la misma ordenación (en
+    # un solo sentido): una página de cada una y se mezclan. Devuelve
+    # (índice de la tabla, fila).
+    from kanbanflow.pagination import decode_cursor, encode_cursor, keyset_filter, row_position
+
+    values = decode_cursor(cursor, len(ordering)) if cursor else None
+    rows = []
+    for index, queryset in enumerate(querysets):
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = keyset_filter(queryset, ordering, values)
+        rows += [(index, row) for row in queryset[:limit + 1]]
+    rows.sort(key=lambda item: row_position(item[1], ordering), reverse=ordering[0].startswith('-'))
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(row_position(rows[-1][1], ordering))
+    return rows, next_cursor
+
+
+def table_rows():
+    # Filas en la tabla caliente y en el archivo. En PostgreSQL, la
+    # estimación del planificador (un COUNT(*) recorrería la tabla entera).
+    counts = cache.get(ROWS_CACHE_KEY)
+    if counts is None:
+        counts = {}
+        for label, model in (('hot', Task), ('archived', ArchivedTask)):
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [model._meta.db_table])
+                    row = cursor.fetchone()
+                counts[(label,)] = max(row[0], 0) if row else 0
+            else:
+                counts[(label,)] = model.objects.count()
+        cache.set(ROWS_CACHE_KEY, counts, ROWS_CACHE_TIMEOUT)
+    return counts
+
+
+TASK_ROWS = register(Gauge('kanbanflow_task_rows', 'Tareas en la tabla caliente y en el archivo', ('table',), table_rows))
@@ -0,0 +1,47 @@
+from django.db.models import Count
+from kanbanflow.pagination import keyset_page
+from .models import Task
+from .serializers import TASK_FAST_ROWS, TaskSerializer, optimize_task_queryset
+
+BOARD_ORDERING = ('rank', 'id')
+BOARD_PAGE_SIZE = 50
+BOARD_MAX_PAGE_SIZE = 200
+
+
+def column_counts(project):
+    counts = dict(
+        Task.objects.filter(project=project)
+        .order_by()
+        .values_list('status')
+        .annotate(total=Count('id'))
+    )
+    return {status: counts.get(status, 0) for status, _ in Task.STATUS_CHOICES}
+
+
+def column_page(project, status, limit, cursor=None, fast=False):
+    queryset = Task.objects.filter(project=project, status=status)
+    if fast:
+        queryset = TASK_FAST_ROWS.queryset(queryset, extra=BOARD_ORDERING)
+        tasks, next_cursor = keyset_page(queryset, BOARD_ORDERING, limit, cursor)
+        results = TASK_FAST_ROWS.rows(tasks, extra=BOARD_ORDERING)
+    else:
+        tasks, next_cursor = keyset_page(optimize_task_queryset(queryset), BOARD_ORDERING, limit, cursor)
+        results = TaskSerializer(tasks, many=True).data
+    return {
+        'results': results,
+        'next': next_cursor,
+    }
+
+
+def build_board(project, limit, column=None, cursor=None, fast=False):
+    # Una consulta de conteos agrupados + una consulta limitada por columna,
+    # independientemente del tamaño del proyecto.
+    counts = column_counts(project)
+    statuses = [column] if column else list(counts)
+    columns = {}
+    for status in statuses:
+        columns[status] = {
+            'count': counts[status],
+            **column_page(project, status, limit, cursor if column else None, fast),
+        }
+    return columns
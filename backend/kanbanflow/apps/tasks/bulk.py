@@ -0,0 +1,196 @@
+from django.db import transaction
+from rest_framework import serializers
+from kanbanflow.apps.projects.models import Project
+from kanbanflow.cache import invalidate_on_commit, project_scope
+from . import counters
+from .concurrency import VersionConflict, changed_fields, save_changes
+from .feed import publish_task_event
+from .models import Task
+from .ranking import schedule_long_columns, top_ranks
+from .serializers import TaskSerializer
+from .stats import record_created, record_transitions
+
+BULK_MAX_OPERATIONS = 500
+BULK_OPERATIONS = ('create', 'update', 'move', 'delete')
+VERSION_CONFLICT = {'version': 'La tarea ha cambiado desde que se leyó'}
+
+
+class BulkTaskSerializer(TaskSerializer):
+    # Los proyectos se resuelven con una sola consulta para todo el lote en
+    # lugar de una por elemento.
+    project = serializers.IntegerField()
+
+    def validate_project(self, value):
+        project = self.context['projects'].get(value)
+        if project is None:
+            raise serializers.ValidationError('Proyecto inexistente')
+        return project
+
+
+class BulkError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+
+
+def is_integer(value):
+    # En JSON true/false llegan como bool, que en Python es subclase de int
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def assign_top_ranks(tasks):
+    columns = {}
+    for task in tasks:
+        columns.setdefault((task.project_id, task.status), []).append(task)
+    for (project_id, status), column in columns.items():
+        for task, rank in zip(column, top_ranks(project_id, status, len(column))):
+            task.rank = rank
+    schedule_long_columns(tasks)
+
+
+def run_bulk(operations, user, atomic=False, project_ids=None):
+    # project_ids: proyectos sobre los que puede operar el usuario (None = todos)
+    if not isinstance(operations, list) or not operations:
+        raise BulkError({'operations': 'Se requiere una lista de operaciones'})
+    if len(operations) > BULK_MAX_OPERATIONS:
+        raise BulkError({'operations': f'Máximo {BULK_MAX_OPERATIONS} operaciones por petición'})
+
+    ids = [op.get('id') for op in operations if isinstance(op, dict) and op.get('op') != 'create']
+    tasks = Task.objects.all() if project_ids is None else Task.objects.filter(project_id__in=project_ids)
+    tasks = tasks.in_bulk([pk for pk in ids if is_integer(pk)])
+    original_status = {pk: task.status for pk, task in tasks.items()}
+    requested = [
+        op['data'].get('project') for op in operations
+        if isinstance(op, dict) and op.get('op') in ('create', 'update') and isinstance(op.get('data'), dict)
+    ]
+    projects = Project.objects.all() if project_ids is None else Project.objects.filter(pk__in=project_ids)
+    projects = projects.in_bulk([pk for pk in requested if is_integer(pk)])
+    context = {'projects': projects}
+
+    results = []
+    to_create, to_update, to_delete = [], {}, set()
+    # Por tarea: campos que cambia su operación y versión esperada
+    changes, versions, update_results = {}, {}, {}
+    touched_projects = set()
+    seen = set()
+
+    for index, op in enumerate(operations):
+        kind = op.get('op') if isinstance(op, dict) else None
+        result = {'index': index, 'op': kind}
+        results.append(result)
+        if kind not in BULK_OPERATIONS:
+            result.update(status='error', errors={'op': f'Operación inválida, se esperaba una de {", ".join(BULK_OPERATIONS)}'})
+            continue
+
+        if kind == 'create':
+            serializer = BulkTaskSerializer(data=op.get('data') or {}, context=context)
+            if not serializer.is_valid():
+                result.update(status='error', errors=serializer.errors)
+                continue
+            task = Task(created_by=user, **serializer.validated_data)
+            to_create.append((result, task))
+            touched_projects.add(task.project_id)
+            result['status'] = 'ok'
+            continue
+
+        # tasks.get(True) devolvería la tarea 1
+        task = tasks.get(op.get('id')) if is_integer(op.get('id')) else None
+        if task is None:
+            result.update(status='error', errors={'id': 'Tarea inexistente'})
+            continue
+        if task.pk in seen:
+            result.update(status='error', errors={'id': 'Operación duplicada para la tarea'})
+            continue
+        seen.add(task.pk)
+        result['id'] = task.pk
+        touched_projects.add(task.project_id)
+        version = op.get('version')
+        if kind != 'delete' and version is not None and (not is_integer(version) or version != task.version):
+            result.update(status='error', errors=VERSION_CONFLICT)
+            continue
+
+        if kind == 'delete':
+            to_delete.add(task.pk)
+        elif kind == 'move':
+            if op.get('status') not in dict(Task.STATUS_CHOICES):
+                result.update(status='error', errors={'status': 'Estado inválido'})
+                continue
+            changes[task.pk] = changed_fields(task, {'status': op['status']})
+            task.status = op['status']
+            to_update[task.pk] = task
+        else:
+            serializer = BulkTaskSerializer(task, data=op.get('data') or {}, partial=True, context=context)
+            if not serializer.is_valid():
+                result.update(status='error', errors=serializer.errors)
+                continue
+            changes[task.pk] = changed_fields(task, serializer.validated_data)
+            for field, value in serializer.validated_data.items():
+                setattr(task, field, value)
+                if field == 'project':
+                    touched_projects.add(value.pk)
+            to_update[task.pk] = task
+        if kind != 'delete':
+            versions[task.pk] = task.version
+            update_results[task.pk] = result
+        result['status'] = 'ok'
+
+    failed = any(result['status'] == 'error' for result in results)
+    if atomic and failed:
+        for result in results:
+            if result['status'] == 'ok':
+                result['status'] = 'skipped'
+        return results, False
+
+    try:
+        with transaction.atomic():
+            conflicts = write_bulk(to_create, to_update, to_delete, changes, versions, original_status, user, atomic)
+            invalidate_on_commit('tasks', *[project_scope(pk) for pk in touched_projects])
+    except VersionConflict as e:
+        # atomic: otra petición cambió una tarea entre la lectura y la
+        # escritura y se deshace el lote entero
+        for result in results:
+            result['status'] = 'skipped'
+            if result['op'] == 'create':
+                result.pop('id', None)
+        update_results[e.args[0]].update(status='error', errors=VERSION_CONFLICT)
+        return results, False
+    for pk in conflicts:
+        update_results[pk].update(status='error', errors=VERSION_CONFLICT)
+    return results, not failed and not conflicts
+
+
+def write_bulk(to_create, to_update, to_delete, changes, versions, original_status, user, atomic):
+    # bulk_create no pasa por Task.save: las tarjetas nuevas o movidas se
+    # colocan al principio de su columna
+    moved = [task for task in to_update.values() if task.status != original_status[task.pk]]
+    assign_top_ranks([task for _, task in to_create] + moved)
+    for task in moved:
+        changes[task.pk].append('rank')
+    if to_create:
+        Task.objects.bulk_create([task for _, task in to_create])
+        for result, task in to_create:
+            result['id'] = task.pk
+        record_created([task for _, task in to_create])
+        counters.count_created([task for _, task in to_create])
+        # bulk_create no emite post_save
+        for _, task in to_create:
+            publish_task_event(task, 'created')
+
+    # Cada cambio es un UPDATE condicional a la versión leída (o la indicada
+    # en la operación) con solo sus campos, como en concurrency.save_changes;
+    # post_save actualiza caché, eventos y contadores
+    conflicts, updated = [], []
+    for task in to_update.values():
+        if not changes[task.pk]:
+            continue
+        try:
+            save_changes(task, changes[task.pk], versions[task.pk])
+        except VersionConflict:
+            if atomic:
+                raise VersionConflict(task.pk)
+            conflicts.append(task.pk)
+            continue
+        updated.append((task, original_status[task.pk]))
+    record_transitions(updated, user)
+    if to_delete:
+        Task.objects.filter(pk__in=to_delete).delete()
+    return conflicts
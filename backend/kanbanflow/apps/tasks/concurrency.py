@@ -0,0 +1,70 @@
+from django.db import router
+from django.db.models import F
+from django.db.models.signals import post_save
+from django.utils import timezone
+from django.utils.http import quote_etag
+from .models import Task
+
+# Control de concurrencia optimista. Cada cambio de una tarea es un único
+# UPDATE con solo los campos cambiados, condicionado a la versión:
+#   UPDATE tasks_task SET <campos>, version = version + 1 WHERE id = %s AND version = %s
+# Si otro cambio llegó antes no se actualiza ninguna fila y la API responde
+# 409 con el estado actual. La versión viaja como ETag / If-Match.
+
+
+class VersionConflict(Exception):
+    pass
+
+
+def version_etag(task):
+    return quote_etag(str(task.version))
+
+
+def requested_version(request):
+    # If-Match: "3" (también W/"3" o version en el cuerpo); None si no se
+    # indica o es *. ValueError si no es un número.
+    value = request.headers.get('If-Match', '').strip()
+    if value == '*':
+        return None
+    if value:
+        value = value.removeprefix('W/').strip('"')
+    elif hasattr(request.data, 'get'):
+        value = request.data.get('version')
+    if value in (None, ''):
+        return None
+    version = int(value)
+    if version < 1:
+        raise ValueError(value)
+    return version
+
+
+def changed_fields(task, data):
+    # Campos de validated_data que cambian el valor actual (las relaciones
+    # se comparan por id, sin cargarlas)
+    changed = []
+    for name, value in data.items():
+        field = Task._meta.get_field(name)
+        if field.is_relation:
+            value = value.pk if value is not None else None
+        if getattr(task, field.attname) != value:
+            changed.append(name)
+    return changed
+
+
+def save_changes(task, fields, version=None):
+    # version: la que vio el cliente; por defecto la leída con la tarea.
+    # Lanza VersionConflict si la tarea cambió entre medias.
+    expected = task.version if version is None else version
+    if expected != task.version:
+        raise VersionConflict()
+    task.updated_at = timezone.now()
+    names = sorted(set(fields) | {'updated_at'})
+    values = {Task._meta.get_field(name).attname: getattr(task, Task._meta.get_field(name).attname) for name in names}
+    if not Task.objects.filter(pk=task.pk, version=expected).update(version=F('version') + 1, **values):
+        raise VersionConflict()
+    task.version = expected + 1
+    # UPDATE no emite post_save: caché, eventos y estadísticas igual que con save()
+    post_save.send(
+        sender=Task, instance=task, created=False, raw=False,
+        update_fields=frozenset(names + ['version']), using=router.db_for_write(Task),
+    )
@@ -0,0 +1,78 @@
+from collections import defaultdict
+
+from django.db.models import Count, F
+from kanbanflow.apps.projects.models import COUNTER_FIELDS, Project
+from kanbanflow.cache import invalidate_on_commit
+from .models import Task
+
+# Contadores de tareas por estado en Project, para que el listado de
+# proyectos muestre el progreso sin agregar sobre las tareas. Cada alta,
+# borrado o cambio de estado/proyecto hace UPDATE ... SET n = n + 1 (F()) en
+# la misma transacción; las tareas archivadas dejan de contar.
+# manage.py recount_projects corrige cualquier desviación.
+
+
+def adjust(deltas):
+    # deltas: {(project_id, status): incremento}; un UPDATE por proyecto
+    changes = defaultdict(dict)
+    for (project_id, status), delta in deltas.items():
+        field = COUNTER_FIELDS.get(status)
+        if delta and field and project_id is not None:
+            changes[project_id][field] = changes[project_id].get(field, 0) + delta
+    for project_id, fields in sorted(changes.items()):
+        updates = {field: F(field) + delta for field, delta in fields.items() if delta}
+        if updates:
+            Project.objects.filter(pk=project_id).update(**updates)
+    if changes:
+        invalidate_on_commit('projects')
+
+
+def loaded(task):
+    # Proyecto y estado con los que se leyó la tarea (Task.from_db)
+    return getattr(task, '_loaded_project_id', None), getattr(task, '_loaded_status', None)
+
+
+def _mark_loaded(task):
+    task._loaded_project_id = task.project_id
+    task._loaded_status = task.status
+
+
+def count_created(tasks):
+    deltas = defaultdict(int)
+    for task in tasks:
+        deltas[(task.project_id, task.status)] += 1
+        _mark_loaded(task)
+    adjust(deltas)
+
+
+def count_changed(tasks):
+    deltas = defaultdict(int)
+    for task in tasks:
+        before, after = loaded(task), (task.project_id, task.status)
+        # Sin estado leído (only()/defer) no se sabe de dónde sale
+        if None not in before and before != after:
+            deltas[before] -= 1
+            deltas[after] += 1
+        _mark_loaded(task)
+    adjust(deltas)
+
+
+def count_deleted(tasks):
+    # Cuenta lo que había en la base de datos (lo leído), no lo modificado
+    deltas = defaultdict(int)
+    for task in tasks:
+        before = loaded(task)
+        deltas[before if None not in before else (task.project_id, task.status)] -= 1
+    adjust(deltas)
+
+
+def current_counts(project_ids):
+    counts = {pk: dict.fromkeys(COUNTER_FIELDS.values(), 0) for pk in project_ids}
+    rows = (
+        Task.objects.filter(project_id__in=project_ids).order_by()
+        .values_list('project_id', 'status').annotate(total=Count('id'))
+    )
+    for project_id, status, total in rows:
+        if status in COUNTER_FIELDS:
+            counts[project_id][COUNTER_FIELDS[status]] = total
+    return counts
@@ -0,0 +1,113 @@
+import csv
+import io
+import zlib
+from datetime import datetime, time
+from itertools import islice
+
+from django.conf import settings
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils import timezone
+from kanbanflow.fastpath import dumps
+from .models import Task
+from .serializers import TASK_FAST_ROWS
+
+# Exportación en streaming: las filas se leen con un cursor de servidor
+# (iterator) y se escriben por bloques, así que la memoria no depende del
+# tamaño del proyecto.
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_COLUMNS = [name for name, _, _ in TASK_FAST_ROWS.fields]
+
+
+class ExportError(Exception):
+    pass
+
+
+def _parse_moment(value, end=False):
+    try:
+        moment = parse_datetime(value)
+        day = parse_date(value) if moment is None else None
+    except ValueError:
+        raise ExportError('Fecha inválida')
+    if moment is None:
+        if day is None:
+            raise ExportError('Fecha inválida')
+        moment = datetime.combine(day, time.max if end else time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_queryset(project, params):
+    # Filtros: status, priority y rango de creación (from/to, fecha o fecha y hora)
+    queryset = Task.objects.filter(project=project)
+    status = params.get('status')
+    if status:
+        if status not in dict(Task.STATUS_CHOICES):
+            raise ExportError('Estado inválido')
+        queryset = queryset.filter(status=status)
+    priority = params.get('priority')
+    if priority:
+        if priority not in dict(Task.PRIORITY_CHOICES):
+            raise ExportError('Prioridad inválida')
+        queryset = queryset.filter(priority=priority)
+    if params.get('from'):
+        queryset = queryset.filter(created_at__gte=_parse_moment(params['from']))
+    if params.get('to'):
+        queryset = queryset.filter(created_at__lte=_parse_moment(params['to'], end=True))
+    return TASK_FAST_ROWS.queryset(queryset.order_by('id'))
+
+
+def _batches(queryset, chunk_size):
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            return
+        yield TASK_FAST_ROWS.rows(batch)
+
+
+def ndjson_chunks(queryset, chunk_size):
+    for rows in _batches(queryset, chunk_size):
+        yield b''.join(dumps(row) + b'\n' for row in rows)
+
+
+def csv_chunks(queryset, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in _batches(queryset, chunk_size):
+        writer.writerows(row.values() for row in rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(queryset, export_format, gzip=False, chunk_size=None):
+    chunk_size = chunk_size or settings.TASK_EXPORT_CHUNK_SIZE
+    chunks = (ndjson_chunks if export_format == 'ndjson' else csv_chunks)(queryset, chunk_size)
+    return gzip_chunks(chunks) if gzip else chunks
+
+
+async def aexport_chunks(chunks):
+    # Bajo ASGI un iterador síncrono se consumiría entero antes de enviarlo:
+    # se avanza bloque a bloque en el hilo de la conexión a la base de datos.
+    from asgiref.sync import sync_to_async
+
+    advance = sync_to_async(next)
+    done = object()
+    while True:
+        chunk = await advance(chunks, done)
+        if chunk is done:
+            return
+        yield chunk
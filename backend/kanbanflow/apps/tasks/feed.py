@@ -0,0 +1,31 @@
+from kanbanflow.events import publish_on_commit
+
+
+def task_event(task, kind, fields=None):
+    # Misma representación que la API (TaskSerializer: usuarios por username,
+    # proyecto por id) para que el cliente pueda fusionarla con lo que tiene.
+    # fields: solo esos campos (los cambiados); None = la tarjeta entera.
+    from .serializers import TaskSerializer
+
+    serializer = TaskSerializer(task)
+    # Como SparseFieldsetMixin: los campos que no van ni se calculan (ni se
+    # consultan los usuarios relacionados)
+    keep = set(serializer.fields) if fields is None else set(fields)
+    for name in set(serializer.fields) - keep | {'id'}:
+        serializer.fields.pop(name)
+    return {'type': f'task.{kind}', 'id': task.pk, 'data': dict(serializer.data)}
+
+
+def publish_task_event(task, kind, fields=None):
+    # Se llama desde post_save antes que los contadores, así que
+    # _loaded_project_id aún es el proyecto en el que estaba la tarea
+    previous = getattr(task, '_loaded_project_id', None)
+    if kind == 'updated' and previous is not None and previous != task.project_id:
+        # Cambio de proyecto: desaparece del tablero anterior y aparece entera en el nuevo
+        publish_on_commit(previous, task_event(task, 'deleted', fields=()))
+        kind, fields = 'created', None
+    publish_on_commit(task.project_id, task_event(task, kind, fields))
+
+
+def publish_column_reordered(project_id, status):
+    publish_on_commit(project_id, {'type': 'column.reordered', 'status': status})
@@ -0,0 +1,262 @@
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, time
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.module_loading import import_string
+from kanbanflow.cache import invalidate_on_commit, project_scope
+from kanbanflow.events import publish_on_commit
+from .models import Task, TaskImportJob
+from .ranking import keys_between, last_rank, schedule_long_columns
+from .counters import count_created
+from .stats import record_created
+
+logger = logging.getLogger(__name__)
+
+# Importación de tareas desde CSV/NDJSON. El fichero se lee en streaming y se
+# procesa por lotes: cada lote se valida, se inserta con bulk_create (o COPY
+# en PostgreSQL) y avanza el progreso del job en la misma transacción, de
+# modo que un job interrumpido se reanuda sin duplicar filas.
+IMPORT_MAX_ERRORS = 1000
+IMPORT_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+COPY_COLUMNS = (
+    'title', 'description', 'status', 'priority', 'project_id', 'assigned_to_id',
+    'created_by_id', 'created_at', 'updated_at', 'due_date', 'rank', 'version',
+)
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def guess_format(name):
+    return IMPORT_EXTENSIONS.get(os.path.splitext(name or '')[1].lower())
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def import_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                config = settings.TASK_IMPORT_STORAGE
+                _storage = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+    return _storage
+
+
+def store_upload(upload):
+    # Se guarda en TASK_IMPORT_STORAGE, donde lo lee el worker (y se puede
+    # reanudar el job más tarde); source es el nombre en el almacenamiento
+    return import_storage().save(f'{uuid.uuid4().hex}{os.path.splitext(upload.name)[1].lower()}', upload)
+
+
+def open_source(source):
+    # Ruta absoluta: fichero local de manage.py import_tasks
+    if os.path.isabs(source):
+        return open(source, 'rb')
+    return import_storage().open(source, 'rb')
+
+
+def read_records(name, import_format):
+    # (registro, error) por cada fila del fichero, en orden
+    with io.TextIOWrapper(open_source(name), encoding='utf-8-sig', newline='') as source:
+        if import_format == 'csv':
+            reader = csv.DictReader(source)
+            if 'title' not in (reader.fieldnames or []):
+                raise ImportFileError('Falta la columna title')
+            for record in reader:
+                yield record, None
+        else:
+            for line in source:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield None, {'row': 'JSON inválido'}
+                    continue
+                if not isinstance(record, dict):
+                    yield None, {'row': 'Se esperaba un objeto JSON'}
+                    continue
+                yield record, None
+
+
+def parse_due_date(value):
+    if value in (None, ''):
+        return None
+    if not isinstance(value, str):
+        raise ValueError
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError
+        moment = datetime.combine(day, time.min)
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+def resolve_users(records, users):
+    # Un único SELECT por lote para los usuarios que aún no están en el mapa
+    names = {
+        record.get('assigned_to') for record, _ in records
+        if record and isinstance(record.get('assigned_to'), str) and record.get('assigned_to')
+    }
+    missing = names - set(users)
+    if missing:
+        users.update({name: None for name in missing})
+        users.update(User.objects.filter(username__in=missing).values_list('username', 'id'))
+    return users
+
+
+def validate_record(record, users):
+    errors = {}
+    title = record.get('title')
+    title = title.strip() if isinstance(title, str) else ''
+    if not title:
+        errors['title'] = 'Este campo es requerido'
+    elif len(title) > Task._meta.get_field('title').max_length:
+        errors['title'] = 'Máximo 200 caracteres'
+    description = record.get('description') or ''
+    if not isinstance(description, str):
+        errors['description'] = 'Se esperaba texto'
+    status = record.get('status') or 'pending'
+    if not isinstance(status, str) or status not in dict(Task.STATUS_CHOICES):
+        errors['status'] = 'Estado inválido'
+    priority = record.get('priority') or 'medium'
+    if not isinstance(priority, str) or priority not in dict(Task.PRIORITY_CHOICES):
+        errors['priority'] = 'Prioridad inválida'
+    assigned_to = record.get('assigned_to') or None
+    if assigned_to is not None and (not isinstance(assigned_to, str) or users.get(assigned_to) is None):
+        errors['assigned_to'] = 'Usuario inexistente'
+    try:
+        due_date = parse_due_date(record.get('due_date'))
+    except ValueError:
+        errors['due_date'] = 'Fecha inválida'
+    if errors:
+        return None, errors
+    return {
+        'title': title, 'description': description, 'status': status, 'priority': priority,
+        'assigned_to_id': users.get(assigned_to) if assigned_to else None, 'due_date': due_date,
+    }, None
+
+
+def use_copy(requested=None):
+    enabled = settings.TASK_IMPORT_USE_COPY if requested is None else requested
+    return enabled and connection.vendor == 'postgresql'
+
+
+def copy_tasks(tasks):
+    # COPY ... FROM STDIN: sin ids de vuelta, suficiente para una importación
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for task in tasks:
+        writer.writerow(['' if value is None else value for value in (getattr(task, column) for column in COPY_COLUMNS)])
+    buffer.seek(0)
+    quote = connection.ops.quote_name
+    sql = 'COPY {} ({}) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL ({}))'.format(
+        quote(Task._meta.db_table),
+        ', '.join(quote(column) for column in COPY_COLUMNS),
+        ', '.join(quote(column) for column in ('title', 'description', 'status', 'priority', 'rank')),
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+
+def import_batch(job, records, first_row, users, last_ranks, copy):
+    resolve_users(records, users)
+    now = timezone.now()
+    created_by_id = job.created_by_id or job.project.owner_id
+    tasks, errors = [], []
+    for offset, (record, error) in enumerate(records):
+        fields = None
+        if error is None:
+            fields, error = validate_record(record, users)
+        if error:
+            errors.append({'row': first_row + offset, 'errors': error})
+            continue
+        tasks.append(Task(project_id=job.project_id, created_by_id=created_by_id, created_at=now, updated_at=now, **fields))
+
+    # Las tarjetas importadas se añaden al final de su columna en el orden del fichero
+    columns = {}
+    for task in tasks:
+        columns.setdefault(task.status, []).append(task)
+    for status, column in columns.items():
+        if status not in last_ranks:
+            last_ranks[status] = last_rank(job.project_id, status)
+        ranks = keys_between(last_ranks[status], None, len(column))
+        for task, rank in zip(column, ranks):
+            task.rank = rank
+        last_ranks[status] = ranks[-1]
+
+    with transaction.atomic():
+        if tasks:
+            if copy:
+                copy_tasks(tasks)
+            else:
+                Task.objects.bulk_create(tasks)
+            record_created(tasks)
+            count_created(tasks)
+            schedule_long_columns(tasks)
+        job.processed_rows += len(records)
+        job.imported_rows += len(tasks)
+        job.error_rows += len(errors)
+        job.errors = (job.errors + errors)[:IMPORT_MAX_ERRORS]
+        job.save(update_fields=['processed_rows', 'imported_rows', 'error_rows', 'errors', 'updated_at'])
+        if tasks:
+            invalidate_on_commit('tasks', project_scope(job.project_id))
+
+
+def run_import(job, copy=None, progress=None, force=False):
+    # Reclama el job (evita dos ejecuciones simultáneas) y continúa desde
+    # processed_rows
+    claimable = ['pending', 'failed', 'running'] if force else ['pending', 'failed']
+    if not TaskImportJob.objects.filter(pk=job.pk, status__in=claimable).update(status='running', message=''):
+        return job
+    job.refresh_from_db()
+    copy = use_copy(copy)
+    users, last_ranks = {}, {}
+    try:
+        records = islice(read_records(job.source, job.format), job.processed_rows, None)
+        while True:
+            batch = list(islice(records, job.batch_size))
+            if not batch:
+                break
+            import_batch(job, batch, job.processed_rows + 1, users, last_ranks, copy)
+            if progress:
+                progress(job)
+    except ImportFileError as e:
+        job.status = 'failed'
+        job.message = str(e)
+    except Exception as e:
+        logger.exception('Error en la importación %s', job.pk)
+        job.status = 'failed'
+        job.message = str(e)
+    else:
+        job.status = 'completed'
+        if not os.path.isabs(job.source):
+            import_storage().delete(job.source)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'message', 'finished_at', 'updated_at'])
+    if job.imported_rows:
+        publish_on_commit(job.project_id, {'type': 'tasks.imported', 'job': job.pk, 'count': job.imported_rows})
+    return job
+
+
+def schedule_import(job):
+    # La procesa el worker; el cliente consulta el progreso
+    from kanbanflow.apps.jobs.queue import enqueue
+
+    enqueue('tasks.import', {'job_id': job.pk}, dedupe_key=f'import:{job.pk}')
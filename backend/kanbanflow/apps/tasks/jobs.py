@@ -0,0 +1,39 @@
+from datetime import date
+
+from kanbanflow.apps.jobs.queue import heartbeat, job_handler, take_pending
+from kanbanflow.cache import invalidate_on_commit, project_scope
+
+# Trabajos en segundo plano de las tareas (ver kanbanflow.apps.jobs)
+
+
+@job_handler('tasks.rebalance_column')
+def rebalance_column(project_id, status):
+    from .ranking import rebalance_column
+
+    rebalance_column(project_id, status)
+
+
+@job_handler('tasks.import')
+def import_tasks(job_id):
+    from .imports import run_import
+    from .models import TaskImportJob
+
+    job = TaskImportJob.objects.filter(pk=job_id).first()
+    if job is None:
+        return
+    # La cola garantiza un solo worker por importación: si quedó en curso es
+    # porque el anterior murió; cada lote renueva el plazo de visibilidad
+    run_import(job, force=True, progress=lambda job: heartbeat())
+
+
+@job_handler('tasks.daily_stats', atomic=True)
+def daily_stats(project_id, day, increments):
+    from .stats import bump_daily
+
+    # Un solo UPDATE para todos los pendientes del mismo proyecto y día
+    totals = dict(increments)
+    for payload in take_pending('tasks.daily_stats', project_id=project_id, day=day):
+        for field, value in payload['increments'].items():
+            totals[field] = totals.get(field, 0) + value
+    bump_daily(project_id, date.fromisoformat(day), **totals)
+    invalidate_on_commit(project_scope(project_id))
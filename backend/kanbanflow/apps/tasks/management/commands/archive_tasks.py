@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from kanbanflow.apps.tasks.archive import archivable, archive_batch
+from kanbanflow.apps.tasks.models import ArchivedTask, Task
+
+
+class Command(BaseCommand):
+    help = 'Mueve al archivo, por lotes, las tareas completadas sin cambios desde hace más de N días'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.TASK_ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--batch-size', type=int, default=settings.TASK_ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--project', type=int, help='Limitar a un proyecto')
+        parser.add_argument('--max-batches', type=int, default=0, help='Parar tras N lotes (0 = sin límite)')
+        parser.add_argument('--pause', type=float, default=0, help='Segundos de espera entre lotes')
+        parser.add_argument('--dry-run', action='store_true', help='Solo contar las tareas archivables')
+        parser.add_argument('--stats', action='store_true', help='Mostrar el reparto entre tabla caliente y archivo')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.show_stats()
+            return
+        if options['dry_run']:
+            count = archivable(options['days'], options['project']).count()
+            self.stdout.write(f"{count} tareas completadas hace más de {options['days']} días")
+            return
+
+        queryset = archivable(options['days'], options['project'])
+        total = batches = 0
+        while not options['max_batches'] or batches < options['max_batches']:
+            moved = archive_batch(queryset, options['batch_size'])
+            if not moved:
+                break
+            total += moved
+            batches += 1
+            self.stdout.write(f'Lote {batches}: {moved} tareas')
+            if options['pause']:
+                time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS(f'{total} tareas archivadas'))
+
+    def show_stats(self):
+        hot = dict(Task.objects.order_by().values_list('status').annotate(total=Count('id')))
+        archived = ArchivedTask.objects.count()
+        total = sum(hot.values()) + archived
+        for status, label in Task.STATUS_CHOICES:
+            self.stdout.write(f'{label:<14} {hot.get(status, 0):>10}')
+        self.stdout.write(f"{'Archivadas':<14} {archived:>10}")
+        if total:
+            self.stdout.write(self.style.SUCCESS(f'{archived / total:.1%} de las tareas en el archivo'))
@@ -0,0 +1,317 @@
+import http.client
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import Client, override_settings
+from django.utils import timezone
+from kanbanflow import metrics
+from kanbanflow.apps.authentication.tokens import make_access_token
+from kanbanflow.apps.projects.models import Project
+from kanbanflow.apps.tasks.models import Task
+
+# Benchmark de los endpoints más usados contra los datos de seed_bench, con
+# varios workers concurrentes, a través del cliente de pruebas de Django y de
+# un servidor WSGI real en el mismo proceso. Las consultas por petición salen
+# de kanbanflow.metrics. El informe en JSON permite comparar commits
+# (--compare).
+SCENARIOS = ('task_list', 'update_status', 'project_list', 'login')
+VIEW_LABELS = {
+    'task_list': 'task-list',
+    'update_status': 'task-update-status',
+    'project_list': 'project-list',
+    'login': 'login',
+}
+STATUSES = [status for status, _ in Task.STATUS_CHOICES]
+# Con --no-response-cache: caché vacía propia para no leer respuestas
+# guardadas por ejecuciones anteriores en la caché compartida
+BENCH_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench-api'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench-api-shared'},
+}
+
+
+class ClientTransport:
+    name = 'client'
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def request(self, method, path, body=None, token=None):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = Client(HTTP_HOST='localhost')
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        data = json.dumps(body) if body is not None else None
+        response = client.generic(method, path, data or '', content_type='application/json', **headers)
+        return response.status_code
+
+    def close_thread(self):
+        connection.close()
+
+    def stop(self):
+        pass
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class WSGITransport:
+    name = 'wsgi'
+
+    def __init__(self):
+        self.server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=False)
+        self.server.set_app(get_internal_wsgi_application())
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def request(self, method, path, body=None, token=None):
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+        headers = {'Content-Type': 'application/json', 'Host': 'localhost'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        try:
+            conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        finally:
+            conn.close()
+
+    def close_thread(self):
+        pass
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def percentile(values, fraction):
+    # Rango más cercano sobre la lista ordenada
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def query_totals(view):
+    series = metrics.DB_QUERIES.series.get((view,))
+    return (series[1], series[2]) if series else (0, 0)
+
+
+class Command(BaseCommand):
+    help = 'Mide latencia (p50/p95/p99), throughput y consultas de los endpoints principales con datos de seed_bench'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='bench', help='Prefijo usado en seed_bench')
+        parser.add_argument('--password', default='bench-pass')
+        parser.add_argument('--requests', type=int, default=200, help='Peticiones medidas por escenario')
+        parser.add_argument('--warmup', type=int, default=10, help='Peticiones previas no medidas')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--mode', choices=['client', 'wsgi', 'both'], default='both')
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+        parser.add_argument('--no-response-cache', action='store_true',
+                            help='No servir listados desde la caché versionada (mide siempre la vista)')
+        parser.add_argument('--output', help='Fichero JSON del informe (por defecto bench-results/<commit>-<fecha>.json)')
+        parser.add_argument('--compare', help='Informe anterior con el que comparar')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Escenarios desconocidos: {", ".join(sorted(unknown))}')
+        actors = self.load_actors(options['prefix'])
+        modes = ['client', 'wsgi'] if options['mode'] == 'both' else [options['mode']]
+        # Sin log de peticiones lentas: el contador sigue en /api/metrics/
+        overrides = {'METRICS_ENABLED': True, 'METRICS_SLOW_SAMPLE_RATE': 0}
+        if options['no_response_cache']:
+            overrides.update(API_CACHE_TIMEOUT=0, CACHES=BENCH_CACHES)
+
+        results = []
+        with override_settings(**overrides):
+            for mode in modes:
+                transport = ClientTransport() if mode == 'client' else WSGITransport()
+                try:
+                    for scenario in scenarios:
+                        result = self.run_scenario(transport, scenario, actors, options)
+                        results.append(result)
+                        self.print_result(result)
+                finally:
+                    transport.stop()
+
+        report = {
+            'meta': self.meta(options, actors),
+            'results': results,
+        }
+        path = options['output'] or os.path.join(
+            'bench-results', f"{report['meta']['commit'] or 'sin-commit'}-{timezone.now():%Y%m%d-%H%M%S}.json"
+        )
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2, ensure_ascii=False)
+        self.stdout.write(self.style.SUCCESS(f'\nInforme guardado en {path}'))
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def load_actors(self, prefix):
+        # Usuarios con algún proyecto; los proyectos grandes primero
+        projects = list(
+            Project.objects.filter(owner__username__startswith=f'{prefix}-')
+            .annotate(task_count=Count('tasks')).order_by('-task_count')
+            .values_list('id', 'task_count')
+        )
+        if not projects:
+            raise CommandError(f'No hay datos con el prefijo {prefix}: ejecuta antes manage.py seed_bench')
+        sizes = dict(projects)
+        users = User.objects.filter(
+            Q(owned_projects__in=sizes) | Q(projects__in=sizes)
+        ).distinct().order_by('id')[:50]
+        actors = []
+        for user in users:
+            project_ids = sorted(
+                set(Project.objects.filter(Q(owner=user) | Q(members=user), pk__in=sizes).values_list('id', flat=True)),
+                key=lambda pk: -sizes[pk],
+            )
+            task_ids = list(Task.objects.filter(project_id__in=project_ids[:3]).order_by('?').values_list('id', flat=True)[:200])
+            if task_ids:
+                actors.append({
+                    'user': user,
+                    'token': make_access_token(user),
+                    'projects': project_ids,
+                    'tasks': task_ids,
+                })
+        if not actors:
+            raise CommandError('Ningún usuario de prueba tiene tareas')
+        self.dataset = {
+            'projects': len(projects),
+            'tasks': sum(sizes.values()),
+            'largest_project': projects[0][1],
+        }
+        return actors
+
+    def build_request(self, scenario, actor, rng, password):
+        if scenario == 'task_list':
+            # Sesgo hacia el proyecto más grande del usuario
+            project_id = actor['projects'][0] if rng.random() < 0.7 else rng.choice(actor['projects'])
+            return 'GET', f'/api/tasks/?project={project_id}', None, actor['token']
+        if scenario == 'update_status':
+            task_id = rng.choice(actor['tasks'])
+            return 'PATCH', f'/api/tasks/{task_id}/update_status/', {'status': rng.choice(STATUSES)}, actor['token']
+        if scenario == 'project_list':
+            return 'GET', '/api/projects/', None, actor['token']
+        return 'POST', '/api/auth/login/', {'username': actor['user'].username, 'password': password}, None
+
+    def run_scenario(self, transport, scenario, actors, options):
+        concurrency = max(1, options['concurrency'])
+        total = max(1, options['requests'])
+        view = VIEW_LABELS[scenario]
+
+        def worker(index, count):
+            rng = random.Random(options['seed'] * 1000 + index)
+            latencies, errors = [], 0
+            try:
+                for _ in range(count):
+                    method, path, body, token = self.build_request(scenario, rng.choice(actors), rng, options['password'])
+                    start = time.perf_counter()
+                    try:
+                        status = transport.request(method, path, body, token)
+                    except Exception:
+                        status = None
+                    latencies.append(time.perf_counter() - start)
+                    if status is None or status >= 400:
+                        errors += 1
+            finally:
+                transport.close_thread()
+            return latencies, errors
+
+        def run(count):
+            shares = [count // concurrency + (1 if i < count % concurrency else 0) for i in range(concurrency)]
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                return list(pool.map(worker, range(concurrency), shares))
+
+        if options['warmup']:
+            run(options['warmup'])
+        queries_before = query_totals(view)
+        start = time.perf_counter()
+        outcomes = run(total)
+        elapsed = time.perf_counter() - start
+        queries_after = query_totals(view)
+
+        latencies = sorted(latency for result, _ in outcomes for latency in result)
+        errors = sum(errors for _, errors in outcomes)
+        measured = queries_after[1] - queries_before[1]
+        return {
+            'mode': transport.name,
+            'scenario': scenario,
+            'requests': len(latencies),
+            'errors': errors,
+            'concurrency': concurrency,
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'latency_ms': {
+                'mean': round(sum(latencies) / len(latencies) * 1000, 2),
+                'p50': round(percentile(latencies, 0.50) * 1000, 2),
+                'p95': round(percentile(latencies, 0.95) * 1000, 2),
+                'p99': round(percentile(latencies, 0.99) * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2),
+            },
+            'queries_per_request': round((queries_after[0] - queries_before[0]) / measured, 2) if measured else None,
+        }
+
+    def print_result(self, result):
+        latency = result['latency_ms']
+        line = (
+            f"{result['mode']:<7} {result['scenario']:<14} {result['requests']:>6} pet. "
+            f"{result['throughput_rps']:>8.1f} pet/s  p50 {latency['p50']:>8.2f}  p95 {latency['p95']:>8.2f}  "
+            f"p99 {latency['p99']:>8.2f} ms  consultas {result['queries_per_request']}"
+        )
+        if result['errors']:
+            line += f"  errores {result['errors']}"
+        self.stdout.write(self.style.ERROR(line) if result['errors'] else line)
+
+    def meta(self, options, actors):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            commit = None
+        return {
+            'created_at': timezone.now().isoformat(),
+            'commit': commit,
+            'database': connection.vendor,
+            'fast_path': settings.API_FAST_SERIALIZATION,
+            'response_cache': not options['no_response_cache'],
+            'concurrency': options['concurrency'],
+            'requests': options['requests'],
+            'dataset': {**self.dataset, 'users': len(actors)},
+        }
+
+    def compare(self, path, results):
+        try:
+            with open(path, encoding='utf-8') as source:
+                previous = {(r['mode'], r['scenario']): r for r in json.load(source)['results']}
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'No se puede leer el informe {path}: {e}')
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nComparación con {path}'))
+        for result in results:
+            before = previous.get((result['mode'], result['scenario']))
+            if before is None:
+                continue
+            p95 = (result['latency_ms']['p95'] / before['latency_ms']['p95'] - 1) * 100 if before['latency_ms']['p95'] else 0
+            rps = (result['throughput_rps'] / before['throughput_rps'] - 1) * 100 if before['throughput_rps'] else 0
+            line = f"{result['mode']:<7} {result['scenario']:<14} p95 {p95:+7.1f}%  throughput {rps:+7.1f}%"
+            self.stdout.write(self.style.ERROR(line) if p95 > 10 else self.style.SUCCESS(line) if p95 < -10 else line)
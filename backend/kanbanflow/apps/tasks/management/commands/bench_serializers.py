@@ -0,0 +1,154 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from kanbanflow import fastpath
+from kanbanflow.apps.authentication.tokens import make_access_token
+from kanbanflow.apps.projects.models import Project
+from kanbanflow.apps.tasks.models import Task
+from kanbanflow.apps.tasks.ranking import spaced_keys
+from kanbanflow.apps.tasks.serializers import TASK_FAST_ROWS, TaskSerializer, optimize_task_queryset
+
+NO_CACHE = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+# Textos que suelen romper la equivalencia: no ASCII, separadores de línea
+# que JSONRenderer escapa, comillas, barras y caracteres de control.
+TITLES = [
+    'Tarea normal',
+    'Diseño de la migración ☃ — 😀',
+    'Separadores   y  ',
+    'Comillas "dobles", \'simples\' y \\barras\\',
+    'Control \x01\x1f\t\n\r\b\f',
+    '',
+]
+
+PARITY_URLS = [
+    lambda data: '/api/projects/',
+    lambda data: '/api/projects/?fields=name,members',
+    lambda data: '/api/projects/?page_size=2',
+    lambda data: '/api/tasks/',
+    lambda data: f"/api/tasks/?project={data['project']}&page_size=7",
+    lambda data: '/api/tasks/?fields=title,due_date,assigned_to',
+    lambda data: f"/api/projects/{data['project']}/board/",
+    lambda data: f"/api/projects/{data['project']}/board/?column=pending&limit=3",
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Comprueba que la serialización rápida de los listados es idéntica a la de DRF y compara su rendimiento'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help='Tareas a serializar en el benchmark')
+        parser.add_argument('--repeat', type=int, default=3, help='Repeticiones de cada medición (se toma la mejor)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                data = self.seed(max(options['rows'], 50))
+                mismatches = self.check_parity(data)
+                if not mismatches:
+                    self.benchmark(data, options['rows'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+        if mismatches:
+            raise CommandError('La ruta rápida no coincide con DRF en: ' + ', '.join(mismatches))
+
+    def check_parity(self, data):
+        client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f"Bearer {make_access_token(data['user'])}")
+        backends = ['stdlib'] + (['orjson'] if fastpath.orjson is not None else [])
+        mismatches = []
+        self.stdout.write(self.style.MIGRATE_HEADING('Paridad con DRF'))
+        with override_settings(CACHES=NO_CACHE):
+            for build_url in PARITY_URLS:
+                url = build_url(data)
+                with override_settings(API_FAST_SERIALIZATION=False):
+                    expected = client.get(url)
+                for backend in backends:
+                    original = fastpath.orjson
+                    if backend == 'stdlib':
+                        fastpath.orjson = None
+                    try:
+                        with override_settings(API_FAST_SERIALIZATION=True):
+                            response = client.get(url)
+                    finally:
+                        fastpath.orjson = original
+                    same = (
+                        response.status_code == expected.status_code
+                        and response['Content-Type'] == expected['Content-Type']
+                        and response.content == expected.content
+                    )
+                    line = f'{url:<60} {backend:<7} {"idéntico" if same else "DIFERENTE"}'
+                    self.stdout.write(self.style.SUCCESS(line) if same else self.style.ERROR(line))
+                    if not same:
+                        mismatches.append(f'{url} ({backend})')
+        return mismatches
+
+    def benchmark(self, data, count, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nSerialización de {count} tareas (consulta + JSON)'))
+        queryset = Task.objects.filter(project_id=data['project']).order_by('-created_at', '-id')[:count]
+        renderer = JSONRenderer()
+
+        def drf():
+            return renderer.render(TaskSerializer(optimize_task_queryset(queryset), many=True).data)
+
+        def fast():
+            return fastpath.dumps(TASK_FAST_ROWS.rows(TASK_FAST_ROWS.queryset(queryset)))
+
+        if drf() != fast():
+            raise CommandError('La ruta rápida no coincide con DRF en el benchmark')
+        results = {}
+        for name, func in (('DRF', drf), ('Ruta rápida', fast)):
+            best = min(self.measure(func) for _ in range(repeat))
+            results[name] = count / best
+            self.stdout.write(f'{name:<14} {best * 1000:>9.1f} ms  {results[name]:>12,.0f} filas/s')
+        backend = 'orjson' if fastpath.orjson is not None else 'json (stdlib)'
+        self.stdout.write(self.style.SUCCESS(
+            f'Ruta rápida {results["Ruta rápida"] / results["DRF"]:.1f}x más rápida (codificador: {backend})'
+        ))
+
+    def measure(self, func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    def seed(self, size):
+        users = User.objects.bulk_create([
+            User(username=name, password='!')
+            for name in ('bench-ana', 'bench-josé', 'bench-李', 'bench-o.k+x@y_z')
+        ])
+        projects = Project.objects.bulk_create([
+            Project(name=title or 'Sin título', description=title, owner=users[i % len(users)])
+            for i, title in enumerate(TITLES)
+        ])
+        Project.members.through.objects.bulk_create([
+            Project.members.through(project_id=project.pk, user_id=user.pk)
+            for i, project in enumerate(projects) for user in users[:i % len(users)]
+        ])
+        project = projects[0]
+        statuses = [status for status, _ in Task.STATUS_CHOICES]
+        ranks = spaced_keys(size)
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(
+                title=TITLES[i % len(TITLES)], description=TITLES[(i + 1) % len(TITLES)] * (i % 3),
+                project=project, status=statuses[i % len(statuses)], priority='high' if i % 2 else 'low',
+                created_by=users[i % len(users)], assigned_to=users[i % len(users)] if i % 4 else None,
+                due_date=now + timedelta(days=i, microseconds=i) if i % 5 else None, rank=ranks[i],
+            )
+            for i in range(size)
+        ], batch_size=1000)
+        # El primer usuario es dueño o miembro de todos los proyectos
+        return {'user': users[0], 'project': project.pk}
@@ -0,0 +1,107 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Cada ejecución es un proceso nuevo que mide sus fases de arranque y
+# devuelve los tiempos en JSON por stdout.
+CHILD = r'''
+import json, sys, time
+from wsgiref.util import setup_testing_defaults
+start = time.perf_counter()
+phases = {}
+
+def mark(name):
+    global start
+    now = time.perf_counter()
+    phases[name] = (now - start) * 1000
+    start = now
+
+import django
+django.setup()
+mark('django_setup')
+from kanbanflow.startup import pending_migrations, warm_up
+pending = len(pending_migrations())
+mark('migration_check')
+if 'migrate' in sys.argv:
+    from django.core.management import call_command
+    call_command('migrate', interactive=False, verbosity=0)
+    mark('migrate_command')
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+mark('wsgi_application')
+if 'preload' in sys.argv:
+    warm_up()
+    mark('warm_up')
+
+def request(path):
+    environ = {'PATH_INFO': path, 'HTTP_HOST': 'localhost', 'SERVER_NAME': 'localhost'}
+    setup_testing_defaults(environ)
+    status = []
+    b"".join(application(environ, lambda s, h, e=None: status.append(s)))
+    return status[0]
+
+for path in ('/readyz', '/api/'):
+    status = request(path)
+    mark('first ' + path)
+print(json.dumps({'phases': phases, 'pending': pending, 'status': status}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Mide el arranque en frío de un proceso: setup de Django, comprobación de migraciones, WSGI y primera petición'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--compare-migrate', action='store_true',
+                            help='Medir también manage.py migrate sin migraciones pendientes')
+        parser.add_argument('--output', help='Guardar los resultados en JSON')
+
+    def handle(self, *args, **options):
+        results = {}
+        for mode in ('cold', 'preload'):
+            runs = [self.run_child(mode, options['compare_migrate']) for _ in range(max(1, options['runs']))]
+            results[mode] = {
+                name: round(statistics.median(run['phases'][name] for run in runs), 1)
+                for name in runs[0]['phases']
+            }
+            results[mode]['process_total'] = round(statistics.median(run['wall'] for run in runs), 1)
+            if runs[0]['pending']:
+                self.stdout.write(self.style.WARNING(f"{runs[0]['pending']} migraciones pendientes"))
+
+        names = list(results['cold'])
+        for name in results['preload']:
+            if name not in names:
+                names.insert(names.index('wsgi_application') + 1, name)
+        self.stdout.write(f"{'Fase (mediana, ms)':<24} {'en frío':>10} {'precarga':>10}")
+        for name in names:
+            cold, preload = results['cold'].get(name), results['preload'].get(name)
+            self.stdout.write(
+                f"{name:<24} {'' if cold is None else f'{cold:.1f}':>10} {'' if preload is None else f'{preload:.1f}':>10}"
+            )
+        if options['compare_migrate']:
+            check, command = results['cold']['migration_check'], results['cold']['migrate_command']
+            self.stdout.write(self.style.SUCCESS(
+                f'Comprobar migraciones: {check:.1f} ms frente a {command:.1f} ms de migrate sin cambios'
+            ))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump({'runs': options['runs'], 'results': results}, output, indent=2)
+            self.stdout.write(f"Resultados en {options['output']}")
+
+    def run_child(self, mode, compare_migrate):
+        args = [sys.executable, '-c', CHILD, mode] + (['migrate'] if compare_migrate else [])
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        start = time.perf_counter()
+        process = subprocess.run(args, capture_output=True, text=True, env=env, cwd=settings.BASE_DIR)
+        wall = (time.perf_counter() - start) * 1000
+        if process.returncode != 0:
+            raise CommandError(f'El proceso de prueba falló:\n{process.stderr[-2000:]}')
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        result['wall'] = wall
+        return result
@@ -0,0 +1,109 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from kanbanflow.apps.authentication.tokens import make_access_token
+from kanbanflow.apps.projects.models import Project
+from kanbanflow.apps.projects.permissions import visible_project_ids
+from kanbanflow.apps.tasks.models import Task
+from kanbanflow.apps.tasks.ranking import spaced_keys
+from kanbanflow.apps.tasks.sync import make_token
+
+# Máximo de consultas SQL por endpoint. Deben ser constantes: si alguna crece
+# con el número de filas hay un N+1.
+BUDGETS = [
+    ('Listado de proyectos', lambda data: '/api/projects/', 2),
+    ('Detalle de proyecto', lambda data: f"/api/projects/{data['project']}/", 2),
+    ('Tablero de proyecto', lambda data: f"/api/projects/{data['project']}/board/", 6),
+    ('Estadísticas de proyecto', lambda data: f"/api/projects/{data['project']}/stats/", 3),
+    ('Listado de tareas', lambda data: '/api/tasks/', 1),
+    ('Listado de tareas por proyecto', lambda data: f"/api/tasks/?project={data['project']}", 1),
+    ('Detalle de tarea', lambda data: f"/api/tasks/{data['task']}/", 1),
+    ('Cambios de tareas', lambda data: f"/api/tasks/changes/?project={data['project']}&since={data['since']}", 2),
+    ('Búsqueda de tareas', lambda data: '/api/tasks/search/?q=qbudget', 1),
+]
+
+# Caché local propia: las respuestas no se guardan (API_CACHE_TIMEOUT=0) pero
+# la pertenencia a proyectos sí, como en producción con la caché caliente
+BUDGET_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'query-budget'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'query-budget-shared'},
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Comprueba que los endpoints de listado ejecutan un número constante de consultas (falla si se supera el presupuesto)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,1000,10000',
+                            help='Número de tareas a generar en cada ronda, separados por comas')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        failures = []
+        for size in sizes:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n== {size} filas'))
+            try:
+                # Los datos de prueba se descartan al terminar cada ronda
+                with transaction.atomic():
+                    failures += self.run_round(size)
+                    raise Rollback
+            except Rollback:
+                pass
+
+        if failures:
+            raise CommandError('Presupuesto de consultas superado: ' + ', '.join(failures))
+        self.stdout.write(self.style.SUCCESS('\nTodos los endpoints dentro del presupuesto'))
+
+    def run_round(self, size):
+        data = self.seed(size)
+        client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=f"Bearer {make_access_token(data['user'])}")
+        failures = []
+        with override_settings(CACHES=BUDGET_CACHES, API_CACHE_TIMEOUT=0):
+            for alias in BUDGET_CACHES:
+                caches[alias].clear()
+            visible_project_ids(User(pk=data['user'].pk))
+            for name, url, budget in BUDGETS:
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(url(data))
+                count = len(queries.captured_queries)
+                ok = response.status_code == 200 and count <= budget
+                line = f'{name:<34} {count:>3} / {budget} consultas  (HTTP {response.status_code})'
+                self.stdout.write(self.style.SUCCESS(line) if ok else self.style.ERROR(line))
+                if not ok:
+                    failures.append(f'{name} ({size} filas)')
+        return failures
+
+    def seed(self, size):
+        prefix = f'qbudget{size}'
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}-{i}', password='!') for i in range(10)
+        ])
+        projects = Project.objects.bulk_create([
+            Project(name=f'{prefix}-{i}', owner=users[i % len(users)]) for i in range(max(2, size // 100))
+        ])
+        Project.members.through.objects.bulk_create([
+            Project.members.through(project_id=project.pk, user_id=user.pk)
+            for project in projects for user in users[:3]
+        ])
+        project = projects[0]
+        statuses = [status for status, _ in Task.STATUS_CHOICES]
+        ranks = spaced_keys(size)
+        tasks = Task.objects.bulk_create([
+            Task(
+                title=f'{prefix}-{i}', project=project, status=statuses[i % len(statuses)],
+                created_by=users[i % len(users)], assigned_to=users[(i + 1) % len(users)], rank=ranks[i],
+            )
+            for i in range(size)
+        ], batch_size=1000)
+
+        return {
+            'user': users[0], 'project': project.pk, 'task': tasks[0].pk,
+            'since': make_token(project.created_at),
+        }
@@ -0,0 +1,76 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import override_settings
+from kanbanflow.apps.jobs.models import Job
+from kanbanflow.apps.projects.models import Project
+from kanbanflow.apps.tasks.bulk import assign_top_ranks
+from kanbanflow.apps.tasks.models import Task
+from kanbanflow.apps.tasks.ranking import keys_between, last_rank, needs_rebalance
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Inserta muchas tarjetas al principio y al final de una columna sin reordenarla '
+            'y falla si alguna clave de orden no cabe en Task.rank')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inserts', type=int, default=2000, help='Tarjetas por cada forma de inserción')
+        parser.add_argument('--batch-size', type=int, default=50, help='Tarjetas por alta masiva o lote de importación')
+
+    def handle(self, *args, **options):
+        limit = Task._meta.get_field('rank').max_length
+        try:
+            # Sin worker (ni JOBS_EAGER) el reordenado nunca llega: es el peor caso
+            with override_settings(JOBS_EAGER=False), transaction.atomic():
+                results = self.run_inserts(options['inserts'], options['batch_size'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        failures = []
+        for name, longest, scheduled in results:
+            ok = longest <= limit and (scheduled or not needs_rebalance('0' * longest))
+            line = f"{name:<28} clave más larga {longest:>3} / {limit}  reordenado {'encolado' if scheduled else 'no'}"
+            self.stdout.write(self.style.SUCCESS(line) if ok else self.style.ERROR(line))
+            if not ok:
+                failures.append(name)
+        if failures:
+            raise CommandError('Claves de orden demasiado largas: ' + ', '.join(failures))
+        self.stdout.write(self.style.SUCCESS('Las claves de orden caben en Task.rank'))
+
+    def run_inserts(self, inserts, batch_size):
+        user = User.objects.create(username='rank-growth', password='!')
+        results = []
+        for name, insert in [
+            ('Alta al principio', self.insert_top),
+            ('Alta masiva al principio', self.insert_bulk_top),
+            ('Importación al final', self.insert_bottom),
+        ]:
+            project = Project.objects.create(name=f'rank-growth {name}', owner=user)
+            longest = 0
+            for start in range(0, inserts, batch_size):
+                ranks = insert(project, user, min(batch_size, inserts - start))
+                longest = max(longest, *map(len, ranks))
+            scheduled = Job.objects.filter(dedupe_key=f'rebalance:{project.pk}:pending').exists()
+            results.append((name, longest, scheduled))
+        return results
+
+    def insert_top(self, project, user, count):
+        return [Task.objects.create(title='rank', project=project, created_by=user).rank for _ in range(count)]
+
+    def insert_bulk_top(self, project, user, count):
+        tasks = [Task(title='rank', project=project, created_by=user) for _ in range(count)]
+        assign_top_ranks(tasks)
+        Task.objects.bulk_create(tasks)
+        return [task.rank for task in tasks]
+
+    def insert_bottom(self, project, user, count):
+        ranks = keys_between(last_rank(project.pk, 'pending'), None, count)
+        Task.objects.bulk_create([
+            Task(title='rank', project=project, created_by=user, rank=rank) for rank in ranks
+        ])
+        return ranks
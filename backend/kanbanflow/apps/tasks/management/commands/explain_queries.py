@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+from kanbanflow.apps.projects.models import Project
+from kanbanflow.apps.tasks.board import BOARD_ORDERING, BOARD_PAGE_SIZE
+from kanbanflow.apps.tasks.models import Task
+from kanbanflow.pagination import KeysetPagination
+
+
+class Command(BaseCommand):
+    help = 'Muestra los planes EXPLAIN de las consultas principales de los viewsets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, help='ID del proyecto (por defecto, el que más tareas tiene)')
+        parser.add_argument('--analyze', action='store_true', help='Ejecuta las consultas (EXPLAIN ANALYZE, solo PostgreSQL)')
+
+    def handle(self, *args, **options):
+        project = self.get_project(options['project'])
+        explain_options = {}
+        if options['analyze']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('--analyze solo está disponible en PostgreSQL')
+            explain_options = {'analyze': True, 'buffers': True}
+
+        tasks = Task.objects.filter(project=project)
+        queries = [
+            ('Listado de tareas por proyecto',
+             tasks.order_by(*KeysetPagination.ordering)[:KeysetPagination.page_size]),
+            ('Conteo por columna del tablero',
+             tasks.order_by().values_list('status').annotate(total=Count('id'))),
+            ('Columna del tablero (pending)',
+             tasks.filter(status='pending').order_by(*BOARD_ORDERING)[:BOARD_PAGE_SIZE]),
+            ('Tareas abiertas asignadas a un usuario',
+             Task.objects.filter(assigned_to_id=project.owner_id, status='in_progress')),
+            ('Tareas vencidas del proyecto',
+             tasks.filter(due_date__lt=timezone.now(), due_date__isnull=False).exclude(status='completed')),
+        ]
+
+        self.stdout.write(f'Proyecto {project.pk} ({connection.vendor})')
+        for title, queryset in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n== {title}'))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
+
+    def get_project(self, project_id):
+        if project_id:
+            try:
+                return Project.objects.get(pk=project_id)
+            except Project.DoesNotExist:
+                raise CommandError(f'El proyecto {project_id} no existe')
+        project = Project.objects.annotate(total=Count('tasks')).order_by('-total').first()
+        if project is None:
+            raise CommandError('No hay proyectos en la base de datos')
+        return project
+
@@ -0,0 +1,69 @@
+import os
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from kanbanflow.apps.projects.models import Project
+from kanbanflow.apps.tasks.imports import guess_format, run_import
+from kanbanflow.apps.tasks.models import TaskImportJob
+
+
+class Command(BaseCommand):
+    help = 'Importa tareas desde un fichero CSV o NDJSON por lotes (o reanuda una importación)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='Fichero a importar')
+        parser.add_argument('--project', type=int, help='Proyecto destino')
+        parser.add_argument('--format', choices=[value for value, _ in TaskImportJob.FORMAT_CHOICES])
+        parser.add_argument('--batch-size', type=int, default=settings.TASK_IMPORT_BATCH_SIZE)
+        parser.add_argument('--user', help='Usuario que figura como creador (por defecto el dueño del proyecto)')
+        parser.add_argument('--resume', type=int, metavar='JOB', help='Reanudar una importación existente')
+        parser.add_argument('--force', action='store_true',
+                            help='Reanudar aunque el job figure en curso (p. ej. tras caerse el proceso)')
+        parser.add_argument('--no-copy', action='store_true', help='Usar bulk_create también en PostgreSQL')
+
+    def handle(self, *args, **options):
+        if options['resume']:
+            job = TaskImportJob.objects.filter(pk=options['resume']).first()
+            if job is None:
+                raise CommandError('Importación inexistente')
+        else:
+            job = self.create_job(options)
+
+        self.stdout.write(f'Importación {job.pk}: {job.source}')
+        job = run_import(
+            job,
+            copy=False if options['no_copy'] else None,
+            progress=lambda job: self.stdout.write(
+                f'  {job.processed_rows} filas leídas, {job.imported_rows} importadas, {job.error_rows} con errores'
+            ),
+            force=options['force'],
+        )
+        for error in job.errors[:20]:
+            self.stdout.write(self.style.WARNING(f"  fila {error['row']}: {error['errors']}"))
+        if job.status != 'completed':
+            raise CommandError(f'Importación {job.pk} {job.get_status_display().lower()}: {job.message}')
+        self.stdout.write(self.style.SUCCESS(f'{job.imported_rows} tareas importadas ({job.error_rows} filas con errores)'))
+
+    def create_job(self, options):
+        path = options['path']
+        if not path or not os.path.exists(path):
+            raise CommandError('Fichero inexistente')
+        project = Project.objects.filter(pk=options['project']).first() if options['project'] else None
+        if project is None:
+            raise CommandError('Se requiere un proyecto existente (--project)')
+        import_format = options['format'] or guess_format(path)
+        if import_format is None:
+            raise CommandError('No se reconoce el formato, indícalo con --format')
+        user = None
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError('Usuario inexistente')
+        return TaskImportJob.objects.create(
+            project=project,
+            created_by=user,
+            source=os.path.abspath(path),
+            format=import_format,
+            batch_size=max(1, options['batch_size']),
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.db.models.functions import Length
+from kanbanflow.apps.tasks.models import Task
+from kanbanflow.apps.tasks.ranking import rebalance_column
+
+
+class Command(BaseCommand):
+    help = 'Reasigna claves de orden cortas en las columnas cuyas claves han crecido demasiado'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, help='Limitar a un proyecto')
+        parser.add_argument('--min-length', type=int, default=0,
+                            help='Solo columnas con alguna clave más larga que esto (0 = todas)')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        columns = Task.objects.order_by().values('project_id', 'status').annotate(longest=Max(Length('rank')))
+        if options['project']:
+            columns = columns.filter(project_id=options['project'])
+        if options['min_length']:
+            columns = columns.filter(longest__gt=options['min_length'])
+
+        total = 0
+        for column in columns:
+            count = rebalance_column(column['project_id'], column['status'], options['batch_size'])
+            total += count
+            self.stdout.write(f"Proyecto {column['project_id']} / {column['status']}: {count} tareas")
+        self.stdout.write(self.style.SUCCESS(f'{total} tareas reordenadas'))
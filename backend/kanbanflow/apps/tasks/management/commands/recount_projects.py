@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from kanbanflow.apps.projects.models import COUNTER_FIELDS, Project
+from kanbanflow.apps.tasks.counters import current_counts
+from kanbanflow.cache import invalidate_on_commit
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los contadores de tareas por estado de los proyectos y corrige los desviados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, help='Limitar a un proyecto')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Solo informar, sin corregir')
+
+    def handle(self, *args, **options):
+        fields = list(COUNTER_FIELDS.values())
+        projects = Project.objects.order_by('id')
+        if options['project']:
+            projects = projects.filter(pk=options['project'])
+        ids = list(projects.values_list('id', flat=True))
+
+        fixed = 0
+        for start in range(0, len(ids), options['batch_size']):
+            batch = ids[start:start + options['batch_size']]
+            with transaction.atomic():
+                # Con los proyectos bloqueados los incrementos concurrentes
+                # esperan y se aplican sobre el valor corregido
+                stored = {
+                    row['id']: row for row in
+                    Project.objects.select_for_update().filter(pk__in=batch).order_by('id').values('id', *fields)
+                }
+                for project_id, counts in current_counts(list(stored)).items():
+                    drift = {field: value for field, value in counts.items() if stored[project_id][field] != value}
+                    if not drift:
+                        continue
+                    fixed += 1
+                    changes = ', '.join(f'{field} {stored[project_id][field]} -> {value}' for field, value in drift.items())
+                    self.stdout.write(f'Proyecto {project_id}: {changes}')
+                    if not options['dry_run']:
+                        Project.objects.filter(pk=project_id).update(**drift)
+                if fixed and not options['dry_run']:
+                    invalidate_on_commit('projects')
+
+        verb = 'desviados' if options['dry_run'] else 'corregidos'
+        self.stdout.write(self.style.SUCCESS(f'{len(ids)} proyectos revisados, {fixed} {verb}'))
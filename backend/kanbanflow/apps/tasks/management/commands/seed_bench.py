@@ -0,0 +1,149 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from kanbanflow.apps.projects.models import Project
+from kanbanflow.apps.tasks.models import Task
+from kanbanflow.apps.tasks.ranking import spaced_keys
+
+# Datos de prueba para manage.py bench_api: usuarios con la misma contraseña,
+# proyectos con un número de tareas muy desigual (ley de Zipf: pocos
+# proyectos enormes y muchos pequeños) y equipos de tamaño variable.
+STATUS_WEIGHTS = {'pending': 4, 'in_progress': 2, 'completed': 4}
+PRIORITY_WEIGHTS = {'low': 3, 'medium': 5, 'high': 2}
+WORDS = (
+    'migrar revisar diseñar documentar corregir desplegar optimizar probar actualizar '
+    'informe tablero usuarios pagos factura api móvil búsqueda caché índice servidor '
+    'cliente integración contrato error rendimiento seguridad copia base datos'
+).split()
+
+
+@contextmanager
+def explicit_timestamps():
+    # bulk_create respeta auto_now/auto_now_add: se desactivan mientras se
+    # insertan tareas con fechas repartidas en el pasado
+    fields = [Task._meta.get_field('created_at'), Task._meta.get_field('updated_at')]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Genera un conjunto de datos realista para los benchmarks (inserciones en bloque)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--projects', type=int, default=50)
+        parser.add_argument('--tasks', type=int, default=50000, help='Tareas en total')
+        parser.add_argument('--skew', type=float, default=1.1, help='Exponente de Zipf para el reparto de tareas')
+        parser.add_argument('--members', type=int, default=8, help='Miembros por proyecto (máximo, sin contar al dueño)')
+        parser.add_argument('--prefix', default='bench', help='Prefijo de los usuarios y proyectos generados')
+        parser.add_argument('--password', default='bench-pass')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--clear', action='store_true', help='Borrar antes los datos con el mismo prefijo')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if options['users'] < 1 or options['projects'] < 1:
+            raise CommandError('Se necesita al menos un usuario y un proyecto')
+        existing = User.objects.filter(username__startswith=f'{prefix}-')
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(f'Ya hay datos con el prefijo {prefix}, usa --clear para regenerarlos')
+            self.clear(prefix)
+
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            users = self.create_users(prefix, options['users'], options['password'], options['batch_size'])
+            projects, teams = self.create_projects(prefix, users, options['projects'], options['members'], rng)
+            total = self.create_tasks(projects, teams, options['tasks'], options['skew'], options['batch_size'], rng)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(users)} usuarios, {len(projects)} proyectos y {total} tareas '
+            f'(contraseña: {options["password"]})'
+        ))
+
+    def clear(self, prefix):
+        # Primero los proyectos: las tareas borradas en cascada desde su
+        # proyecto no generan tombstones
+        projects = Project.objects.filter(owner__username__startswith=f'{prefix}-')
+        self.stdout.write(f'Borrando {projects.count()} proyectos con el prefijo {prefix}...')
+        projects.delete()
+        User.objects.filter(username__startswith=f'{prefix}-').delete()
+
+    def create_users(self, prefix, count, password, batch_size):
+        # El hash es caro (PBKDF2): se calcula una vez para todos
+        hashed = make_password(password)
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}-{i:05d}', email=f'{prefix}-{i:05d}@example.com', password=hashed)
+            for i in range(count)
+        ], batch_size=batch_size)
+        if users[0].pk is None:
+            users = list(User.objects.filter(username__startswith=f'{prefix}-').order_by('username'))
+        return users
+
+    def create_projects(self, prefix, users, count, max_members, rng):
+        projects = Project.objects.bulk_create([
+            Project(name=f'{prefix} {i:04d}', description=' '.join(rng.choices(WORDS, k=12)), owner=rng.choice(users))
+            for i in range(count)
+        ])
+        if projects[0].pk is None:
+            projects = list(Project.objects.filter(name__startswith=f'{prefix} ').order_by('name'))
+        teams, memberships = {}, []
+        for project in projects:
+            size = rng.randint(0, min(max_members, len(users) - 1))
+            members = [user for user in rng.sample(users, size + 1) if user.pk != project.owner_id][:size]
+            teams[project.pk] = [project.owner_id] + [user.pk for user in members]
+            memberships += [Project.members.through(project_id=project.pk, user_id=user.pk) for user in members]
+        Project.members.through.objects.bulk_create(memberships)
+        return projects, teams
+
+    def create_tasks(self, projects, teams, total, skew, batch_size, rng):
+        weights = [1 / (rank + 1) ** skew for rank in range(len(projects))]
+        scale = total / sum(weights)
+        counts = [int(weight * scale) for weight in weights]
+        counts[0] += total - sum(counts)
+        now = timezone.now()
+        statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        priorities, priority_weights = list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values())
+        created = 0
+        for project, count in zip(projects, counts):
+            if not count:
+                continue
+            team = teams[project.pk]
+            tasks = []
+            for status in rng.choices(statuses, status_weights, k=count):
+                created_at = now - timedelta(seconds=rng.randint(0, 180 * 24 * 3600))
+                tasks.append(Task(
+                    title=' '.join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+                    description=' '.join(rng.choices(WORDS, k=rng.randint(0, 40))),
+                    status=status,
+                    priority=rng.choices(priorities, priority_weights)[0],
+                    project=project,
+                    created_by_id=rng.choice(team),
+                    assigned_to_id=rng.choice(team) if rng.random() < 0.7 else None,
+                    created_at=created_at,
+                    updated_at=created_at,
+                    due_date=created_at + timedelta(days=rng.randint(1, 60)) if rng.random() < 0.4 else None,
+                ))
+            columns = {}
+            for task in tasks:
+                columns.setdefault(task.status, []).append(task)
+            for column in columns.values():
+                for task, rank in zip(column, spaced_keys(len(column))):
+                    task.rank = rank
+            with explicit_timestamps():
+                Task.objects.bulk_create(tasks, batch_size=batch_size)
+            created += len(tasks)
+            self.stdout.write(f'  {project.name}: {len(tasks)} tareas, {len(team)} personas')
+        return created
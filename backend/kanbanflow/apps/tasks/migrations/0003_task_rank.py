@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:45
+
+from django.db import migrations, models
+
+# Copia de ranking.spaced_keys tal como era al crear la migración: si el
+# código de la app cambia, la migración sigue generando las mismas claves
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+
+def to_key(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits))
+
+
+def spaced_keys(count):
+    width = 1
+    while BASE ** width <= count * BASE * 3:
+        width += 1
+    space = BASE ** width
+    step = (space // 3) // (count + 1)
+    keys = []
+    for i in range(1, count + 1):
+        value = space // 3 + step * i
+        if value % BASE == 0:
+            value += 1
+        keys.append(to_key(value, width))
+    return keys
+
+
+def assign_initial_ranks(apps, schema_editor):
+    # Conserva el orden que mostraba el tablero (más recientes primero)
+    Task = apps.get_model('tasks', 'Task')
+    columns = Task.objects.order_by().values_list('project_id', 'status').distinct()
+    for project_id, status in columns:
+        tasks = list(
+            Task.objects.filter(project_id=project_id, status=status)
+            .order_by('-created_at', '-id').only('id')
+        )
+        for task, rank in zip(tasks, spaced_keys(len(tasks))):
+            task.rank = rank
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(assign_initial_ranks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'rank'], name='task_project_status_rank'),
+        ),
+    ]
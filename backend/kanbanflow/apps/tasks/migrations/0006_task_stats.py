@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_daily_stats(apps, schema_editor):
+    # Sin historial previo: las tareas ya completadas cuentan como cerradas el
+    # día de su última modificación.
+    from django.db.models import Count, F, Sum
+    from django.db.models.functions import TruncDate
+
+    Task = apps.get_model('tasks', 'Task')
+    TaskDailyStats = apps.get_model('tasks', 'TaskDailyStats')
+    rows = {}
+    created = Task.objects.order_by().annotate(day=TruncDate('created_at')).values('project_id', 'day').annotate(total=Count('id'))
+    for row in created:
+        rows[(row['project_id'], row['day'])] = TaskDailyStats(project_id=row['project_id'], day=row['day'], created=row['total'])
+    completed = (
+        Task.objects.filter(status='completed').order_by()
+        .annotate(day=TruncDate('updated_at')).values('project_id', 'day')
+        .annotate(total=Count('id'), cycle=Sum(F('updated_at') - F('created_at')))
+    )
+    for row in completed:
+        stats = rows.setdefault((row['project_id'], row['day']), TaskDailyStats(project_id=row['project_id'], day=row['day']))
+        stats.completed = row['total']
+        stats.cycle_time_total = row['cycle'].total_seconds() if row['cycle'] else 0
+        stats.cycle_time_count = row['total']
+    TaskDailyStats.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0005_task_import_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('cycle_time_total', models.FloatField(default=0)),
+                ('cycle_time_count', models.PositiveIntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='projects.project')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('pending', 'Pendiente'), ('in_progress', 'En progreso'), ('completed', 'Completado')], max_length=20)),
+                ('to_status', models.CharField(choices=[('pending', 'Pendiente'), ('in_progress', 'En progreso'), ('completed', 'Completado')], max_length=20)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_transitions', to='projects.project')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='tasks.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'changed_at'], name='transition_project_changed')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskdailystats',
+            constraint=models.UniqueConstraint(fields=('project', 'day'), name='daily_stats_project_day'),
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
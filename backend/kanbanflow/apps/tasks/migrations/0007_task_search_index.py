@@ -0,0 +1,80 @@
+from django.db import migrations
+
+# Índice de texto completo fuera del modelo (ver kanbanflow/apps/tasks/search.py)
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE tasks_task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX task_search_vector ON tasks_task USING GIN (search_vector)',
+]
+
+POSTGRES_BACKWARD = [
+    'DROP INDEX IF EXISTS task_search_vector',
+    'ALTER TABLE tasks_task DROP COLUMN IF EXISTS search_vector',
+]
+
+# En SQLite, tabla FTS5 con triggers (copia de search.py al crear la migración)
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5(
+        title, description, content='tasks_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    'DROP TRIGGER IF EXISTS tasks_task_fts_insert',
+    """
+    CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    'DROP TRIGGER IF EXISTS tasks_task_fts_delete',
+    """
+    CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    'DROP TRIGGER IF EXISTS tasks_task_fts_update',
+    """
+    CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF title, description ON tasks_task BEGIN
+        INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS tasks_task_fts_update',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_delete',
+    'DROP TRIGGER IF EXISTS tasks_task_fts_insert',
+    'DROP TABLE IF EXISTS tasks_task_fts',
+]
+
+
+def forward(apps, schema_editor):
+    # En SQLite los triggers se recrean también tras cada migrate (ver signals.py)
+    statements = {'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def backward(apps, schema_editor):
+    statements = {'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(forward, backward),
+    ]
@@ -25,9 +25,167 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     due_date = models.DateTimeField(null=True, blank=True)
+    # Posición dentro de la columna (clave fraccionaria, ver ranking.py)
+    rank = models.CharField(max_length=64, blank=True, default='')
+    # Se incrementa con cada cambio; los clientes la envían en If-Match (ver concurrency.py)
+    version = models.PositiveIntegerField(default=1)
     
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        ranked = not self.rank
+        if ranked:
+            from .ranking import top_ranks
+            self.rank = top_ranks(self.project_id, self.status)[0]
+        if not self._state.adding:
+            # Cambios fuera de la API (admin, shell) también invalidan If-Match
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        super().save(*args, **kwargs)
+        if ranked:
+            from .ranking import schedule_long_columns
+            schedule_long_columns([self])
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Proyecto y estado leídos, para mover los contadores de Project al guardar
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_project_id = instance.__dict__.get('project_id')
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
     
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'status', '-created_at', '-id'], name='task_project_status_created'),
+            models.Index(fields=['project', '-created_at', '-id'], name='task_project_created'),
+            models.Index(fields=['project', 'status', 'rank'], name='task_project_status_rank'),
+            models.Index(fields=['assigned_to', 'status'], name='task_assignee_status'),
+            models.Index(fields=['project', 'updated_at'], name='task_project_updated'),
+            # Parcial: solo tareas abiertas con fecha límite (vencidas / próximas)
+            models.Index(
+                fields=['project', 'due_date'],
+                name='task_project_due_open',
+                condition=models.Q(due_date__isnull=False) & ~models.Q(status='completed'),
+            ),
+        ]
+
+
+
+class ArchivedTask(models.Model):
+    # Tarea completada que archive.py sacó de Task (misma id y mismos
+    # campos). Fuera de la tabla caliente no pesa en el tablero ni en sus
+    # índices; se lee con ?include_archived=true.
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, default='completed')
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES, default='medium')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='archived_tasks')
+    assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    due_date = models.DateTimeField(null=True, blank=True)
+    rank = models.CharField(max_length=64, blank=True, default='')
+    version = models.PositiveIntegerField(default=1)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.title
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', '-created_at', '-id'], name='archived_project_created'),
+        ]
+
+class TaskTombstone(models.Model):
+    # Registro mínimo de tareas borradas para la sincronización incremental
+    task_id = models.BigIntegerField()
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='task_tombstones')
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Tarea {self.task_id} borrada'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'deleted_at'], name='tombstone_project_deleted'),
+        ]
+
+
+class TaskStatusTransition(models.Model):
+    # Historial de cambios de columna, base del tiempo de ciclo
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='transitions')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='task_transitions')
+    from_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.task_id}: {self.from_status} → {self.to_status}'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'changed_at'], name='transition_project_changed'),
+        ]
+
+
+class TaskDailyStats(models.Model):
+    # Agregado diario por proyecto que se incrementa en cada alta o cierre de
+    # tarea; las gráficas históricas leen de aquí sin recorrer las tareas.
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    created = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    cycle_time_total = models.FloatField(default=0)  # segundos, suma de las tareas completadas ese día
+    cycle_time_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.project_id} {self.day}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'day'], name='daily_stats_project_day'),
+        ]
+
+
+class TaskImportJob(models.Model):
+    # Importación por lotes reanudable: processed_rows marca hasta dónde se
+    # ha leído el fichero y se actualiza en la misma transacción que cada lote.
+    STATUS_CHOICES = [
+        ('pending', 'Pendiente'),
+        ('running', 'En curso'),
+        ('completed', 'Completado'),
+        ('failed', 'Fallido'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    ]
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='import_jobs')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='task_imports')
+    source = models.CharField(max_length=500)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    batch_size = models.PositiveIntegerField(default=1000)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    processed_rows = models.PositiveIntegerField(default=0)
+    imported_rows = models.PositiveIntegerField(default=0)
+    error_rows = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'Importación {self.pk} ({self.get_status_display()})'
+
+    class Meta:
+        ordering = ['-created_at']
@@ -0,0 +1,232 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+# Claves de orden fraccionarias: cadenas en base 36 que se comparan como la
+# parte decimal de un número (0.xyz). Entre dos claves siempre existe otra, de
+# modo que mover una tarjeta solo reescribe esa fila. Solo se usan dígitos y
+# minúsculas para que el orden sea el mismo con cualquier collation.
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+
+def _midpoint(a, b):
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else '0') == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def key_between(a=None, b=None):
+    a = a or ''
+    if b is not None and a >= b:
+        raise ValueError(f'Claves de orden inválidas: {a!r} >= {b!r}')
+    if a.endswith('0') or (b or '').endswith('0'):
+        raise ValueError('Las claves de orden no pueden terminar en 0')
+    return _midpoint(a, b)
+
+
+def _to_key(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits))
+
+
+def _step(key, delta):
+    # Suma delta en la última posición sin cambiar la longitud, saltando las
+    # claves que terminan en 0. None si se sale del rango.
+    width = len(key)
+    value = int(key, BASE) + delta
+    while 0 < value < BASE ** width and value % BASE == 0:
+        value += delta
+    if not 0 < value < BASE ** width:
+        return None
+    return _to_key(value, width)
+
+
+def _spread(a, b, count):
+    # count claves de la misma longitud junto a a (por detrás) o junto a b
+    # (por delante), para insertar muchas tarjetas de golpe en un extremo de
+    # la columna. Solo ocupan 1/BASE del hueco restante, así que las
+    # importaciones sucesivas apenas alargan las claves.
+    if a is None and b is None:
+        return spaced_keys(count)
+    width = max(len(a or ''), len(b or ''), 1)
+    while True:
+        low = int(a.ljust(width, '0'), BASE) if a else 0
+        high = int(b.ljust(width, '0'), BASE) if b is not None else BASE ** width
+        step = (high - low) // ((count + 1) * BASE)
+        if step >= 2:
+            break
+        width += 1
+    keys = []
+    for i in range(1, count + 1):
+        value = low + step * i if b is None else high - step * (count + 1 - i)
+        if value % BASE == 0:
+            value += 1
+        keys.append(_to_key(value, width))
+    return keys
+
+
+def _widen(key, delta):
+    # Cuando _step se queda sin hueco en un extremo, salta a una clave del
+    # doble de longitud pegada a key: los siguientes _step tienen BASE ** len
+    # posiciones más, de modo que la longitud crece de forma logarítmica con
+    # el número de inserciones y no una cifra cada pocas tarjetas.
+    width = len(key)
+    value = int(key.ljust(width * 2, '0'), BASE) + delta
+    if value % BASE == 0:
+        value += delta
+    return _to_key(value, width * 2)
+
+
+def keys_before(b, count):
+    # Insertar al principio de una columna decrementa la primera clave, así
+    # que la longitud no crece con cada tarjeta nueva.
+    if count > 1:
+        return _spread(None, b, count)
+    keys = []
+    for _ in range(count):
+        if b:
+            b = _step(b, -1) or _widen(b, -1)
+        else:
+            b = key_between(None, b)
+        keys.append(b)
+    return list(reversed(keys))
+
+
+def keys_after(a, count):
+    if count > 1:
+        return _spread(a, None, count)
+    keys = []
+    for _ in range(count):
+        if a:
+            a = _step(a, 1) or _widen(a, 1)
+        else:
+            a = key_between(a, None)
+        keys.append(a)
+    return keys
+
+
+def keys_between(a, b, count):
+    # count claves crecientes entre a y b, repartidas por bisección para que
+    # la longitud crezca de forma logarítmica.
+    if count <= 0:
+        return []
+    if b is None:
+        return keys_after(a, count)
+    if a is None:
+        return keys_before(b, count)
+    middle = key_between(a, b)
+    left = keys_between(a, middle, count // 2)
+    right = keys_between(middle, b, count - count // 2 - 1)
+    return left + [middle] + right
+
+
+def spaced_keys(count):
+    # Claves de longitud fija repartidas uniformemente en el tercio central del
+    # espacio, para reordenar una columna completa dejando margen por arriba y
+    # por abajo.
+    width = 1
+    while BASE ** width <= count * BASE * 3:
+        width += 1
+    space = BASE ** width
+    step = (space // 3) // (count + 1)
+    keys = []
+    for i in range(1, count + 1):
+        value = space // 3 + step * i
+        if value % BASE == 0:
+            value += 1
+        keys.append(_to_key(value, width))
+    return keys
+
+
+def column_queryset(project_id, status):
+    from .models import Task
+    return Task.objects.filter(project_id=project_id, status=status)
+
+
+def top_ranks(project_id, status, count=1):
+    # Claves para colocar count tarjetas al principio de una columna
+    first = column_queryset(project_id, status).exclude(rank='').order_by('rank').values_list('rank', flat=True).first()
+    return keys_between(None, first, count)
+
+
+def last_rank(project_id, status):
+    return column_queryset(project_id, status).exclude(rank='').order_by('-rank').values_list('rank', flat=True).first()
+
+
+def neighbour_ranks(task, status, after_id=None, before_id=None):
+    # Rango entre el que debe quedar la tarea: after_id es la tarjeta que
+    # queda justo encima y before_id la que queda justo debajo.
+    after_id = int(after_id) if after_id not in (None, '') else None
+    before_id = int(before_id) if before_id not in (None, '') else None
+    column = column_queryset(task.project_id, status).exclude(pk=task.pk)
+    ranks = dict(column.filter(pk__in=[pk for pk in (after_id, before_id) if pk]).values_list('pk', 'rank'))
+    if (after_id and after_id not in ranks) or (before_id and before_id not in ranks):
+        raise ValueError('La tarjeta vecina no está en la columna destino')
+    after = ranks.get(after_id)
+    before = ranks.get(before_id)
+    if after is not None and (before is None or before <= after):
+        before = column.filter(rank__gt=after).order_by('rank').values_list('rank', flat=True).first()
+    elif after is None and before is not None:
+        after = column.filter(rank__lt=before).order_by('-rank').values_list('rank', flat=True).first()
+    elif after is None:
+        return top_ranks(task.project_id, status)[0]
+    return key_between(after, before)
+
+
+def needs_rebalance(rank):
+    return len(rank) > settings.TASK_RANK_REBALANCE_LENGTH
+
+
+def rebalance_column(project_id, status, batch_size=500):
+    from kanbanflow.cache import invalidate_on_commit, project_scope
+    from .feed import publish_column_reordered
+    from .models import Task
+
+    # Sin tocar version: el orden interno de la columna lo decide el servidor
+    # y no debe dar 409 a quien arrastra una tarjeta
+    with transaction.atomic():
+        tasks = list(
+            column_queryset(project_id, status).select_for_update()
+            .order_by('rank', 'id').only('id', 'rank', 'updated_at')
+        )
+        now = timezone.now()
+        for task, rank in zip(tasks, spaced_keys(len(tasks))):
+            task.rank = rank
+            task.updated_at = now
+        Task.objects.bulk_update(tasks, ['rank', 'updated_at'], batch_size=batch_size)
+        invalidate_on_commit('tasks', project_scope(project_id))
+        publish_column_reordered(project_id, status)
+    return len(tasks)
+
+
+def schedule_long_columns(tasks):
+    # Tras asignar claves nuevas (altas, altas masivas, importaciones): las
+    # columnas con alguna clave demasiado larga se reordenan en segundo plano
+    columns = {(task.project_id, task.status) for task in tasks if needs_rebalance(task.rank)}
+    for project_id, status in sorted(columns):
+        schedule_rebalance(project_id, status)
+
+
+def schedule_rebalance(project_id, status):
+    # Tras el commit lo hace el worker; varias peticiones seguidas sobre la
+    # misma columna dejan un solo trabajo pendiente
+    from kanbanflow.apps.jobs.queue import enqueue
+
+    enqueue(
+        'tasks.rebalance_column', {'project_id': project_id, 'status': status},
+        dedupe_key=f'rebalance:{project_id}:{status}',
+    )
@@ -0,0 +1,97 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+# Búsqueda de texto completo sobre título y descripción. En PostgreSQL usa la
+# columna generada search_vector (índice GIN) y en SQLite la tabla FTS5
+# tasks_task_fts, mantenida por triggers (migración 0007). Ninguna de las dos
+# está en el modelo: Django nunca las escribe. Cada término se busca como
+# prefijo para el autocompletado.
+SEARCH_MAX_TERMS = 8
+SEARCH_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+
+SQLITE_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5(
+        title, description, content='tasks_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+SQLITE_TRIGGERS = {
+    'tasks_task_fts_insert': """
+        CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task BEGIN
+            INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+    'tasks_task_fts_delete': """
+        CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task BEGIN
+            INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """,
+    'tasks_task_fts_update': """
+        CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF title, description ON tasks_task BEGIN
+            INSERT INTO tasks_task_fts(tasks_task_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO tasks_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    """,
+}
+
+
+def ensure_sqlite_index(connection):
+    # SQLite reconstruye la tabla en muchas migraciones (ALTER TABLE) y con
+    # ella se pierden los triggers: si falta alguno se recrea y se reindexa.
+    with connection.cursor() as cursor:
+        cursor.execute(SQLITE_TABLE)
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tasks_task'")
+        existing = {name for name, in cursor.fetchall()}
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute("INSERT INTO tasks_task_fts(tasks_task_fts) VALUES ('rebuild')")
+
+
+def search_terms(query):
+    return re.findall(r'\w+', (query or '').lower())[:SEARCH_MAX_TERMS]
+
+
+def _tsquery(terms):
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def _fts_match(terms):
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_queryset(queryset, query):
+    # Filtra por la búsqueda y anota search_rank (mayor = más relevante)
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    table = queryset.model._meta.db_table
+    if connection.vendor == 'postgresql':
+        tsquery = _tsquery(terms)
+        return queryset.extra(
+            where=[f'"{table}"."search_vector" @@ to_tsquery(\'simple\', %s)'], params=[tsquery],
+        ).annotate(search_rank=RawSQL(
+            f'ts_rank("{table}"."search_vector", to_tsquery(\'simple\', %s))', [tsquery], output_field=FloatField(),
+        ))
+    if connection.vendor == 'sqlite':
+        # Join con la tabla FTS: una subconsulta correlacionada para bm25
+        # repetía el MATCH por cada fila encontrada. bm25 devuelve valores
+        # negativos: cuanto menor, más relevante
+        return queryset.extra(
+            tables=[f'{table}_fts'],
+            where=[f'{table}_fts.rowid = "{table}"."id"', f'{table}_fts MATCH %s'], params=[_fts_match(terms)],
+            select={'search_rank': f'-bm25({table}_fts, 10.0, 1.0)'},
+        )
+    # Otros motores: sin índice ni relevancia
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(description__icontains=term)
+    return queryset.filter(condition).annotate(search_rank=RawSQL('0', [], output_field=FloatField()))
@@ -1,12 +1,49 @@
 from rest_framework import serializers
-from .models import Task
+from kanbanflow.fastpath import FastRows, datetime_converter
+from kanbanflow.serializers import SparseFieldsetMixin, TimedSerializerMixin
+from .models import Task, TaskImportJob
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(TimedSerializerMixin, SparseFieldsetMixin, serializers.ModelSerializer):
     created_by = serializers.StringRelatedField(read_only=True)
     assigned_to = serializers.StringRelatedField(read_only=True)
     
     class Meta:
         model = Task
         fields = ['id', 'title', 'description', 'status', 'priority', 'project', 
-                 'assigned_to', 'created_by', 'created_at', 'updated_at', 'due_date']
-        read_only_fields = ['created_at', 'updated_at']
\ No newline at end of file
+                 'assigned_to', 'created_by', 'created_at', 'updated_at', 'due_date', 'rank', 'version']
+        read_only_fields = ['created_at', 'updated_at', 'rank', 'version']
+
+
+class TaskImportJobSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = TaskImportJob
+        fields = ['id', 'project', 'format', 'batch_size', 'status', 'processed_rows', 'imported_rows',
+                  'error_rows', 'errors', 'message', 'created_at', 'updated_at', 'finished_at']
+        read_only_fields = fields
+
+
+def optimize_task_queryset(queryset):
+    # Todo lo que necesita TaskSerializer en una sola consulta: los usuarios
+    # relacionados por JOIN y solo su username; el proyecto va por id
+    fields = [field.name for field in Task._meta.concrete_fields]
+    return queryset.select_related('created_by', 'assigned_to').only(
+        *fields, 'created_by__username', 'assigned_to__username'
+    )
+
+
+# Equivalente de TaskSerializer para la ruta rápida de los listados
+TASK_FAST_ROWS = FastRows(
+    ('id', 'id', None),
+    ('title', 'title', None),
+    ('description', 'description', None),
+    ('status', 'status', None),
+    ('priority', 'priority', None),
+    ('project', 'project_id', None),
+    ('assigned_to', 'assigned_to__username', None),
+    ('created_by', 'created_by__username', None),
+    ('created_at', 'created_at', datetime_converter),
+    ('updated_at', 'updated_at', datetime_converter),
+    ('due_date', 'due_date', datetime_converter),
+    ('rank', 'rank', None),
+    ('version', 'version', None),
+)
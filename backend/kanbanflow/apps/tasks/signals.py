@@ -0,0 +1,115 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from kanbanflow.cache import invalidate_on_commit, project_scope
+from kanbanflow.apps.projects.models import Project
+from . import counters
+from .feed import publish_task_event
+from .models import Task, TaskTombstone
+
+_batch = threading.local()
+
+
+@contextmanager
+def handled_in_batch():
+    # Borrados cuya caché, eventos, contadores y tombstones hace el llamante
+    # una vez por lote (archive.py) en lugar de fila a fila
+    _batch.active = True
+    try:
+        yield
+    finally:
+        _batch.active = False
+
+
+def in_batch():
+    return getattr(_batch, 'active', False)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_cache(sender, instance, **kwargs):
+    if in_batch():
+        return
+    # Si cambió de proyecto, también el tablero en el que estaba
+    project_ids = {instance.project_id, getattr(instance, '_loaded_project_id', None)} - {None}
+    invalidate_on_commit('tasks', *[project_scope(pk) for pk in sorted(project_ids)])
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        publish_task_event(instance, 'created')
+    else:
+        publish_task_event(instance, 'updated', update_fields)
+
+
+@receiver(post_save, sender=Task)
+def record_task_created(sender, instance, created, **kwargs):
+    # bulk_create no emite la señal: bulk.py e imports.py lo registran ellos
+    if created:
+        from .stats import record_created
+        record_created([instance])
+
+
+@receiver(post_save, sender=Task)
+def record_task_moved(sender, instance, created, **kwargs):
+    # Para el tablero de origen la tarea movida equivale a un borrado; si
+    # vuelve a un proyecto en el que estuvo, su tombstone ya no vale
+    old_project_id = getattr(instance, '_loaded_project_id', None)
+    if created or old_project_id is None or old_project_id == instance.project_id:
+        return
+    TaskTombstone.objects.filter(task_id=instance.pk, project_id=instance.project_id).delete()
+    TaskTombstone.objects.create(task_id=instance.pk, project_id=old_project_id)
+
+
+@receiver(post_save, sender=Task)
+def count_task_saved(sender, instance, created, **kwargs):
+    # Contadores de Project; bulk_create los ajusta bulk.py. Va después de
+    # los receptores anteriores porque deja _loaded_project_id al día
+    if created:
+        counters.count_created([instance])
+    else:
+        counters.count_changed([instance])
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deleted(sender, instance, **kwargs):
+    if in_batch():
+        return
+    publish_task_event(instance, 'deleted', fields=())
+
+
+def deleting_project(origin):
+    # Si se borra el proyecto entero no hay nada que sincronizar ni contar
+    # (origin es el proyecto o, con QuerySet.delete(), el queryset de
+    # proyectos); tampoco en los borrados por lote
+    return in_batch() or isinstance(origin, Project) or getattr(origin, 'model', None) is Project
+
+
+@receiver(post_delete, sender=Task)
+def count_task_deleted(sender, instance, origin=None, **kwargs):
+    if deleting_project(origin):
+        return
+    counters.count_deleted([instance])
+
+
+@receiver(post_delete, sender=Task)
+def record_task_tombstone(sender, instance, origin=None, **kwargs):
+    if deleting_project(origin):
+        return
+    TaskTombstone.objects.create(task_id=instance.pk, project_id=instance.project_id)
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using='default', **kwargs):
+    from .search import ensure_sqlite_index
+
+    connection = connections[using]
+    if sender.label != 'tasks' or connection.vendor != 'sqlite':
+        return
+    if ('tasks', '0007_task_search_index') in MigrationRecorder(connection).applied_migrations():
+        ensure_sqlite_index(connection)
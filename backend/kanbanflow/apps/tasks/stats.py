@@ -0,0 +1,150 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Q, Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+from .models import Task, TaskDailyStats, TaskStatusTransition
+
+# Estadísticas por proyecto. Los contadores actuales salen de una única
+# consulta agrupada sobre las tareas; el histórico (altas, cierres y tiempo
+# de ciclo por semana) sale de TaskDailyStats, que incrementa el worker
+# (trabajo tasks.daily_stats) para no bloquear la fila del día en cada
+# petición. Cada petición solo inserta su trabajo con los incrementos; corre
+# TASK_STATS_FLUSH_SECONDS después y suma de paso los pendientes del mismo
+# proyecto y día, así que la fila se actualiza una vez por tanda.
+STATS_WEEKS = 12
+STATS_MAX_WEEKS = 104
+
+
+def bump_daily(project_id, day, **increments):
+    updates = {field: F(field) + value for field, value in increments.items()}
+    rows = TaskDailyStats.objects.filter(project_id=project_id, day=day)
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            TaskDailyStats.objects.create(project_id=project_id, day=day, **increments)
+    except IntegrityError:
+        # Otra petición creó la fila del día entre medias
+        rows.update(**updates)
+
+
+def schedule_daily(project_id, day, **increments):
+    from kanbanflow.apps.jobs.queue import enqueue
+
+    enqueue(
+        'tasks.daily_stats', {'project_id': project_id, 'day': day.isoformat(), 'increments': increments},
+        delay=settings.TASK_STATS_FLUSH_SECONDS,
+    )
+
+
+def record_created(tasks):
+    counts = defaultdict(int)
+    for task in tasks:
+        counts[(task.project_id, timezone.localdate(task.created_at))] += 1
+    for (project_id, day), count in counts.items():
+        schedule_daily(project_id, day, created=count)
+
+
+def record_transitions(changes, user=None):
+    # changes: [(tarea ya guardada, estado anterior)]
+    changes = [(task, previous) for task, previous in changes if task.status != previous]
+    if not changes:
+        return
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    # Tiempo de ciclo desde la primera vez que la tarea empezó (pasó a en
+    # progreso o a completada); si ya se había completado antes, reabrirla y
+    # volver a cerrarla no cuenta otro cierre
+    closing = [task for task, _ in changes if task.status == 'completed']
+    history = {
+        row['task_id']: row for row in
+        TaskStatusTransition.objects.filter(task__in=closing, to_status__in=['in_progress', 'completed'])
+        .order_by().values('task_id')
+        .annotate(started=Min('changed_at'), closed=Count('id', filter=Q(to_status='completed')))
+    } if closing else {}
+    TaskStatusTransition.objects.bulk_create([
+        TaskStatusTransition(
+            task_id=task.pk, project_id=task.project_id, from_status=previous,
+            to_status=task.status, changed_by_id=user_id,
+        )
+        for task, previous in changes
+    ])
+    now = timezone.now()
+    completed = defaultdict(lambda: [0, 0.0])
+    for task, previous in changes:
+        if task.status != 'completed':
+            continue
+        row = history.get(task.pk)
+        if row and row['closed']:
+            continue
+        if row:
+            started = row['started']
+        else:
+            # Sin historial: creada ya en curso (o antes de que existiera el
+            # historial) o completada directamente desde pendiente
+            started = task.created_at if previous != 'pending' else now
+        totals = completed[task.project_id]
+        totals[0] += 1
+        totals[1] += (now - started).total_seconds()
+    for project_id, (count, seconds) in completed.items():
+        schedule_daily(
+            project_id, timezone.localdate(now),
+            completed=count, cycle_time_total=seconds, cycle_time_count=count,
+        )
+
+
+def _hours(seconds, count):
+    return round(seconds / count / 3600, 1) if count else None
+
+
+def project_stats(project, weeks=STATS_WEEKS):
+    now = timezone.now()
+    by_status = {status: 0 for status, _ in Task.STATUS_CHOICES}
+    by_priority = {priority: 0 for priority, _ in Task.PRIORITY_CHOICES}
+    overdue = 0
+    groups = (
+        Task.objects.filter(project=project).order_by()
+        .values('status', 'priority')
+        .annotate(total=Count('id'), overdue=Count('id', filter=Q(due_date__lt=now) & ~Q(status='completed')))
+    )
+    for group in groups:
+        by_status[group['status']] = by_status.get(group['status'], 0) + group['total']
+        by_priority[group['priority']] = by_priority.get(group['priority'], 0) + group['total']
+        overdue += group['overdue']
+
+    today = timezone.localdate(now)
+    first_week = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+    history = {
+        row['week']: row for row in
+        TaskDailyStats.objects.filter(project=project, day__gte=first_week)
+        .annotate(week=TruncWeek('day')).order_by('week').values('week')
+        .annotate(
+            created=Sum('created'), completed=Sum('completed'),
+            cycle_time_total=Sum('cycle_time_total'), cycle_time_count=Sum('cycle_time_count'),
+        )
+    }
+    throughput = []
+    cycle_total = cycle_count = 0
+    for i in range(weeks):
+        week = first_week + timedelta(weeks=i)
+        row = history.get(week) or {}
+        cycle_total += row.get('cycle_time_total') or 0
+        cycle_count += row.get('cycle_time_count') or 0
+        throughput.append({
+            'week': week.isoformat(),
+            'created': row.get('created') or 0,
+            'completed': row.get('completed') or 0,
+            'cycle_time_hours': _hours(row.get('cycle_time_total') or 0, row.get('cycle_time_count') or 0),
+        })
+
+    return {
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'by_priority': by_priority,
+        'overdue': overdue,
+        'throughput': throughput,
+        'cycle_time_hours': _hours(cycle_total, cycle_count),
+    }
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from kanbanflow.pagination import decode_cursor, encode_cursor
+from .models import Task, TaskTombstone
+from .serializers import TaskSerializer, optimize_task_queryset
+
+# Sincronización incremental: el token codifica el instante de la consulta
+# anterior. Se solapa una pequeña ventana hacia atrás para no perder filas de
+# transacciones que confirmaron después de su updated_at; el cliente aplica
+# los cambios como upserts, así que las repeticiones no importan.
+
+
+def make_token(moment):
+    return encode_cursor([moment])
+
+
+def parse_token(token):
+    moment = parse_datetime(decode_cursor(token, 1)[0] or '')
+    if moment is None:
+        raise ValueError('Token inválido')
+    return moment
+
+
+def changes_since(project_id, token=None):
+    now = timezone.now()
+    if not token:
+        # Primer contacto: el cliente guarda el token y carga el tablero
+        return {'token': make_token(now), 'reset': False, 'tasks': [], 'deleted': []}
+
+    since = parse_token(token)
+    retention = timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+    if since < now - retention:
+        # Los tombstones de ese periodo ya se purgaron
+        return {'token': make_token(now), 'reset': True, 'tasks': [], 'deleted': []}
+
+    since -= timedelta(seconds=settings.TASK_CHANGES_OVERLAP_SECONDS)
+    limit = settings.TASK_CHANGES_MAX_ROWS
+    tasks = list(
+        optimize_task_queryset(Task.objects.filter(project_id=project_id, updated_at__gte=since))
+        .order_by('updated_at', 'id')[:limit + 1]
+    )
+    if len(tasks) > limit:
+        return {'token': make_token(now), 'reset': True, 'tasks': [], 'deleted': []}
+
+    deleted = list(
+        TaskTombstone.objects.filter(project_id=project_id, deleted_at__gte=since)
+        .order_by('deleted_at').values_list('task_id', flat=True)
+    )
+    return {
+        'token': make_token(now),
+        'reset': False,
+        'tasks': TaskSerializer(tasks, many=True).data,
+        'deleted': deleted,
+    }
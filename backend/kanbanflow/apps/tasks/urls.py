@@ -1,8 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TaskViewSet
+from .views import TaskImportJobViewSet, TaskViewSet
 
 router = DefaultRouter()
+router.register(r'imports', TaskImportJobViewSet, basename='task-import')
 router.register(r'', TaskViewSet, basename='task')
 
 urlpatterns = [
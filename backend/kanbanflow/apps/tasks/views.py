@@ -1,37 +1,272 @@
 from rest_framework import viewsets
-from rest_framework.permissions import AllowAny
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
-from django.db import models
-from django.views.decorators.cache import cache_page
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 from django.utils.decorators import method_decorator
-from .models import Task
-from .serializers import TaskSerializer
+from kanbanflow.cache import project_scope, versioned_cache
+from kanbanflow.db_router import ReplicaReadsMixin
+from .archive import include_archived, merged_page
+from .bulk import BulkError, run_bulk
+from .concurrency import VersionConflict, changed_fields, requested_version, save_changes, version_etag
+from .imports import guess_format, schedule_import, store_upload
+from .models import ArchivedTask, Task, TaskImportJob
+from .ranking import needs_rebalance, neighbour_ranks, schedule_rebalance
+from .search import SEARCH_LIMIT, SEARCH_MAX_LIMIT, search_queryset, search_terms
+from .serializers import TASK_FAST_ROWS, TaskImportJobSerializer, TaskSerializer, optimize_task_queryset
+from .stats import record_transitions
+from .sync import changes_since
+from kanbanflow.fastpath import FastListMixin, json_response, wants_fast_path
+from kanbanflow.serializers import defer_unrequested, requested_fields
 from kanbanflow.apps.projects.models import Project
+from kanbanflow.apps.projects.permissions import IsProjectMember, check_project_access, visible_project_ids
 
-@method_decorator(cache_page(30), name='list')  # Cache por 30 segundos
-class TaskViewSet(viewsets.ModelViewSet):
+def task_list_scope(request):
+    project_id = request.query_params.get('project')
+    return project_scope(project_id) if project_id else 'tasks'
+
+@method_decorator(versioned_cache(task_list_scope), name='list')
+class TaskViewSet(ReplicaReadsMixin, FastListMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
-    permission_classes = [AllowAny]
-    queryset = Task.objects.select_related('project', 'created_by').order_by('-created_at')
+    fast_rows = TASK_FAST_ROWS
+    permission_classes = [IsProjectMember]
+    # /changes/ no: un cursor que avanza sobre una réplica atrasada perdería cambios
+    replica_actions = ('list', 'retrieve', 'search')
+    queryset = optimize_task_queryset(Task.objects.order_by('-created_at', '-id'))
     
-    def get_queryset(self):
+    def get_queryset(self, model=Task):
+        queryset = optimize_task_queryset(model.objects.order_by('-created_at', '-id'))
+        queryset = queryset.filter(project_id__in=visible_project_ids(self.request.user))
         project_id = self.request.query_params.get('project', None)
         if project_id:
-            return Task.objects.select_related('project', 'created_by').filter(project_id=project_id).order_by('-created_at')
-        return Task.objects.select_related('project', 'created_by').order_by('-created_at')
+            queryset = queryset.filter(project_id=project_id)
+        return defer_unrequested(queryset, self.request, ('description',))
+
+    def list(self, request, *args, **kwargs):
+        if not include_archived(request):
+            return super().list(request, *args, **kwargs)
+        return self.list_with_archived(request)
+
+    def list_with_archived(self, request):
+        # ?include_archived=true: tareas y archivo mezclados por keyset, con
+        # el campo archived en cada fila
+        paginator = self.paginator
+        querysets = [self.filter_queryset(self.get_queryset()), self.filter_queryset(self.get_queryset(ArchivedTask))]
+        fast = wants_fast_path(request)
+        if fast:
+            names = requested_fields(request)
+            extra = [field.lstrip('-') for field in paginator.ordering]
+            querysets = [self.fast_rows.queryset(queryset, names, extra) for queryset in querysets]
+        try:
+            rows, paginator.next_cursor = merged_page(
+                querysets, paginator.ordering, paginator.get_page_size(request),
+                request.query_params.get(paginator.cursor_query_param),
+            )
+        except (ValueError, ValidationError):
+            raise NotFound('Cursor inválido')
+        paginator.request = request
+        if fast:
+            data = self.fast_rows.rows([row for _, row in rows], names, extra)
+        else:
+            data = self.get_serializer([row for _, row in rows], many=True).data
+        for item, (source, _) in zip(data, rows):
+            item['archived'] = source == 1
+        if fast:
+            return json_response(paginator.get_paginated_response(data).data)
+        return paginator.get_paginated_response(data)
     
     def perform_create(self, serializer):
-        from django.contrib.auth.models import User
-        user = User.objects.first() or User.objects.create_user('demo', 'demo@demo.com', 'demo')
-        serializer.save(created_by=user)
+        check_project_access(self.request.user, serializer.validated_data['project'].pk)
+        serializer.save(created_by=self.request.user)
+
+    def retrieve(self, request, *args, **kwargs):
+        task = self.get_object()
+        response = Response(self.get_serializer(task).data)
+        response['ETag'] = version_etag(task)
+        return response
+
+    def update(self, request, *args, **kwargs):
+        # PUT y PATCH: solo se escriben los campos que cambian, con If-Match
+        try:
+            version = requested_version(request)
+        except ValueError:
+            return Response({'error': 'Versión inválida'}, status=400)
+        task = self.get_object()
+        serializer = self.get_serializer(task, data=request.data, partial=kwargs.pop('partial', False))
+        serializer.is_valid(raise_exception=True)
+        try:
+            self.perform_update(serializer, version)
+        except VersionConflict:
+            return self.conflict(task.pk)
+        response = Response(serializer.data)
+        response['ETag'] = version_etag(task)
+        return response
+
+    def perform_update(self, serializer, version=None):
+        data = serializer.validated_data
+        if 'project' in data:
+            check_project_access(self.request.user, data['project'].pk)
+        task = serializer.instance
+        previous = task.status
+        changed = changed_fields(task, data)
+        if not changed:
+            if version not in (None, task.version):
+                raise VersionConflict()
+            return
+        for name in changed:
+            setattr(task, name, data[name])
+        if ('status' in changed or 'project' in changed) and 'rank' not in changed:
+            # Como en update_status: arriba del todo en la columna destino
+            task.rank = neighbour_ranks(task, task.status)
+            changed.append('rank')
+        with transaction.atomic():
+            save_changes(task, changed, version)
+            record_transitions([(task, previous)], self.request.user)
+        if needs_rebalance(task.rank):
+            schedule_rebalance(task.project_id, task.status)
+
+    def conflict(self, pk):
+        # 409 con el estado actual de la tarea para que el cliente lo aplique
+        task = self.get_queryset().filter(pk=pk).first()
+        if task is None:
+            raise NotFound()
+        response = Response(
+            {'error': 'La tarea ha cambiado desde que se leyó', 'task': TaskSerializer(task).data}, status=409,
+        )
+        response['ETag'] = version_etag(task)
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        project_id = request.query_params.get('project')
+        if not project_id or not project_id.isdigit():
+            return Response({'error': 'Se requiere el parámetro project'}, status=400)
+        check_project_access(request.user, int(project_id))
+        try:
+            return Response(changes_since(int(project_id), request.query_params.get('since')))
+        except ValueError:
+            return Response({'error': 'Token inválido'}, status=400)
+    
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        # ?q=texto (prefijos, para autocompletado), ?project= y ?limit=
+        if not search_terms(request.query_params.get('q')):
+            return Response({'error': 'Se requiere el parámetro q'}, status=400)
+        try:
+            limit = int(request.query_params.get('limit', SEARCH_LIMIT))
+        except ValueError:
+            return Response({'error': 'Límite inválido'}, status=400)
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+
+        project_ids = visible_project_ids(request.user)
+        project_id = request.query_params.get('project')
+        if project_id:
+            project_ids = [pk for pk in project_ids if str(pk) == project_id]
+        queryset = search_queryset(
+            optimize_task_queryset(Task.objects.filter(project_id__in=project_ids)),
+            request.query_params['q'],
+        ).order_by('-search_rank', '-id')[:limit]
+        return Response({'results': TaskSerializer(queryset, many=True).data})
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        try:
+            results, ok = run_bulk(
+                request.data.get('operations'), request.user, atomic=bool(request.data.get('atomic')),
+                project_ids=visible_project_ids(request.user),
+            )
+        except BulkError as e:
+            return Response(e.errors, status=400)
+        return Response({'results': results}, status=200 if ok else 400 if request.data.get('atomic') else 207)
     
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
+        # Un UPDATE condicional de status/rank; con If-Match, 409 si la
+        # tarjeta cambió desde que la vio el cliente
+        try:
+            version = requested_version(request)
+        except ValueError:
+            return Response({'error': 'Versión inválida'}, status=400)
         task = self.get_object()
         new_status = request.data.get('status')
         if new_status in ['pending', 'in_progress', 'completed']:
+            # after/before: tarjetas que quedan justo encima/debajo en la columna destino
+            after_id = request.data.get('after')
+            before_id = request.data.get('before')
+            changed = ['status'] if new_status != task.status else []
+            if after_id or before_id or changed:
+                try:
+                    task.rank = neighbour_ranks(task, new_status, after_id, before_id)
+                except ValueError:
+                    return Response({'error': 'Posición inválida'}, status=400)
+                changed.append('rank')
+            previous = task.status
             task.status = new_status
-            task.save()
-            return Response(TaskSerializer(task).data)
-        return Response({'error': 'Estado inválido'}, status=400)
\ No newline at end of file
+            try:
+                if changed:
+                    with transaction.atomic():
+                        save_changes(task, changed, version)
+                        record_transitions([(task, previous)], request.user)
+                elif version not in (None, task.version):
+                    raise VersionConflict()
+            except VersionConflict:
+                return self.conflict(task.pk)
+            if needs_rebalance(task.rank):
+                schedule_rebalance(task.project_id, task.status)
+            response = Response(TaskSerializer(task).data)
+            response['ETag'] = version_etag(task)
+            return response
+        return Response({'error': 'Estado inválido'}, status=400)
+
+
+class TaskImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    # POST con multipart (file, project, format opcional, batch_size opcional);
+    # la importación corre en segundo plano y el job informa del progreso.
+    serializer_class = TaskImportJobSerializer
+    permission_classes = [IsProjectMember]
+    queryset = TaskImportJob.objects.order_by('-created_at', '-id')
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(project_id__in=visible_project_ids(self.request.user))
+        project_id = self.request.query_params.get('project')
+        if project_id:
+            queryset = queryset.filter(project_id=project_id)
+        return queryset
+
+    def create(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'Se requiere un fichero'}, status=400)
+        project_id = str(request.data.get('project', ''))
+        project = Project.objects.filter(pk=project_id).first() if project_id.isdigit() else None
+        if project is None:
+            return Response({'error': 'Proyecto inexistente'}, status=400)
+        check_project_access(request.user, project.pk)
+        import_format = request.data.get('format') or guess_format(upload.name)
+        if import_format not in dict(TaskImportJob.FORMAT_CHOICES):
+            return Response({'error': 'Formato inválido'}, status=400)
+        try:
+            batch_size = int(request.data.get('batch_size') or settings.TASK_IMPORT_BATCH_SIZE)
+        except ValueError:
+            return Response({'error': 'Tamaño de lote inválido'}, status=400)
+        batch_size = max(1, min(batch_size, settings.TASK_IMPORT_MAX_BATCH_SIZE))
+
+        job = TaskImportJob.objects.create(
+            project=project,
+            created_by=request.user,
+            source=store_upload(upload),
+            format=import_format,
+            batch_size=batch_size,
+        )
+        schedule_import(job)
+        return Response(self.get_serializer(job).data, status=202)
+
+    @action(detail=True, methods=['post'])
+    def resume(self, request, pk=None):
+        job = self.get_object()
+        if job.status != 'failed':
+            return Response({'error': 'Solo se pueden reanudar importaciones fallidas'}, status=400)
+        schedule_import(job)
+        return Response(self.get_serializer(job).data, status=202)
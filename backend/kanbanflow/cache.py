@@ -0,0 +1,157 @@
+import hashlib
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import BaseMemcachedCache
+from django.core.cache.backends.redis import RedisCache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from kanbanflow.db_router import reading_from_replica
+
+# Caché de respuestas con contador de versión por ámbito ("project:<id>",
+# "projects", "tasks"). Cada escritura incrementa la versión del ámbito, de
+# modo que las entradas anteriores quedan huérfanas y nunca se sirven.
+VERSION_KEY = 'kf:v:%s'
+MODIFIED_KEY = 'kf:m:%s'
+RESPONSE_KEY = 'kf:r:%s'
+
+
+def _versions():
+    return caches[settings.API_CACHE_VERSION_ALIAS]
+
+
+def _initial_version():
+    # Si la versión se pierde (expulsión del backend) se reinicia en un valor
+    # mayor que cualquier contador anterior.
+    return time.time_ns() // 1000
+
+
+def get_version(scope):
+    versions = _versions()
+    keys = [VERSION_KEY % scope, MODIFIED_KEY % scope]
+    values = versions.get_many(keys)
+    version = values.get(keys[0])
+    modified = values.get(keys[1])
+    if version is None:
+        version = _initial_version()
+        if not versions.add(keys[0], version, timeout=None):
+            version = versions.get(keys[0], version)
+    if modified is None:
+        modified = time.time()
+        versions.add(keys[1], modified, timeout=None)
+    return version, modified
+
+
+def _atomic_incr(versions):
+    # incr() es atómico en Redis y Memcached (y en LocMem, de un solo
+    # proceso); en FileBased o la base de datos es leer y escribir, y dos
+    # invalidaciones a la vez pueden dejar la misma versión
+    return isinstance(getattr(versions, '_l2', versions), (RedisCache, BaseMemcachedCache, LocMemCache))
+
+
+def _fresh_version():
+    # Versión nueva sin leer la anterior: distinta de cualquier otra aunque
+    # dos procesos invaliden en el mismo instante
+    return time.time_ns() * 1000 + random.randrange(1000)
+
+
+def bump_version(*scopes):
+    versions = _versions()
+    atomic = _atomic_incr(versions)
+    for scope in scopes:
+        if atomic:
+            try:
+                versions.incr(VERSION_KEY % scope)
+            except ValueError:
+                versions.set(VERSION_KEY % scope, _initial_version(), timeout=None)
+        else:
+            versions.set(VERSION_KEY % scope, _fresh_version(), timeout=None)
+        versions.set(MODIFIED_KEY % scope, time.time(), timeout=None)
+
+
+def invalidate_on_commit(*scopes):
+    # Incrementar antes del commit permitiría cachear datos viejos con la
+    # versión nueva.
+    transaction.on_commit(lambda: bump_version(*scopes))
+
+
+def project_scope(project_id):
+    try:
+        project_id = int(project_id)
+    except (TypeError, ValueError):
+        pass
+    return f'project:{project_id}'
+
+
+def response_key(request, scope, version):
+    ignored = set(settings.API_CACHE_IGNORED_PARAMS)
+    params = sorted(
+        (name, value)
+        for name, values in request.GET.lists() if name not in ignored
+        for value in values
+    )
+    user_id = request.user.pk if request.user.is_authenticated else 0
+    raw = f'{scope}:{version}:{user_id}:{request.path}:{params!r}'
+    return RESPONSE_KEY % hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def versioned_cache(get_scope):
+    # Sustituto de cache_page: la clave incluye la versión del ámbito, el
+    # usuario y los parámetros normalizados, y la respuesta lleva
+    # ETag/Last-Modified para revalidar con 304.
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+            scope = get_scope(request, *args, **kwargs)
+            version, modified = get_version(scope)
+            key = response_key(request, scope, version)
+            etag = quote_etag(key.rsplit(':', 1)[-1])
+            # Last-Modified va en segundos: mientras no termine el segundo del
+            # último cambio puede llegar otro con la misma fecha y un
+            # If-Modified-Since daría 304 con datos viejos, así que hasta
+            # entonces solo se valida con ETag
+            last_modified = int(modified) if int(time.time()) > int(modified) else None
+
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return _with_validators(not_modified, etag, last_modified)
+
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return _with_validators(HttpResponse(content, content_type=content_type), etag, last_modified)
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200:
+                _with_validators(response, etag, last_modified)
+                if hasattr(response, 'add_post_render_callback'):
+                    response.add_post_render_callback(lambda r: _store(key, r))
+                else:
+                    _store(key, response)
+            return response
+        return wrapper
+    return decorator
+
+
+def _store(key, response):
+    # Lo leído de la réplica puede ser anterior a la versión actual: se
+    # guarda poco tiempo
+    timeout = settings.DATABASE_REPLICA_CACHE_TIMEOUT if reading_from_replica() else settings.API_CACHE_TIMEOUT
+    if not getattr(response, 'streaming', False):
+        cache.set(key, (response.content, response['Content-Type']), min(timeout, settings.API_CACHE_TIMEOUT))
+
+
+def _with_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
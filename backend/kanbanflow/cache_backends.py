@@ -0,0 +1,91 @@
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+_MISSING = object()
+
+
+class TwoTierCache(BaseCache):
+    # L1 en memoria del proceso con TTL corto delante de una caché compartida
+    # (L2). Las lecturas frecuentes no salen del proceso; las escrituras van a
+    # ambos niveles. Otros workers pueden ver un valor viejo durante, como
+    # mucho, L1_TIMEOUT segundos.
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = options.get('L2', 'shared')
+        self._l1_timeout = options.get('L1_TIMEOUT', 2)
+        self._l1 = LocMemCache(f'two-tier-l1:{location}', {
+            'TIMEOUT': self._l1_timeout,
+            'OPTIONS': {'MAX_ENTRIES': options.get('L1_MAX_ENTRIES', 1000)},
+        })
+
+    @property
+    def _l2(self):
+        return caches[self._l2_alias]
+
+    def _l1_timeout_for(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self._l1_timeout
+        return min(timeout, self._l1_timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self._l2.add(key, value, timeout, version)
+        if added:
+            self._l1.set(key, value, self._l1_timeout_for(timeout), version)
+        return added
+
+    def get(self, key, default=None, version=None):
+        value = self._l1.get(key, _MISSING, version)
+        if value is not _MISSING:
+            return value
+        value = self._l2.get(key, _MISSING, version)
+        if value is _MISSING:
+            return default
+        self._l1.set(key, value, self._l1_timeout, version)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._l2.set(key, value, timeout, version)
+        self._l1.set(key, value, self._l1_timeout_for(timeout), version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._l2.touch(key, timeout, version)
+
+    def delete(self, key, version=None):
+        self._l1.delete(key, version)
+        return self._l2.delete(key, version)
+
+    def get_many(self, keys, version=None):
+        found = self._l1.get_many(keys, version)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            fetched = self._l2.get_many(missing, version)
+            if fetched:
+                self._l1.set_many(fetched, self._l1_timeout, version)
+            found.update(fetched)
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self._l2.set_many(data, timeout, version)
+        self._l1.set_many(data, self._l1_timeout_for(timeout), version)
+        return failed
+
+    def delete_many(self, keys, version=None):
+        self._l1.delete_many(keys, version)
+        self._l2.delete_many(keys, version)
+
+    def incr(self, key, delta=1, version=None):
+        # Los contadores solo son atómicos en L2
+        self._l1.delete(key, version)
+        return self._l2.incr(key, delta, version)
+
+    def has_key(self, key, version=None):
+        return self._l1.has_key(key, version) or self._l2.has_key(key, version)
+
+    def clear(self):
+        self._l1.clear()
+        self._l2.clear()
+
+    def close(self, **kwargs):
+        self._l2.close(**kwargs)
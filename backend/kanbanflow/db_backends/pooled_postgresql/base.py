@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.db.utils import OperationalError
+
+# PostgreSQL con un pool de conexiones por proceso. La conexión se pide al
+# pool al abrir el primer cursor y vuelve a él cuando Django la cierra al
+# final de la petición (CONN_MAX_AGE = 0). Una conexión que lleva más de
+# POOL_CHECK_AFTER segundos parada se comprueba con SELECT 1 antes de
+# entregarla. Opciones en OPTIONS: POOL_SIZE (máximo de conexiones por
+# proceso), POOL_TIMEOUT (segundos esperando una libre) y POOL_CHECK_AFTER.
+POOL_OPTIONS = {'POOL_SIZE': 10, 'POOL_TIMEOUT': 10, 'POOL_CHECK_AFTER': 30}
+# PQTransactionStatus (igual en psycopg2 y psycopg 3)
+TRANSACTION_IDLE = 0
+TRANSACTION_UNKNOWN = 4
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    def __init__(self, size, timeout, check_after):
+        self.size = size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.idle = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(size)
+
+    def get(self, connect):
+        if not self.slots.acquire(timeout=self.timeout):
+            raise OperationalError(f'No hay conexiones libres en el pool ({self.size}) tras {self.timeout} s')
+        try:
+            while True:
+                with self.lock:
+                    connection, returned_at = self.idle.pop() if self.idle else (None, None)
+                if connection is None:
+                    return connect()
+                if self.usable(connection, returned_at):
+                    return connection
+                self.discard(connection)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def put(self, connection):
+        try:
+            if connection.closed:
+                return
+            status = connection.info.transaction_status
+            if status == TRANSACTION_UNKNOWN:
+                self.discard(connection)
+                return
+            if status != TRANSACTION_IDLE:
+                connection.rollback()
+            with self.lock:
+                self.idle.append((connection, time.monotonic()))
+        except base.Database.Error:
+            self.discard(connection)
+        finally:
+            self.slots.release()
+
+    def usable(self, connection, returned_at):
+        if connection.closed:
+            return False
+        if time.monotonic() - returned_at < self.check_after:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            connection.rollback()
+            return True
+        except base.Database.Error:
+            return False
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except base.Database.Error:
+            pass
+
+
+def get_pool(alias, options):
+    # Un pool por alias y por proceso: tras un fork (gunicorn --preload) el
+    # hijo no reutiliza los sockets del padre
+    key = (alias, os.getpid())
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(
+                    int(options['POOL_SIZE']), float(options['POOL_TIMEOUT']), float(options['POOL_CHECK_AFTER']),
+                )
+    return pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def pool_options(self):
+        options = self.settings_dict['OPTIONS']
+        return {name: options.get(name, default) for name, default in POOL_OPTIONS.items()}
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for name in POOL_OPTIONS:
+            params.pop(name, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = get_pool(self.alias, self.pool_options())
+        connection = pool.get(lambda: super(DatabaseWrapper, self).get_new_connection(conn_params))
+        # En una conexión reutilizada el nivel de aislamiento no se ha leído
+        # de OPTIONS (lo hace get_new_connection al crearla)
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                get_pool(self.alias, self.pool_options()).put(self.connection)
@@ -0,0 +1,91 @@
+import contextvars
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+# Lecturas de la API en la réplica y escrituras en el primario. Solo van a la
+# réplica las acciones de solo lectura de los ViewSets con ReplicaReadsMixin
+# (replica_actions); el resto de la petición, y cualquier lectura posterior a
+# una escritura, usa el primario. Después de escribir, las lecturas del mismo
+# usuario siguen en el primario durante DATABASE_REPLICA_STICKY_SECONDS para
+# que vea sus cambios aunque la réplica vaya con retraso.
+STICKY_KEY = 'kf:db-primary:%s'
+
+
+class RoutingState:
+    def __init__(self):
+        self.replica = False
+        self.wrote = False
+
+
+_state = contextvars.ContextVar('kanbanflow_db_routing', default=None)
+
+
+def replica_enabled():
+    return settings.DATABASE_REPLICA_ALIAS in settings.DATABASES
+
+
+def reading_from_replica():
+    state = _state.get()
+    return state is not None and state.replica and not state.wrote
+
+
+def _sticky():
+    return caches[settings.API_CACHE_VERSION_ALIAS]
+
+
+def is_sticky(user):
+    return user is not None and user.is_authenticated and bool(_sticky().get(STICKY_KEY % user.pk))
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return settings.DATABASE_REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        # Explícito: si no, Django escribiría en la base de datos de la que
+        # se leyó la instancia
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica se alimenta del primario
+        return db != settings.DATABASE_REPLICA_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_enabled():
+            return self.get_response(request)
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            return self.get_response(request)
+        finally:
+            _state.reset(token)
+            # DRF deja en la petición de Django el usuario autenticado
+            user = getattr(request, 'user', None)
+            if state.wrote and user is not None and user.is_authenticated:
+                _sticky().set(STICKY_KEY % user.pk, True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+
+class ReplicaReadsMixin:
+    replica_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        state = _state.get()
+        if state is not None and request.method in SAFE_METHODS and self.action in self.replica_actions:
+            state.replica = not is_sticky(request.user)
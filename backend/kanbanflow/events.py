@@ -0,0 +1,198 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+# Feed de cambios por proyecto. Cada evento recibe un número de secuencia
+# creciente dentro de su proyecto; los clientes reanudan desde el último que
+# vieron (Last-Event-ID). Si ese punto ya no está en el historial se les envía
+# un "reset" para que recarguen el tablero completo.
+
+
+class InProcessBroker:
+    # Solo ve los eventos publicados en este proceso: útil con un único
+    # worker (o un servidor ASGI de un proceso) y en desarrollo.
+    def __init__(self, backlog=None, poll_interval=0.5):
+        self.backlog = backlog or settings.EVENT_BACKLOG_SIZE
+        self.poll_interval = poll_interval
+        self._condition = threading.Condition()
+        self._events = {}
+        self._seq = {}
+
+    def publish(self, project_id, event):
+        with self._condition:
+            seq = self._seq.get(project_id, 0) + 1
+            self._seq[project_id] = seq
+            self._events.setdefault(project_id, deque(maxlen=self.backlog)).append((seq, event))
+            self._condition.notify_all()
+        return seq
+
+    def latest(self, project_id):
+        return self._seq.get(project_id, 0)
+
+    def read(self, project_id, after):
+        with self._condition:
+            return self._read(project_id, after)
+
+    def _read(self, project_id, after):
+        latest = self._seq.get(project_id, 0)
+        if after >= latest:
+            return [], after > latest
+        events = self._events.get(project_id, ())
+        if not events or events[0][0] > after + 1:
+            return [], True
+        return [(seq, event) for seq, event in events if seq > after], False
+
+    def wait(self, project_id, after, timeout):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                events, reset = self._read(project_id, after)
+                remaining = deadline - time.monotonic()
+                if events or reset or remaining <= 0:
+                    return events, reset
+                self._condition.wait(remaining)
+
+
+class CacheBroker:
+    # Historial compartido en la caché 'shared' (Redis en producción): la
+    # secuencia se obtiene con INCR y los workers consultan periódicamente.
+    SEQ_KEY = 'kf:ev:seq:%s'
+    EVENT_KEY = 'kf:ev:%s:%s'
+
+    def __init__(self, backlog=None, poll_interval=0.5):
+        self.backlog = backlog or settings.EVENT_BACKLOG_SIZE
+        self.poll_interval = poll_interval
+
+    @property
+    def cache(self):
+        return caches['shared']
+
+    def publish(self, project_id, event):
+        key = self.SEQ_KEY % project_id
+        self.cache.add(key, 0, timeout=None)
+        seq = self.cache.incr(key)
+        self.cache.set(self.EVENT_KEY % (project_id, seq), event, settings.EVENT_BACKLOG_SECONDS)
+        return seq
+
+    def latest(self, project_id):
+        return self.cache.get(self.SEQ_KEY % project_id, 0)
+
+    def read(self, project_id, after):
+        latest = self.latest(project_id)
+        if after >= latest:
+            return [], after > latest
+        if latest - after > self.backlog:
+            return [], True
+        seqs = range(after + 1, latest + 1)
+        found = self.cache.get_many([self.EVENT_KEY % (project_id, seq) for seq in seqs])
+        events = []
+        for seq in seqs:
+            event = found.get(self.EVENT_KEY % (project_id, seq))
+            if event is None:
+                # Si falta el primero el historial expiró (o, muy raramente,
+                # aún se está escribiendo: el cliente solo recargará de más).
+                # Un hueco posterior se vuelve a leer en la siguiente consulta.
+                if not events:
+                    return [], True
+                break
+            events.append((seq, event))
+        return events, False
+
+    def wait(self, project_id, after, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            events, reset = self.read(project_id, after)
+            if events or reset or time.monotonic() >= deadline:
+                return events, reset
+            time.sleep(self.poll_interval)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.EVENT_BROKER)()
+    return _broker
+
+
+def publish_on_commit(project_id, event):
+    transaction.on_commit(lambda: get_broker().publish(project_id, event))
+
+
+def format_event(seq, event):
+    data = json.dumps(event, separators=(',', ':'), default=str)
+    return f'id: {seq}\nevent: {event["type"]}\ndata: {data}\n\n'
+
+
+def _start(broker, project_id, last_event_id):
+    try:
+        after = int(last_event_id)
+    except (TypeError, ValueError):
+        after = None
+    if after is None:
+        after = broker.latest(project_id)
+    return after, f'retry: {settings.EVENT_STREAM_RETRY_MS}\n\n'
+
+
+def _chunks(broker, project_id, after, events, reset):
+    chunks = []
+    if reset:
+        after = broker.latest(project_id)
+        chunks.append(format_event(after, {'type': 'reset', 'project': project_id}))
+    for seq, event in events:
+        chunks.append(format_event(seq, event))
+        after = seq
+    if not chunks:
+        chunks.append(': ping\n\n')
+    return after, chunks
+
+
+def event_stream(project_id, last_event_id=None):
+    # Versión síncrona (WSGI): ocupa un worker mientras dura, por eso se
+    # corta a los EVENT_STREAM_MAX_SECONDS y EventSource reconecta solo.
+    broker = get_broker()
+    after, head = _start(broker, project_id, last_event_id)
+    yield head
+    deadline = time.monotonic() + settings.EVENT_STREAM_MAX_SECONDS
+    while time.monotonic() < deadline:
+        events, reset = broker.wait(project_id, after, settings.EVENT_STREAM_HEARTBEAT)
+        after, chunks = _chunks(broker, project_id, after, events, reset)
+        yield ''.join(chunks)
+
+
+async def _await_events(broker, read, project_id, after, timeout):
+    # broker.wait bloquearía un hilo del ejecutor durante toda la espera:
+    # aquí solo cada lectura pasa por un hilo y la pausa es asyncio.sleep
+    deadline = time.monotonic() + timeout
+    while True:
+        events, reset = await read(project_id, after)
+        if events or reset or time.monotonic() >= deadline:
+            return events, reset
+        await asyncio.sleep(broker.poll_interval)
+
+
+async def aevent_stream(project_id, last_event_id=None):
+    # Versión asíncrona (ASGI): no ocupa ningún hilo mientras espera
+    from asgiref.sync import sync_to_async
+
+    broker = get_broker()
+    read = sync_to_async(broker.read, thread_sensitive=False)
+    after, head = await sync_to_async(_start, thread_sensitive=False)(broker, project_id, last_event_id)
+    yield head
+    deadline = time.monotonic() + settings.EVENT_STREAM_MAX_SECONDS
+    while time.monotonic() < deadline:
+        events, reset = await _await_events(broker, read, project_id, after, settings.EVENT_STREAM_HEARTBEAT)
+        after, chunks = _chunks(broker, project_id, after, events, reset)
+        yield ''.join(chunks)
@@ -0,0 +1,121 @@
+import json
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from kanbanflow.metrics import stage
+from kanbanflow.serializers import requested_fields
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Ruta rápida de solo lectura para los listados: values_list() y conversores
+# precompilados en lugar de un Serializer por fila. La salida tiene que ser
+# idéntica byte a byte a la del serializer + JSONRenderer (lo comprueba
+# manage.py bench_serializers).
+
+
+def datetime_converter():
+    # DateTimeField.to_representation de DRF con la zona horaria activa
+    tz = timezone.get_current_timezone()
+
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+class FastRows:
+    # fields: (nombre, lookup, fábrica de conversor). Un lookup None deja el
+    # campo a None para rellenarlo después (relaciones many-to-many).
+    def __init__(self, *fields):
+        self.fields = fields
+
+    def _selected(self, names):
+        return [field for field in self.fields if names is None or field[0] in names]
+
+    def _lookups(self, names, extra):
+        lookups = [lookup for _, lookup, _ in self._selected(names) if lookup]
+        return lookups + [lookup for lookup in extra if lookup not in lookups]
+
+    def queryset(self, queryset, names=None, extra=()):
+        # extra: columnas necesarias aunque no se devuelvan (p. ej. las de
+        # ordenación para el cursor)
+        return queryset.prefetch_related(None).values_list(*self._lookups(names, extra), named=True)
+
+    def rows(self, values, names=None, extra=()):
+        with stage('serialize'):
+            return self._rows(values, names, extra)
+
+    def _rows(self, values, names, extra):
+        fields = self._selected(names)
+        positions = {lookup: i for i, lookup in enumerate(self._lookups(names, extra))}
+        keys = [name for name, _, _ in fields]
+        slots = [positions.get(lookup) for _, lookup, _ in fields]
+        converters = [
+            (positions[lookup], factory()) for _, lookup, factory in fields if lookup and factory
+        ]
+        aligned = slots == list(range(len(slots)))
+        rows = []
+        for row in values:
+            if converters:
+                row = list(row)
+                for i, convert in converters:
+                    if row[i] is not None:
+                        row[i] = convert(row[i])
+            if not aligned:
+                row = [row[i] if i is not None else None for i in slots]
+            rows.append(dict(zip(keys, row)))
+        return rows
+
+
+def dumps(data):
+    # Mismo resultado que JSONRenderer con la configuración por defecto de
+    # DRF (UNICODE_JSON, COMPACT_JSON y STRICT_JSON). Solo admite tipos
+    # nativos de JSON.
+    content = None
+    if orjson is not None:
+        try:
+            content = orjson.dumps(data)
+        except TypeError:
+            pass
+    if content is None:
+        content = json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+    return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def wants_fast_path(request):
+    if not settings.API_FAST_SERIALIZATION or request.method not in ('GET', 'HEAD'):
+        return False
+    renderer = getattr(request, 'accepted_renderer', None)
+    return getattr(renderer, 'format', None) == 'json' and 'indent' not in (request.accepted_media_type or '')
+
+
+def json_response(data, status=200):
+    with stage('render'):
+        content = dumps(data)
+    return HttpResponse(content, status=status, content_type='application/json')
+
+
+class FastListMixin:
+    # Para ViewSets: list() usa fast_rows si el cliente pide JSON
+    fast_rows = None
+
+    def complete_fast_rows(self, rows):
+        return rows
+
+    def list(self, request, *args, **kwargs):
+        if self.fast_rows is None or not wants_fast_path(request):
+            return super().list(request, *args, **kwargs)
+        names = requested_fields(request)
+        extra = [field.lstrip('-') for field in getattr(self.paginator, 'ordering', ())]
+        queryset = self.fast_rows.queryset(self.filter_queryset(self.get_queryset()), names, extra)
+        page = self.paginate_queryset(queryset)
+        rows = self.complete_fast_rows(self.fast_rows.rows(queryset if page is None else page, names, extra))
+        if page is None:
+            return json_response(rows)
+        return json_response(self.get_paginated_response(rows).data)
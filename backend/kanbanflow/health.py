@@ -0,0 +1,62 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.http import HttpResponse, JsonResponse
+
+# Sondas del balanceador / orquestador. Se responden en el primer middleware:
+# sin validar Host (las sondas llegan por IP), sin sesión ni autenticación y
+# fuera de las métricas.
+#   /healthz  el proceso está vivo; sin E/S
+#   /readyz   la base de datos responde; el resultado se reutiliza durante
+#             READINESS_CACHE_SECONDS para que las sondas no carguen la BD
+_ready = {'checked_at': None, 'ok': False}
+_ready_lock = threading.Lock()
+
+
+def check_database():
+    connection = connections[DEFAULT_DB_ALIAS]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        return True
+    except DatabaseError:
+        # Una conexión rota no debe quedarse para la siguiente comprobación
+        connection.close()
+        return False
+
+
+def readiness():
+    now = time.monotonic()
+    with _ready_lock:
+        fresh = _ready['checked_at'] is not None and now - _ready['checked_at'] < settings.READINESS_CACHE_SECONDS
+        if not fresh:
+            _ready['ok'] = check_database()
+            _ready['checked_at'] = now
+        return _ready['ok']
+
+
+def healthz(request):
+    return HttpResponse('ok', content_type='text/plain')
+
+
+def readyz(request):
+    if readiness():
+        return JsonResponse({'status': 'ok'})
+    return JsonResponse({'status': 'error', 'error': 'Base de datos no disponible'}, status=503)
+
+
+PROBES = {'/healthz': healthz, '/readyz': readyz}
+
+
+class HealthCheckMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        probe = PROBES.get(request.path_info.rstrip('/'))
+        if probe is None or request.method not in ('GET', 'HEAD'):
+            return self.get_response(request)
+        return probe(request)
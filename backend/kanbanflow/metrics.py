@@ -0,0 +1,245 @@
+import contextvars
+import heapq
+import hmac
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from itertools import count
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+
+logger = logging.getLogger('kanbanflow.slow')
+
+# Métricas por petición: latencia por vista, número y tiempo de consultas SQL,
+# tiempo de serialización y renderizado y tamaño de la respuesta. Se
+# acumulan en memoria del proceso (cada worker expone las suyas) y se sirven
+# en formato de texto de Prometheus en /api/metrics/.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            series = sorted((labels, [list(buckets), total, n]) for labels, (buckets, total, n) in self.series.items())
+        for labels, (buckets, total, n) in series:
+            base = _labels(self.labels, labels)
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, buckets):
+                cumulative += bucket
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {n}')
+            lines.append(f'{self.name}_sum{{{base}}} {total}')
+            lines.append(f'{self.name}_count{{{base}}} {n}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels):
+        with self.lock:
+            self.series[labels] = self.series.get(labels, 0) + 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self.lock:
+            series = sorted(self.series.items())
+        lines += [f'{self.name}{{{_labels(self.labels, labels)}}} {value}' for labels, value in series]
+        return lines
+
+
+class Gauge:
+    # Valor que se calcula al servir /api/metrics/: collect() devuelve
+    # {etiquetas: valor}
+    def __init__(self, name, help_text, labels, collect):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.collect = collect
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} gauge']
+        try:
+            series = sorted(self.collect().items())
+        except Exception:
+            logging.getLogger(__name__).exception('No se pudo calcular %s', self.name)
+            return lines
+        lines += [f'{self.name}{{{_labels(self.labels, labels)}}} {value}' for labels, value in series]
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+REQUEST_DURATION = Histogram(
+    'kanbanflow_request_duration_seconds', 'Duración de las peticiones',
+    ('view', 'method', 'status'), LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram('kanbanflow_db_queries', 'Consultas SQL por petición', ('view',), QUERY_BUCKETS)
+DB_DURATION = Histogram('kanbanflow_db_duration_seconds', 'Tiempo en SQL por petición', ('view',), LATENCY_BUCKETS)
+STAGE_DURATION = Histogram(
+    'kanbanflow_stage_duration_seconds', 'Tiempo de serialización y renderizado por petición (sin SQL)',
+    ('view', 'stage'), LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram('kanbanflow_response_size_bytes', 'Tamaño de las respuestas', ('view',), SIZE_BUCKETS)
+SLOW_REQUESTS = Counter('kanbanflow_slow_requests_total', 'Peticiones por encima de METRICS_SLOW_REQUEST_MS', ('view',))
+REGISTRY = [REQUEST_DURATION, DB_QUERIES, DB_DURATION, STAGE_DURATION, RESPONSE_SIZE, SLOW_REQUESTS]
+
+
+def register(metric):
+    # Métricas de las apps (se registran al importarse en AppConfig.ready)
+    REGISTRY.append(metric)
+    return metric
+
+
+class RequestStats:
+    def __init__(self, keep_sql):
+        self.queries = 0
+        self.db_time = 0.0
+        self.stages = {}
+        self.keep_sql = keep_sql
+        self.slowest = []
+        self.order = count()
+
+    def execute(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += elapsed
+            if self.keep_sql:
+                # Solo las N consultas más lentas
+                entry = (elapsed, next(self.order), sql)
+                if len(self.slowest) < self.keep_sql:
+                    heapq.heappush(self.slowest, entry)
+                else:
+                    heapq.heappushpop(self.slowest, entry)
+
+
+_current = contextvars.ContextVar('kanbanflow_request_stats', default=None)
+
+
+@contextmanager
+def stage(name):
+    # Acumula el tiempo de una fase de la petición descontando el SQL que se
+    # ejecute dentro (p. ej. un queryset que se evalúa al serializar)
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    start, db_start = time.perf_counter(), stats.db_time
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start - (stats.db_time - db_start)
+        stats.stages[name] = stats.stages.get(name, 0.0) + elapsed
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else 'other'
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        stats = RequestStats(settings.METRICS_SLOW_SQL_COUNT)
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(stats.execute))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - start
+        self.record(request, response, stats, elapsed)
+        return response
+
+    def record(self, request, response, stats, elapsed):
+        view = view_label(request)
+        REQUEST_DURATION.observe(elapsed, view, request.method, response.status_code)
+        DB_QUERIES.observe(stats.queries, view)
+        DB_DURATION.observe(stats.db_time, view)
+        for name, seconds in stats.stages.items():
+            STAGE_DURATION.observe(seconds, view, name)
+        # En las respuestas en streaming el cuerpo aún no existe
+        size = None if response.streaming else len(response.content)
+        if size is not None:
+            RESPONSE_SIZE.observe(size, view)
+
+        if elapsed * 1000 < settings.METRICS_SLOW_REQUEST_MS:
+            return
+        SLOW_REQUESTS.inc(view)
+        if random.random() >= settings.METRICS_SLOW_SAMPLE_RATE:
+            return
+        stages = ', '.join(f'{name} {seconds * 1000:.0f} ms' for name, seconds in sorted(stats.stages.items()))
+        lines = [
+            f'Petición lenta {request.method} {request.get_full_path()} ({view}) -> {response.status_code} '
+            f'en {elapsed * 1000:.0f} ms: {stats.queries} consultas en {stats.db_time * 1000:.0f} ms'
+            + (f', {stages}' if stages else '') + (f', {size} bytes' if size is not None else '')
+        ]
+        for seconds, _, sql in sorted(stats.slowest, reverse=True):
+            lines.append(f'  {seconds * 1000:8.1f} ms  {sql}')
+        logger.warning('\n'.join(lines))
+
+
+def render_metrics():
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    # Solo con METRICS_TOKEN definido; Prometheus lo envía como bearer_token
+    token = settings.METRICS_TOKEN
+    if not token:
+        return JsonResponse({'error': 'Endpoint no encontrado', 'path': request.path}, status=404)
+    if not hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()):
+        return JsonResponse({'error': 'No autorizado'}, status=401)
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,22 @@
+def accepted_encodings(request, offered):
+    # Codificaciones de offered que admite Accept-Encoding, de mayor a menor
+    # q (a igual q, en el orden de offered). q=0 las rechaza y * cubre las
+    # que no se nombran
+    weights = {}
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, *params = part.split(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    default = weights.get('*', 0.0)
+    accepted = [encoding for encoding in offered if weights.get(encoding, default) > 0]
+    return sorted(accepted, key=lambda encoding: -weights.get(encoding, default))
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from kanbanflow.metrics import stage
+
+
+class TimedJSONRenderer(JSONRenderer):
+    # JSONRenderer que anota el tiempo de renderizado en kanbanflow.metrics
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with stage('render'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class EventStreamRenderer(BaseRenderer):
+    # Permite que la negociación de contenido acepte EventSource
+    # (Accept: text/event-stream); el cuerpo lo genera la vista.
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, str)):
+            return data
+        return f'event: error\ndata: {json.dumps(data)}\n\n'
+
+
+class NDJSONRenderer(BaseRenderer):
+    # Exportaciones: el cuerpo lo genera la vista en streaming; aquí solo se
+    # representan los errores.
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, str)):
+            return data
+        return json.dumps(data, ensure_ascii=False) + '\n'
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, str)):
+            return data
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if isinstance(data, dict):
+            writer.writerow(data.keys())
+            writer.writerow(data.values())
+        return buffer.getvalue()
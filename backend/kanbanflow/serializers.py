@@ -0,0 +1,50 @@
+from rest_framework import serializers
+from kanbanflow.metrics import stage
+
+# Sparse fieldsets: ?fields=id,title,status limita las columnas devueltas
+# en las peticiones de lectura.
+def requested_fields(request):
+    if request is None or request.method != 'GET':
+        return None
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()} | {'id'}
+
+
+def defer_unrequested(queryset, request, deferrable):
+    fields = requested_fields(request)
+    if fields is None:
+        return queryset
+    deferred = [name for name in deferrable if name not in fields]
+    return queryset.defer(*deferred) if deferred else queryset
+
+
+class SparseFieldsetMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with stage('serialize'):
+            return super().data
+
+
+class TimedSerializerMixin:
+    # Tiempo de .data (también con many=True) para kanbanflow.metrics
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = cls.__dict__.get('Meta')
+        if meta is not None and not hasattr(meta, 'list_serializer_class'):
+            meta.list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with stage('serialize'):
+            return super().data
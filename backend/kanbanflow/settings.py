@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from decouple import config
 
@@ -27,9 +28,13 @@ INSTALLED_APPS = [
     'kanbanflow.apps.authentication',
     'kanbanflow.apps.projects',
     'kanbanflow.apps.tasks',
+    'kanbanflow.apps.jobs',
 ]
 
 MIDDLEWARE = [
+    'kanbanflow.health.HealthCheckMiddleware',
+    'kanbanflow.metrics.MetricsMiddleware',
+    'kanbanflow.db_router.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'kanbanflow.middleware.DisableCSRFMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -60,18 +65,66 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'kanbanflow.wsgi.application'
+ASGI_APPLICATION = 'kanbanflow.asgi.application'
 
-# Base de datos PostgreSQL
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.environ.get('DB_NAME'),
-        'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASSWORD'),
-        'HOST': os.environ.get('DB_HOST'),
-        'PORT': os.environ.get('DB_PORT'),
+# Base de datos PostgreSQL (DB_ENGINE=sqlite para probar en local: DB_NAME y
+# DB_REPLICA_NAME son rutas de ficheros). Las conexiones se reutilizan
+# durante DB_CONN_MAX_AGE segundos y se comprueban antes de cada petición.
+# Con DB_POOL_SIZE > 0 cada proceso mantiene un pool
+# (kanbanflow.db_backends.pooled_postgresql) y la conexión vuelve a él al
+# acabar la petición. Con DB_REPLICA_HOST las lecturas de la API van a la
+# réplica (kanbanflow.db_router).
+DB_ENGINE = os.environ.get('DB_ENGINE', 'postgresql')
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '0'))
+
+if DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME') or os.path.join(BASE_DIR, 'db.sqlite3'),
+        }
     }
-}
+    DB_REPLICA = {'NAME': os.environ['DB_REPLICA_NAME']} if os.environ.get('DB_REPLICA_NAME') else None
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME'),
+            'USER': os.environ.get('DB_USER'),
+            'PASSWORD': os.environ.get('DB_PASSWORD'),
+            'HOST': os.environ.get('DB_HOST'),
+            'PORT': os.environ.get('DB_PORT'),
+        }
+    }
+    if DB_POOL_SIZE > 0:
+        DATABASES['default'].update({
+            'ENGINE': 'kanbanflow.db_backends.pooled_postgresql',
+            'OPTIONS': {
+                'POOL_SIZE': DB_POOL_SIZE,
+                'POOL_TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+                'POOL_CHECK_AFTER': float(os.environ.get('DB_POOL_CHECK_AFTER', '30')),
+            },
+        })
+    DB_REPLICA = {
+        'NAME': os.environ.get('DB_REPLICA_NAME', os.environ.get('DB_NAME')),
+        'USER': os.environ.get('DB_REPLICA_USER', os.environ.get('DB_USER')),
+        'PASSWORD': os.environ.get('DB_REPLICA_PASSWORD', os.environ.get('DB_PASSWORD')),
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', os.environ.get('DB_PORT')),
+    } if os.environ.get('DB_REPLICA_HOST') else None
+
+# Con pool la conexión se devuelve al pool en cada petición
+DATABASES['default'].update(CONN_MAX_AGE=0 if DB_POOL_SIZE > 0 else DB_CONN_MAX_AGE, CONN_HEALTH_CHECKS=True)
+
+DATABASE_REPLICA_ALIAS = 'replica'
+# Lecturas de un usuario en el primario tras escribir (segundos)
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', '5'))
+# Respuestas leídas de la réplica en la caché versionada (segundos)
+DATABASE_REPLICA_CACHE_TIMEOUT = 10
+if DB_REPLICA:
+    DATABASES[DATABASE_REPLICA_ALIAS] = {**DATABASES['default'], **DB_REPLICA, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_ROUTERS = ['kanbanflow.db_router.PrimaryReplicaRouter']
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -90,32 +143,51 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Configuración para servir React
+SPA_BUILD_DIR = os.path.join(BASE_DIR, 'static-files')
 STATICFILES_DIRS = [
-    os.path.join(BASE_DIR, 'static-files'),
-    os.path.join(BASE_DIR, 'static-files', 'static'),
+    SPA_BUILD_DIR,
+    os.path.join(SPA_BUILD_DIR, 'static'),
 ]
 
 # Templates para React
-TEMPLATES[0]['DIRS'] = [os.path.join(BASE_DIR, 'static-files')]
+TEMPLATES[0]['DIRS'] = [SPA_BUILD_DIR]
 
-# Configuración adicional para WhiteNoise con React
+# Configuración adicional para WhiteNoise con React. El build se sirve desde
+# la raíz (favicon, manifest, /static/js/...) con las variantes .gz/.br que
+# genera el CI (python -m whitenoise.compress); los ficheros se indexan al
+# arrancar salvo en DEBUG.
 WHITENOISE_USE_FINDERS = True
-WHITENOISE_AUTOREFRESH = True
+WHITENOISE_AUTOREFRESH = DEBUG
+WHITENOISE_ROOT = SPA_BUILD_DIR if os.path.isdir(SPA_BUILD_DIR) else None
+# Assets con hash de webpack (8+ hex) o de Django (12): caché de un año
+WHITENOISE_IMMUTABLE_FILE_TEST = r'^/static/.+\.[0-9a-f]{8,}\.'
+# index.html se guarda en memoria; cada cuánto se mira si cambió en disco
+SPA_INDEX_RECHECK_SECONDS = 0 if DEBUG else 5
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'kanbanflow.apps.authentication.authentication.BearerTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
-        'rest_framework.permissions.AllowAny',
+        'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'kanbanflow.renderers.TimedJSONRenderer',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'kanbanflow.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
 
+# Tokens de acceso firmados, sin estado (segundos) y tokens de refresco
+# rotatorios guardados en la base de datos
+ACCESS_TOKEN_LIFETIME = int(os.environ.get('ACCESS_TOKEN_LIFETIME', '300'))
+REFRESH_TOKEN_LIFETIME = int(os.environ.get('REFRESH_TOKEN_LIFETIME', str(14 * 24 * 3600)))
+# Conjunto de proyectos visibles por usuario (kanbanflow.apps.projects.permissions)
+PROJECT_MEMBERSHIP_CACHE_TIMEOUT = 600
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
@@ -123,21 +195,136 @@ CORS_ALLOW_CREDENTIALS = True
 USE_TZ = True
 USE_I18N = False  # Desactivar si no necesitas internacionalización
 
-# Cache en memoria para sesiones
-SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
-SESSION_CACHE_ALIAS = 'default'
+# Caché compartida entre workers. Con CACHE_URL (redis://...) se usa Redis;
+# sin servidor de caché se recurre a ficheros (CACHE_FALLBACK=file), a la base
+# de datos (CACHE_FALLBACK=db, requiere createcachetable) o a memoria local
+# (CACHE_FALLBACK=locmem, solo para tests / un único proceso).
+CACHE_URL = os.environ.get('CACHE_URL', '')
+CACHE_FALLBACK = os.environ.get('CACHE_FALLBACK', 'file')
+CACHE_L1_TIMEOUT = int(os.environ.get('CACHE_L1_TIMEOUT', '0'))  # > 0 activa la caché de dos niveles
 
-# Cache simple en memoria
-CACHES = {
-    'default': {
+if CACHE_URL:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    }
+elif CACHE_FALLBACK == 'db':
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'kanbanflow_cache',
+    }
+elif CACHE_FALLBACK == 'locmem':
+    SHARED_CACHE = {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+        'LOCATION': 'kanbanflow-shared',
+    }
+else:
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'kanbanflow-cache')),
+    }
+SHARED_CACHE.update({
+    'TIMEOUT': 300,
+    'KEY_PREFIX': 'kanbanflow',
+    'OPTIONS': {'MAX_ENTRIES': 1000} if not CACHE_URL else {},
+})
+
+CACHES = {
+    'default': SHARED_CACHE,
+    'shared': SHARED_CACHE,
+}
+if CACHE_L1_TIMEOUT > 0:
+    CACHES['default'] = {
+        'BACKEND': 'kanbanflow.cache_backends.TwoTierCache',
+        'LOCATION': 'default',
         'TIMEOUT': 300,
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
-        }
+        'OPTIONS': {'L2': 'shared', 'L1_TIMEOUT': CACHE_L1_TIMEOUT},
     }
+
+# Sesiones visibles desde cualquier worker: en Redis si hay servidor de
+# caché, si no en la base de datos con la caché compartida delante.
+SESSION_ENGINE = (
+    'django.contrib.sessions.backends.cache' if CACHE_URL
+    else 'django.contrib.sessions.backends.cached_db'
+)
+SESSION_CACHE_ALIAS = 'shared'
+
+# Caché versionada de respuestas de la API (kanbanflow.cache)
+API_CACHE_TIMEOUT = 300
+API_CACHE_VERSION_ALIAS = 'shared'  # los contadores de versión siempre en L2
+# Las versiones se incrementan con incr() solo en Redis, Memcached o LocMem,
+# donde es atómico; con FileBased o la base de datos (sin CACHE_URL) cada
+# invalidación escribe una versión nueva aleatoria (kanbanflow.cache.bump_version)
+API_CACHE_IGNORED_PARAMS = ['_t']
+# Listados serializados con values_list() en lugar de DRF (kanbanflow.fastpath)
+API_FAST_SERIALIZATION = os.environ.get('API_FAST_SERIALIZATION', 'True').lower() == 'true'
+
+# Feed de cambios en tiempo real (kanbanflow.events). Con varios workers el
+# historial debe vivir en la caché compartida.
+EVENT_BROKER = os.environ.get('EVENT_BROKER', (
+    'kanbanflow.events.CacheBroker' if CACHE_URL else 'kanbanflow.events.InProcessBroker'
+))
+EVENT_BACKLOG_SIZE = 500
+EVENT_BACKLOG_SECONDS = 600
+EVENT_STREAM_HEARTBEAT = 15
+EVENT_STREAM_MAX_SECONDS = 55
+EVENT_STREAM_RETRY_MS = 3000
+
+# Sincronización incremental (GET /api/tasks/changes/)
+TASK_CHANGES_MAX_ROWS = 1000
+TASK_CHANGES_OVERLAP_SECONDS = 5
+TASK_TOMBSTONE_RETENTION_DAYS = 30
+
+# Filas leídas por bloque del cursor de servidor en /api/projects/<id>/export/
+TASK_EXPORT_CHUNK_SIZE = 2000
+
+# Importación de tareas (POST /api/tasks/imports/, manage.py import_tasks).
+# Los ficheros subidos se guardan en TASK_IMPORT_STORAGE hasta que el worker
+# los procesa: si el worker corre en otra máquina (JOBS_WORKER=False) tiene
+# que ser compartido, TASK_IMPORT_DIR en un volumen común o cualquier backend
+# de almacenamiento de Django (p. ej. el de Azure Blob de django-storages).
+TASK_IMPORT_DIR = os.environ.get('TASK_IMPORT_DIR', os.path.join(tempfile.gettempdir(), 'kanbanflow-imports'))
+TASK_IMPORT_STORAGE = {
+    'BACKEND': os.environ.get('TASK_IMPORT_STORAGE', 'django.core.files.storage.FileSystemStorage'),
+    'OPTIONS': {} if 'TASK_IMPORT_STORAGE' in os.environ else {'location': TASK_IMPORT_DIR},
 }
+TASK_IMPORT_BATCH_SIZE = 1000
+TASK_IMPORT_MAX_BATCH_SIZE = 10000
+TASK_IMPORT_USE_COPY = True  # solo en PostgreSQL
+
+# Archivo de tareas completadas (manage.py archive_tasks): días sin cambios
+# antes de archivarlas y tareas por transacción
+TASK_ARCHIVE_AFTER_DAYS = int(os.environ.get('TASK_ARCHIVE_AFTER_DAYS', '90'))
+TASK_ARCHIVE_BATCH_SIZE = 1000
+
+# Longitud a partir de la cual se reordena en segundo plano una columna del tablero
+TASK_RANK_REBALANCE_LENGTH = 12
+
+# Segundos que se acumulan los incrementos de estadísticas de un proyecto y
+# día antes de aplicarlos (un UPDATE por tanda)
+TASK_STATS_FLUSH_SECONDS = 10
+
+# Cola de trabajos en segundo plano (manage.py run_worker). Con JOBS_EAGER se
+# ejecutan en el propio proceso al hacer commit, sin worker (desarrollo).
+JOBS_EAGER = os.environ.get('JOBS_EAGER', 'False').lower() == 'true'
+JOBS_CONCURRENCY = int(os.environ.get('JOBS_CONCURRENCY', '4'))
+JOBS_POLL_INTERVAL = 1.0
+JOBS_MAX_ATTEMPTS = 5
+JOBS_VISIBILITY_TIMEOUT = 300
+JOBS_RETRY_BACKOFF = 5
+JOBS_RETRY_MAX_BACKOFF = 600
+
+# /readyz reutiliza la comprobación de la base de datos durante estos segundos
+READINESS_CACHE_SECONDS = 5
+
+# Métricas por petición (kanbanflow.metrics). /api/metrics/ solo responde si
+# METRICS_TOKEN está definido (Authorization: Bearer <token>).
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Log de peticiones lentas (logger kanbanflow.slow) con sus consultas más lentas
+METRICS_SLOW_REQUEST_MS = int(os.environ.get('METRICS_SLOW_REQUEST_MS', '500'))
+METRICS_SLOW_SAMPLE_RATE = float(os.environ.get('METRICS_SLOW_SAMPLE_RATE', '1.0'))
+METRICS_SLOW_SQL_COUNT = 5
 
 # Logging optimizado
 LOGGING = {
@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from kanbanflow.negotiation import accepted_encodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# index.html de la SPA en memoria. Se lee una vez (con sus variantes gzip y
+# brotli ya comprimidas) y solo se vuelve a leer si cambia el mtime, que se
+# comprueba como mucho cada SPA_INDEX_RECHECK_SECONDS.
+FALLBACK_CONTENT = b'KanbanFlow - Error loading page'
+
+
+class SPAIndex:
+    def __init__(self, paths):
+        self.paths = paths
+        self.lock = threading.Lock()
+        self.checked_at = 0
+        self.signature = None
+        self.variants = None
+
+    def _stat(self):
+        for path in self.paths:
+            try:
+                return path, os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        return None, None
+
+    def _load(self, path):
+        if path is None:
+            return {'identity': (FALLBACK_CONTENT, '"fallback"')}
+        with open(path, 'rb') as source:
+            content = source.read()
+        etag = hashlib.sha1(content).hexdigest()[:20]
+        # El ETag cambia con la codificación: son representaciones distintas
+        variants = {
+            'identity': (content, f'"{etag}"'),
+            'gzip': (gzip.compress(content, 9, mtime=0), f'"{etag}-gz"'),
+        }
+        if brotli is not None:
+            variants['br'] = (brotli.compress(content), f'"{etag}-br"')
+        return variants
+
+    def get(self):
+        now = time.monotonic()
+        if self.variants is None or now - self.checked_at >= settings.SPA_INDEX_RECHECK_SECONDS:
+            with self.lock:
+                if self.variants is None or now - self.checked_at >= settings.SPA_INDEX_RECHECK_SECONDS:
+                    signature = self._stat()
+                    if signature != self.signature or self.variants is None:
+                        self.variants = self._load(signature[0])
+                        self.signature = signature
+                    self.checked_at = now
+        return self.variants
+
+
+spa_index = SPAIndex([
+    os.path.join(settings.SPA_BUILD_DIR, 'index.html'),
+    os.path.join(settings.BASE_DIR, 'templates', 'index.html'),
+])
+
+
+def _accepted_encoding(request, variants):
+    accepted = accepted_encodings(request, [encoding for encoding in ('br', 'gzip') if encoding in variants])
+    return accepted[0] if accepted else 'identity'
+
+
+def serve_index(request):
+    if os.path.splitext(request.path)[1]:
+        # Un fichero que WhiteNoise no encontró: no se responde con la SPA
+        return HttpResponse('No encontrado', status=404, content_type='text/plain; charset=utf-8')
+    variants = spa_index.get()
+    encoding = _accepted_encoding(request, variants)
+    content, etag = variants[encoding]
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type='text/html; charset=utf-8')
+        response['Content-Length'] = len(content)
+        if encoding != 'identity':
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    # Siempre se revalida: tras un despliegue el índice apunta a otros assets
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def api_not_found(request):
+    return JsonResponse({'error': 'Endpoint no encontrado', 'path': request.path}, status=404)
@@ -0,0 +1,83 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Arranque de una instancia: migrate solo si hay migraciones pendientes, con
+# un lock entre procesos para que migre una sola instancia (las demás
+# esperan y vuelven a comprobar), y precarga de URLs, vistas y serializers
+# antes de que gunicorn cree los workers (preload_app).
+MIGRATION_LOCK_ID = 0x6b616e62  # 'kanb'
+MIGRATION_LOCK_FILE = os.path.join(tempfile.gettempdir(), 'kanbanflow-migrate.lock')
+
+
+def pending_migrations(using=DEFAULT_DB_ALIAS):
+    # Lee django_migrations y el grafo de migraciones; no toca el esquema
+    executor = MigrationExecutor(connections[using])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+@contextmanager
+def migration_lock(using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        # Lock de sesión: se libera también si el proceso muere
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_lock(%s)', [MIGRATION_LOCK_ID])
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [MIGRATION_LOCK_ID])
+        return
+    if fcntl is None:
+        yield
+        return
+    # SQLite: todas las instancias están en la misma máquina
+    with open(MIGRATION_LOCK_FILE, 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def uses_database_cache():
+    return any(cache['BACKEND'].endswith('DatabaseCache') for cache in settings.CACHES.values())
+
+
+def prepare_database(using=DEFAULT_DB_ALIAS):
+    # Devuelve True si ha hecho falta migrar
+    migrated = False
+    if pending_migrations(using):
+        with migration_lock(using):
+            # Otra instancia puede haber migrado mientras se esperaba el lock
+            if pending_migrations(using):
+                call_command('migrate', database=using, interactive=False, verbosity=1)
+                migrated = True
+    if uses_database_cache():
+        call_command('createcachetable', database=using, verbosity=0)
+    return migrated
+
+
+def warm_up():
+    # Importa vistas, serializers y clases de DRF antes del fork para que la
+    # primera petición de cada worker no lo pague; las conexiones abiertas
+    # durante la precarga no deben heredarse
+    from django.urls import get_resolver
+    from rest_framework.settings import api_settings
+
+    get_resolver().url_patterns
+    for name in ('DEFAULT_AUTHENTICATION_CLASSES', 'DEFAULT_PERMISSION_CLASSES',
+                 'DEFAULT_RENDERER_CLASSES', 'DEFAULT_PARSER_CLASSES', 'DEFAULT_PAGINATION_CLASS'):
+        getattr(api_settings, name)
+    connections.close_all()
@@ -1,29 +1,8 @@
 from django.contrib import admin
-from django.urls import path, include
-from django.http import JsonResponse, HttpResponse
-from django.conf import settings
-import os
-
-def serve_react_app(request):
-    try:
-        # Intentar servir React build
-        index_path = os.path.join(settings.BASE_DIR, 'static-files', 'index.html')
-        if os.path.exists(index_path):
-            with open(index_path, 'r', encoding='utf-8') as f:
-                return HttpResponse(f.read(), content_type='text/html')
-    except:
-        pass
-    #prueba
-    try:
-        # Servir template temporal
-        template_path = os.path.join(settings.BASE_DIR, 'templates', 'index.html')
-        if os.path.exists(template_path):
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return HttpResponse(f.read(), content_type='text/html')
-    except:
-        pass
-    
-    return HttpResponse("KanbanFlow - Error loading page")
+from django.urls import path, include, re_path
+from django.http import JsonResponse
+from kanbanflow.metrics import metrics_view
+from kanbanflow.spa import api_not_found, serve_index
 
 def api_status(request):
     return JsonResponse({
@@ -37,30 +16,6 @@ def api_status(request):
         }
     })
 
-def debug_info(request):
-    import sys
-    from django.db import connection
-    
-    try:
-        # Test database connection
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        db_status = "OK"
-    except Exception as e:
-        db_status = f"Error: {str(e)}"
-    
-    return JsonResponse({
-        'python_version': sys.version,
-        'django_version': settings.DEBUG,
-        'database_status': db_status,
-        'installed_apps': settings.INSTALLED_APPS,
-        'environment_vars': {
-            'DB_NAME': os.environ.get('DB_NAME', 'Not set'),
-            'DB_HOST': os.environ.get('DB_HOST', 'Not set'),
-            'DB_USER': os.environ.get('DB_USER', 'Not set'),
-        }
-    })
-
 def test_register(request):
     from django.contrib.auth.models import User
     import traceback
@@ -87,25 +42,20 @@ def test_register(request):
             'traceback': traceback.format_exc()
         })
 
-from django.conf.urls.static import static
-
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api_status, name='api_status'),
-    path('api/debug/', debug_info, name='debug_info'),
+    path('api/metrics/', metrics_view, name='metrics'),
     path('api/test-register/', test_register, name='test_register'),
     path('api/auth/', include('kanbanflow.apps.authentication.urls')),
     path('api/projects/', include('kanbanflow.apps.projects.urls')),
     path('api/tasks/', include('kanbanflow.apps.tasks.urls')),
+    # Cualquier otra ruta de la API es un 404 en JSON, no la SPA
+    re_path(r'^api/', api_not_found, name='api_not_found'),
 ]
 
-# Catch-all pattern para React Router - debe ir al final
-from django.urls import re_path
+# Los ficheros estáticos (assets con hash, favicon, manifest...) los sirve
+# WhiteNoise antes de llegar aquí. Catch-all para React Router, al final.
 urlpatterns += [
-    re_path(r'^.*$', serve_react_app, name='react_app'),
-]
-
-# Servir archivos estáticos de React en producción
-if settings.DEBUG or True:  # Forzar en producción para React
-    urlpatterns += static('/static/', document_root=os.path.join(settings.BASE_DIR, 'static-files', 'static'))
-    urlpatterns += static('/', document_root=os.path.join(settings.BASE_DIR, 'static-files'))
\ No newline at end of file
+    re_path(r'^.*$', serve_index, name='react_app'),
+]
\ No newline at end of file
@@ -2,4 +2,9 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kanbanflow.settings')
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Con preload_app ocurre en el maestro de gunicorn, antes del fork
+from kanbanflow.startup import warm_up  # noqa: E402
+
+warm_up()
@@ -1,13 +1,29 @@
 import os
-import django
-from django.core.management import execute_from_command_line
+import sys
+import time
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kanbanflow.settings')
+
+import django
+
+# Arranque en Azure: migra solo si el esquema no está al día (una instancia
+# cada vez) y, con --serve, sustituye el proceso por gunicorn
+# (gunicorn.conf.py, con precarga de la aplicación).
+start = time.perf_counter()
 django.setup()
 
-# Ejecutar migraciones automáticamente
+from kanbanflow.startup import prepare_database
+
 try:
-    execute_from_command_line(['manage.py', 'migrate'])
-    print("Migraciones ejecutadas correctamente")
+    migrated = prepare_database()
+    print(f"{'Migraciones ejecutadas' if migrated else 'Esquema al día'} en {(time.perf_counter() - start) * 1000:.0f} ms")
 except Exception as e:
-    print(f"Error en migraciones: {e}")
\ No newline at end of file
+    print(f"Error en migraciones: {e}")
+
+if '--serve' in sys.argv:
+    from django.db import connections
+
+    connections.close_all()
+    sys.stdout.flush()
+    os.execvp('gunicorn', ['gunicorn', '-c', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py'),
+                           'kanbanflow.asgi:application'])
@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useCallback, useMemo } from 'react';
 import { DragDropContext, Droppable, Draggable } from 'react-beautiful-dnd';
-import { tasksAPI } from '../services/api';
+import { projectsAPI, projectEventsURL, refreshAccessToken, tasksAPI } from '../services/api';
 
 const TaskCard = React.memo(({ task, index, onClick }) => (
   <Draggable draggableId={task.id.toString()} index={index}>
@@ -38,7 +38,7 @@ const TaskCard = React.memo(({ task, index, onClick }) => (
   </Draggable>
 ));
 
-const Column = React.memo(({ status, column, tasks, onTaskClick }) => (
+const Column = React.memo(({ status, column, tasks, count, hasMore, loadingMore, onLoadMore, onTaskClick }) => (
   <div className={`rounded-xl border-2 ${column.color} p-4 h-full flex flex-col`}>
     <div className={`${column.headerColor} -m-4 mb-4 p-4 rounded-t-xl border-b border-gray-200`}>
       <div className="flex items-center justify-between">
@@ -47,7 +47,7 @@ const Column = React.memo(({ status, column, tasks, onTaskClick }) => (
           {column.title}
         </h3>
         <span className="bg-white px-2 py-1 rounded-full text-xs font-medium text-gray-600">
-          {tasks.length}
+          {count}
         </span>
       </div>
     </div>
@@ -70,8 +70,18 @@ const Column = React.memo(({ status, column, tasks, onTaskClick }) => (
             />
           ))}
           {provided.placeholder}
+
+          {hasMore && (
+            <button
+              onClick={() => onLoadMore(status)}
+              disabled={loadingMore}
+              className="w-full py-2 text-sm font-medium text-gray-600 bg-white bg-opacity-60 rounded-lg hover:bg-opacity-100 transition-colors disabled:opacity-50"
+            >
+              {loadingMore ? 'Cargando...' : `Cargar más (${count - tasks.length})`}
+            </button>
+          )}
           
-          {tasks.length === 0 && (
+          {tasks.length === 0 && !hasMore && (
             <div className="flex items-center justify-center h-32 text-gray-400 text-sm">
               <div className="text-center">
                 <div className="text-2xl mb-2">{column.icon}</div>
@@ -184,8 +194,13 @@ const TaskModal = React.memo(({ task, isOpen, onClose }) => {
   );
 });
 
+const byRank = (a, b) => (a.rank < b.rank ? -1 : a.rank > b.rank ? 1 : a.id - b.id);
+
 const KanbanBoard = ({ projectId }) => {
   const [tasks, setTasks] = useState([]);
+  // Por columna: cursor de la página siguiente y tarjetas aún sin cargar
+  const [pages, setPages] = useState({});
+  const [loadingMore, setLoadingMore] = useState(null);
   const [loading, setLoading] = useState(true);
   const [selectedTask, setSelectedTask] = useState(null);
   const [showTaskModal, setShowTaskModal] = useState(false);
@@ -222,8 +237,12 @@ const KanbanBoard = ({ projectId }) => {
     try {
       setLoading(true);
       setError(null);
-      const response = await tasksAPI.getAll(projectId);
-      setTasks(response.data);
+      const response = await projectsAPI.getBoard(projectId);
+      const { columns: board } = response.data;
+      setTasks(Object.values(board).flatMap(column => column.results));
+      setPages(Object.fromEntries(Object.entries(board).map(([status, column]) => [
+        status, { next: column.next, unloaded: column.count - column.results.length }
+      ])));
     } catch (error) {
       setError('Error cargando tareas');
       console.error('Error cargando tareas:', error);
@@ -232,37 +251,134 @@ const KanbanBoard = ({ projectId }) => {
     }
   }, [projectId]);
 
+  // Página siguiente de una columna (paginación por cursor del endpoint board)
+  const loadMore = useCallback(async (status) => {
+    const page = pages[status];
+    if (!page?.next) return;
+    try {
+      setLoadingMore(status);
+      const response = await projectsAPI.getBoard(projectId, { column: status, cursor: page.next });
+      const column = response.data.columns[status];
+      setTasks(prevTasks => {
+        const known = new Set(prevTasks.map(task => task.id));
+        return [...prevTasks, ...column.results.filter(task => !known.has(task.id))];
+      });
+      setPages(prevPages => ({
+        ...prevPages,
+        [status]: {
+          next: column.next,
+          unloaded: column.next ? Math.max(prevPages[status].unloaded - column.results.length, 0) : 0
+        }
+      }));
+    } catch (error) {
+      setError('Error cargando tareas');
+      console.error('Error cargando tareas:', error);
+    } finally {
+      setLoadingMore(null);
+    }
+  }, [projectId, pages]);
+
+  // Cambios en tiempo real: el servidor envía solo los campos modificados
+  useEffect(() => {
+    if (!projectId || typeof EventSource === 'undefined') return undefined;
+
+    let source = null;
+    let closed = false;
+    const applyUpdate = (event) => {
+      const change = JSON.parse(event.data);
+      setTasks(prevTasks =>
+        prevTasks
+          .map(task => (task.id === change.id ? { ...task, ...change.data } : task))
+          .sort(byRank)
+      );
+    };
+    // Las tarjetas nuevas (o llegadas de otro proyecto) vienen enteras en el evento
+    const applyCreate = (event) => {
+      const change = JSON.parse(event.data);
+      setTasks(prevTasks =>
+        prevTasks.some(task => task.id === change.id)
+          ? prevTasks
+          : [...prevTasks, { id: change.id, ...change.data }].sort(byRank)
+      );
+    };
+    const applyDelete = (event) => {
+      const change = JSON.parse(event.data);
+      setTasks(prevTasks => prevTasks.filter(task => task.id !== change.id));
+    };
+
+    // El token va en la URL: si caduca el servidor responde 401 y el
+    // navegador deja de reintentar, así que se renueva, se reconecta y se
+    // recarga el tablero (la conexión nueva no lleva Last-Event-ID)
+    const connect = () => {
+      source = new EventSource(projectEventsURL(projectId), { withCredentials: true });
+      source.addEventListener('task.created', applyCreate);
+      source.addEventListener('task.updated', applyUpdate);
+      source.addEventListener('task.deleted', applyDelete);
+      ['tasks.imported', 'tasks.archived', 'tasks.restored', 'column.reordered', 'reset'].forEach(type =>
+        source.addEventListener(type, loadTasks)
+      );
+      source.onerror = () => {
+        if (source.readyState !== EventSource.CLOSED || closed) return;
+        refreshAccessToken()
+          .then(() => {
+            if (closed) return;
+            connect();
+            loadTasks();
+          })
+          .catch(() => {});
+      };
+    };
+    connect();
+    return () => {
+      closed = true;
+      source.close();
+    };
+  }, [projectId, loadTasks]);
+
   const onDragEnd = useCallback(async (result) => {
     if (!result.destination) return;
 
-    const { draggableId, destination, source } = result;
+    const { draggableId, destination } = result;
     const taskId = draggableId;
     const newStatus = destination.droppableId;
+    const previousTasks = tasks;
 
-    // Optimistic update
-    setTasks(prevTasks =>
-      prevTasks.map(task =>
-        task.id.toString() === taskId
-          ? { ...task, status: newStatus }
-          : task
-      )
+    // Vecinos en la columna destino: el servidor solo reescribe la tarjeta movida
+    const targetColumn = tasks.filter(
+      task => task.status === newStatus && task.id.toString() !== taskId
     );
+    const after = targetColumn[destination.index - 1];
+    const before = targetColumn[destination.index];
+
+    const moved = tasks.find(task => task.id.toString() === taskId);
+
+    // Optimistic update
+    setTasks(prevTasks => {
+      const rest = prevTasks.filter(task => task.id.toString() !== taskId);
+      const insertAt = before ? rest.indexOf(before) : rest.length;
+      rest.splice(insertAt, 0, { ...moved, status: newStatus });
+      return rest;
+    });
 
     try {
-      await tasksAPI.updateStatus(taskId, newStatus);
+      const { data } = await tasksAPI.updateStatus(taskId, newStatus, {
+        after: after ? after.id : null,
+        before: before ? before.id : null,
+      }, moved.version);
+      setTasks(prevTasks => prevTasks.map(task => (task.id === data.id ? { ...task, ...data } : task)));
     } catch (error) {
+      if (error.response?.status === 409) {
+        // Otro usuario movió o editó la tarjeta antes: se muestra su estado actual
+        const current = error.response.data.task;
+        setTasks(previousTasks.map(task => (task.id === current.id ? current : task)).sort(byRank));
+        return;
+      }
       // Revert on error
-      setTasks(prevTasks =>
-        prevTasks.map(task =>
-          task.id.toString() === taskId
-            ? { ...task, status: source.droppableId }
-            : task
-        )
-      );
+      setTasks(previousTasks);
       setError('Error actualizando estado');
       console.error('Error actualizando estado:', error);
     }
-  }, []);
+  }, [tasks]);
 
   const getTasksByStatus = useCallback((status) => {
     return tasks.filter(task => task.status === status);
@@ -318,15 +434,22 @@ const KanbanBoard = ({ projectId }) => {
     <div className="h-full p-6">
       <DragDropContext onDragEnd={onDragEnd}>
         <div className="grid grid-cols-1 lg:grid-cols-3 gap-6 h-full">
-          {Object.entries(columns).map(([status, column]) => (
-            <Column
-              key={status}
-              status={status}
-              column={column}
-              tasks={getTasksByStatus(status)}
-              onTaskClick={handleTaskClick}
-            />
-          ))}
+          {Object.entries(columns).map(([status, column]) => {
+            const columnTasks = getTasksByStatus(status);
+            return (
+              <Column
+                key={status}
+                status={status}
+                column={column}
+                tasks={columnTasks}
+                count={columnTasks.length + (pages[status]?.unloaded || 0)}
+                hasMore={Boolean(pages[status]?.next)}
+                loadingMore={loadingMore === status}
+                onLoadMore={loadMore}
+                onTaskClick={handleTaskClick}
+              />
+            );
+          })}
         </div>
       </DragDropContext>
 
@@ -1,5 +1,5 @@
 import React, { createContext, useState, useContext, useEffect, useCallback, useMemo } from 'react';
-import { authAPI } from '../services/api';
+import { authAPI, clearTokens, storeTokens } from '../services/api';
 
 const AuthContext = createContext();
 
@@ -32,7 +32,7 @@ export const AuthProvider = ({ children }) => {
       const response = await authAPI.getProfile();
       setUser(response.data);
     } catch (error) {
-      localStorage.removeItem('authToken');
+      clearTokens();
       setUser(null);
       setError('Sesión expirada');
     } finally {
@@ -44,9 +44,9 @@ export const AuthProvider = ({ children }) => {
     try {
       setError(null);
       const response = await authAPI.login(credentials);
-      const { user: userData, token } = response.data;
+      const { user: userData } = response.data;
       
-      localStorage.setItem('authToken', token);
+      storeTokens(response.data);
       setUser(userData);
       return response.data;
     } catch (error) {
@@ -59,9 +59,9 @@ export const AuthProvider = ({ children }) => {
     try {
       setError(null);
       const response = await authAPI.register(userData);
-      const { user: newUser, token } = response.data;
+      const { user: newUser } = response.data;
       
-      localStorage.setItem('authToken', token);
+      storeTokens(response.data);
       setUser(newUser);
       return response.data;
     } catch (error) {
@@ -76,7 +76,7 @@ export const AuthProvider = ({ children }) => {
     } catch (error) {
       console.error('Error al cerrar sesión:', error);
     } finally {
-      localStorage.removeItem('authToken');
+      clearTokens();
       setUser(null);
       setError(null);
     }
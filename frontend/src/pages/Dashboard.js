@@ -4,6 +4,8 @@ import KanbanBoard from '../components/KanbanBoard';
 import Loading from '../components/Loading';
 import { projectsAPI, tasksAPI } from '../services/api';
 
+const PROJECTS_PAGE_SIZE = 200;
+
 const Dashboard = () => {
   const [projects, setProjects] = useState([]);
   const [selectedProject, setSelectedProject] = useState(null);
@@ -23,10 +25,18 @@ const Dashboard = () => {
     try {
       setLoading(true);
       setError(null);
-      const response = await projectsAPI.getAll();
-      setProjects(response.data);
-      if (response.data.length > 0 && !selectedProject) {
-        setSelectedProject(response.data[0]);
+      // El listado va paginado por cursor: se siguen las páginas hasta el final
+      const projects = [];
+      let params = { page_size: PROJECTS_PAGE_SIZE };
+      for (;;) {
+        const { data } = await projectsAPI.getAll(params);
+        projects.push(...data.results);
+        if (!data.next) break;
+        params = { page_size: PROJECTS_PAGE_SIZE, cursor: new URL(data.next).searchParams.get('cursor') };
+      }
+      setProjects(projects);
+      if (projects.length > 0 && !selectedProject) {
+        setSelectedProject(projects[0]);
       }
     } catch (error) {
       setError('Error cargando proyectos');
@@ -73,7 +83,9 @@ const Dashboard = () => {
     projects.map(project => ({
       id: project.id,
       name: project.name,
-      description: project.description
+      description: project.description,
+      completed: project.completed_tasks,
+      total: project.pending_tasks + project.in_progress_tasks + project.completed_tasks
     })), [projects]
   );
 
@@ -148,7 +160,7 @@ const Dashboard = () => {
               >
                 {projectOptions.map(project => (
                   <option key={project.id} value={project.id}>
-                    {project.name}
+                    {project.name}{project.total > 0 ? ` (${project.completed}/${project.total})` : ''}
                   </option>
                 ))}
               </select>
@@ -18,19 +18,54 @@ api.interceptors.request.use((config) => {
   if (token) {
     config.headers.Authorization = `Bearer ${token}`;
   }
-  
-  // Agregar timestamp para evitar cache del navegador
-  config.params = { ...config.params, _t: Date.now() };
   return config;
 });
 
+export const storeTokens = ({ token, refresh }) => {
+  localStorage.setItem('authToken', token);
+  localStorage.setItem('refreshToken', refresh);
+};
+
+export const clearTokens = () => {
+  localStorage.removeItem('authToken');
+  localStorage.removeItem('refreshToken');
+};
+
+// El token de acceso dura pocos minutos: se renueva con el de refresco, que
+// rota en cada uso. Una sola renovación en curso aunque fallen varias peticiones.
+let refreshing = null;
+
+export const refreshAccessToken = () => {
+  if (!refreshing) {
+    const refresh = localStorage.getItem('refreshToken');
+    refreshing = (refresh
+      ? axios.post(`${API_BASE_URL}/auth/refresh/`, { refresh }).then(({ data }) => {
+          storeTokens(data);
+          return data.token;
+        })
+      : Promise.reject(new Error('Sin token de refresco'))
+    ).finally(() => {
+      refreshing = null;
+    });
+  }
+  return refreshing;
+};
+
 // Interceptor para manejar errores y tokens expirados
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
-    if (error.response?.status === 401) {
-      localStorage.removeItem('authToken');
-      window.location.href = '/login';
+  async (error) => {
+    const config = error.config;
+    if (error.response?.status === 401 && config && !config._retried && !config.url.startsWith('/auth/')) {
+      config._retried = true;
+      try {
+        const token = await refreshAccessToken();
+        config.headers.Authorization = `Bearer ${token}`;
+        return api(config);
+      } catch (refreshError) {
+        clearTokens();
+        window.location.href = '/login';
+      }
     }
     console.error('API Error:', error.response?.data || error.message);
     return Promise.reject(error);
@@ -40,23 +75,36 @@ api.interceptors.response.use(
 export const authAPI = {
   login: (credentials) => api.post('/auth/login/', credentials),
   register: (userData) => api.post('/auth/register/', userData),
-  logout: () => api.post('/auth/logout/'),
+  logout: () => api.post('/auth/logout/', { refresh: localStorage.getItem('refreshToken') }),
   getProfile: () => api.get('/auth/profile/'),
 };
 
 export const projectsAPI = {
-  getAll: () => api.get('/projects/'),
+  getAll: (params) => api.get('/projects/', { params }),
   create: (project) => api.post('/projects/', project),
   update: (id, project) => api.put(`/projects/${id}/`, project),
   delete: (id) => api.delete(`/projects/${id}/`),
+  getBoard: (id, params) => api.get(`/projects/${id}/board/`, { params }),
+  getStats: (id, weeks) => api.get(`/projects/${id}/stats/`, { params: { weeks } }),
 };
 
+// Versión de la tarea que vio el cliente: si otro la cambió antes, 409 con
+// el estado actual en error.response.data.task
+const ifMatch = (version) => (version ? { headers: { 'If-Match': `"${version}"` } } : undefined);
+
 export const tasksAPI = {
   getAll: (projectId) => api.get(`/tasks/?project=${projectId}`),
   create: (task) => api.post('/tasks/', task),
-  update: (id, task) => api.put(`/tasks/${id}/`, task),
-  updateStatus: (id, status) => api.patch(`/tasks/${id}/update_status/`, { status }),
+  // Solo los campos cambiados
+  update: (id, changes, version) => api.patch(`/tasks/${id}/`, changes, ifMatch(version)),
+  updateStatus: (id, status, position = {}, version) =>
+    api.patch(`/tasks/${id}/update_status/`, { status, ...position }, ifMatch(version)),
+  search: (q, params = {}) => api.get('/tasks/search/', { params: { q, ...params } }),
   delete: (id) => api.delete(`/tasks/${id}/`),
 };
 
+// EventSource no envía cabeceras: el token va en la URL
+export const projectEventsURL = (id) =>
+  `${API_BASE_URL}/projects/${id}/events/?access_token=${encodeURIComponent(localStorage.getItem('authToken') || '')}`;
+
 export default api;
\ No newline at end of file